@@ -10,18 +10,72 @@ Usage:
     python parse_unity_log.py output/unity-build.log --format summary
     python parse_unity_log.py output/unity-build.log --format json > errors.json
     python parse_unity_log.py output/unity-build.log --errors-only
+    python parse_unity_log.py output/unity-build.log --follow --fail-fast
+    python parse_unity_log.py output/unity-build.log --context 3 --source-root projects/client
+    python parse_unity_log.py output/unity-build.log --assemblies --source-root projects/client
+    python parse_unity_log.py output/unity-build.log --memory-budget 64
+    python parse_unity_log.py --serve
+    UNITY_LOG_PARSER_SOCKET=/tmp/unity-log-parser-1000.sock python parse_unity_log.py output/unity-build.log
+    python parse_unity_log.py output/unity-build.log --format sarif --output errors.sarif
+    unity -batchmode ... -logFile - | python parse_unity_log.py - --fail-fast --max-errors 20
 """
 
-import re
+import os
 import sys
 import json
+import socket
+
+# Environment variable pointing the CLI at a running daemon (see --serve)
+SOCKET_ENV_VAR = "UNITY_LOG_PARSER_SOCKET"
+
+
+def forward_to_daemon(socket_path, argv):
+    """Run a CLI invocation on a running daemon; returns None if no daemon is reachable"""
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+            sock.sendall(json.dumps({'argv': argv, 'cwd': os.getcwd()}).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as reply:
+                response = json.loads(reply.readline())
+    except (OSError, ValueError):
+        return None
+
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+    return response['exit_code']
+
+
+def _runs_locally(argv):
+    """Invocations that must run in this process (stdin, following a log, daemon control)"""
+    return any(arg in ('-', '--follow', '--serve') for arg in argv)
+
+
+# Thin-client fast path: forward to a warm daemon before importing the parser machinery
+if __name__ == '__main__' and os.environ.get(SOCKET_ENV_VAR) and not _runs_locally(sys.argv[1:]):
+    _exit_code = forward_to_daemon(os.environ[SOCKET_ENV_VAR], sys.argv[1:])
+    if _exit_code is not None:
+        sys.exit(_exit_code)
+
+import re
+import mmap
+import sqlite3
+import weakref
+import heapq
+import hashlib
+import tempfile
+import time
 import argparse
-from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Optional, Set
-from pathlib import Path
+from dataclasses import dataclass, field, asdict, replace
+from typing import List, Dict, Optional, Set, TextIO, Iterator, Callable, Union, Sequence
+from pathlib import Path, PurePosixPath
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from enum import Enum
+from contextlib import redirect_stdout, redirect_stderr, nullcontext
+from io import StringIO
 
 
 class ErrorType(Enum):
@@ -43,6 +97,41 @@ class Severity(Enum):
     INFO = "info"
 
 
+# Entry types reported together as "exceptions"
+EXCEPTION_TYPES = ('Exception', 'BuildError', 'UnityError')
+
+# Severity rank (lower is more severe), used for threshold comparisons
+SEVERITY_RANK = {severity.value: rank for rank, severity in enumerate(Severity)}
+
+# Exit code used when --fail-fast aborts parsing, distinct from "errors found" (1) and failures (2)
+EXIT_FAIL_FAST = 3
+
+# Seconds between polls while following a growing log file
+FOLLOW_POLL_INTERVAL = 0.25
+
+# Maximum number of source files kept memory-mapped for --context
+CONTEXT_CACHE_SIZE = 128
+
+# Assembly name used for entries whose file cannot be attributed to any assembly
+UNASSIGNED_ASSEMBLY = "(unassigned)"
+
+# Estimated fixed memory cost of one LogEntry (object, dict slot, small fields), in bytes
+ENTRY_OVERHEAD_BYTES = 600
+
+# Number of parsed logs a daemon keeps warm
+PARSE_CACHE_SIZE = 8
+
+# SARIF 2.1.0 schema and default rule levels by severity
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS = {
+    Severity.CRITICAL.value: 'error',
+    Severity.HIGH.value: 'error',
+    Severity.MEDIUM.value: 'warning',
+    Severity.LOW.value: 'note',
+    Severity.INFO.value: 'note',
+}
+
+
 @dataclass
 class LogEntry:
     """Represents a single log entry (error/warning/exception)"""
@@ -56,9 +145,13 @@ class LogEntry:
     count: int = 1
     severity: str = "medium"
     category: Optional[str] = None
+    context: List[Dict] = field(default_factory=list)
+    assembly: Optional[str] = None
 
     def get_key(self) -> str:
-        """Generate unique key for deduplication"""
+        """Generate unique key for deduplication (per assembly when attributed)"""
+        if self.assembly:
+            return f"{self.type}|{self.code}|{self.message}|{self.assembly}"
         return f"{self.type}|{self.code}|{self.message}"
 
     def get_location(self) -> str:
@@ -69,7 +162,7 @@ class LogEntry:
 
     def to_dict(self) -> dict:
         """Convert to dictionary"""
-        return {
+        data = {
             'type': self.type,
             'code': self.code,
             'message': self.message,
@@ -81,23 +174,252 @@ class LogEntry:
             'category': self.category,
             'location': self.get_location()
         }
+        if self.assembly:
+            data['assembly'] = self.assembly
+        if self.context:
+            data['context'] = self.context
+        return data
+
+
+class EntryStore:
+    """Deduplicating entry table that spills to SQLite once it exceeds a memory budget"""
+
+    # LogEntry fields populated while parsing (count is stored in its own column)
+    SPILL_FIELDS = (
+        'type', 'code', 'message', 'file', 'line', 'column', 'full_text', 'severity', 'category', 'assembly'
+    )
+
+    def __init__(self, memory_budget: Optional[int] = None, spill_dir: Optional[Path] = None):
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        # key -> (first-seen sequence number, entry); after a spill, entries for keys already
+        # on disk only carry the additional occurrence count
+        self._memory: Dict[str, tuple] = {}
+        self._memory_bytes = 0
+        self._sequence = 0
+        self._unique = 0
+        self._db: Optional[sqlite3.Connection] = None
+
+    def __len__(self) -> int:
+        return self._unique
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._memory or self._on_disk(key)
+
+    @property
+    def spilled(self) -> bool:
+        """Whether entries have been written to disk"""
+        return self._db is not None
+
+    def add(self, entry: LogEntry) -> bool:
+        """Add an occurrence; returns True if its key was never seen before"""
+        key = entry.get_key()
+        known = self._memory.get(key)
+        if known is not None:
+            known[1].count += entry.count
+            return False
+
+        is_new = not self._on_disk(key)
+        if is_new:
+            self._unique += 1
+
+        self._sequence += 1
+        self._memory[key] = (self._sequence, entry)
+        self._memory_bytes += self._estimate_size(entry)
+
+        if self.memory_budget is not None and self._memory_bytes > self.memory_budget:
+            self._spill()
+        return is_new
+
+    def values(self) -> Union[List[LogEntry], 'SpilledEntries']:
+        """All entries in first-seen order; streamed from disk if the table spilled"""
+        if self._db is None:
+            return [entry for _, entry in self._memory.values()]
+        self._spill()
+        return SpilledEntries(self)
+
+    def iterate_disk(
+        self,
+        types: Optional[Sequence[str]] = None,
+        severity: Optional[str] = None,
+        by_location: bool = False
+    ) -> Iterator[LogEntry]:
+        """Stream merged entries from disk in first-seen (or code/location) order"""
+        where, params = [], []
+        if types:
+            where.append(f"type IN ({', '.join('?' * len(types))})")
+            params.extend(types)
+        if severity:
+            where.append('severity = ?')
+            params.append(severity)
+
+        query = 'SELECT count, payload FROM entries'
+        if where:
+            query += ' WHERE ' + ' AND '.join(where)
+        if by_location:
+            query += " ORDER BY code, COALESCE(file, ''), COALESCE(line, 0), seq"
+        else:
+            query += ' ORDER BY seq'
+
+        for count, payload in self._db.execute(query, params):
+            entry = LogEntry(**dict(zip(self.SPILL_FIELDS, json.loads(payload))))
+            entry.count = count
+            yield entry
+
+    def count_by_type(self) -> Dict[str, int]:
+        """Unique entries per type, counted on disk"""
+        return dict(self._db.execute('SELECT type, COUNT(*) FROM entries GROUP BY type'))
+
+    def count_by_assembly(self) -> Iterator[tuple]:
+        """(assembly, type, unique entries, occurrences) rows, counted on disk"""
+        return self._db.execute(
+            'SELECT assembly, type, COUNT(*), SUM(count) FROM entries '
+            'WHERE assembly IS NOT NULL GROUP BY assembly, type'
+        )
+
+    @staticmethod
+    def _estimate_size(entry: LogEntry) -> int:
+        return ENTRY_OVERHEAD_BYTES + len(entry.full_text) + len(entry.message) + len(entry.file or '')
+
+    def _on_disk(self, key: str) -> bool:
+        if self._db is None:
+            return False
+        return self._db.execute('SELECT 1 FROM entries WHERE key = ?', (key,)).fetchone() is not None
+
+    def _open_db(self) -> None:
+        spill_dir = tempfile.mkdtemp(prefix='unity-log-', dir=self.spill_dir)
+        self._db = sqlite3.connect(os.path.join(spill_dir, 'entries.sqlite'))
+        self._db.execute('PRAGMA journal_mode = OFF')
+        self._db.execute('PRAGMA synchronous = OFF')
+        # Columns the formatters filter, sort and aggregate on are stored next to the payload
+        self._db.execute(
+            'CREATE TABLE entries (key TEXT PRIMARY KEY, seq INTEGER NOT NULL, count INTEGER NOT NULL, '
+            'type TEXT NOT NULL, code TEXT NOT NULL, severity TEXT NOT NULL, file TEXT, line INTEGER, '
+            'assembly TEXT, payload TEXT NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX entries_seq ON entries (seq)')
+        self._db.execute('CREATE INDEX entries_type ON entries (type, code)')
+        weakref.finalize(self, EntryStore._remove_spill, self._db, spill_dir)
+
+    @staticmethod
+    def _remove_spill(db: sqlite3.Connection, spill_dir: str) -> None:
+        import shutil
+        db.close()
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    def _spill(self) -> None:
+        """Merge in-memory entries into the on-disk table and release them"""
+        if self._db is None:
+            self._open_db()
+
+        rows = []
+        for key, (sequence, entry) in self._memory.items():
+            payload = [getattr(entry, name) for name in self.SPILL_FIELDS]
+            rows.append((
+                key, sequence, entry.count, entry.type, entry.code, entry.severity,
+                entry.file, entry.line, entry.assembly, json.dumps(payload)
+            ))
+
+        with self._db:
+            # Keep the earliest sequence number so output order matches the in-memory table
+            self._db.executemany(
+                'INSERT INTO entries (key, seq, count, type, code, severity, file, line, assembly, payload) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET count = count + excluded.count',
+                rows
+            )
+
+        self._memory.clear()
+        self._memory_bytes = 0
+
+
+class SpilledEntries:
+    """Re-iterable view over a spilled EntryStore; entries are streamed from disk on each pass"""
+
+    def __init__(self, store: EntryStore):
+        self._store = store
+        self._transforms: List[Callable[[LogEntry], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return self.select()
+
+    @property
+    def store(self) -> EntryStore:
+        return self._store
+
+    def select(
+        self,
+        types: Optional[Sequence[str]] = None,
+        severity: Optional[str] = None,
+        by_location: bool = False,
+        enrich: bool = True
+    ) -> Iterator[LogEntry]:
+        """Stream a filtered subset of entries, filtered and ordered by SQLite"""
+        for entry in self._store.iterate_disk(types, severity, by_location):
+            if enrich:
+                self.enrich(entry)
+            yield entry
+
+    def add_transform(self, transform: Callable[[LogEntry], None]) -> None:
+        """Apply an enrichment to every entry as it is streamed"""
+        self._transforms.append(transform)
+
+    def enrich(self, entry: LogEntry) -> None:
+        """Apply the registered enrichments to one streamed entry"""
+        for transform in self._transforms:
+            transform(entry)
 
 
 @dataclass
 class ParseResult:
     """Results from parsing a log file"""
-    entries: List[LogEntry] = field(default_factory=list)
+    entries: Union[List[LogEntry], SpilledEntries] = field(default_factory=list)
     total_lines: int = 0
     parse_time: float = 0.0
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    fail_fast_reason: Optional[str] = None
 
     def get_summary(self) -> Dict[str, int]:
         """Get count summary by type"""
+        if isinstance(self.entries, SpilledEntries):
+            return self.entries.store.count_by_type()
         summary = defaultdict(int)
         for entry in self.entries:
             summary[entry.type] += 1
         return dict(summary)
 
+    def iter_entries(
+        self,
+        types: Optional[Sequence[str]] = None,
+        severity: Optional[str] = None,
+        by_location: bool = False,
+        enrich: bool = True
+    ) -> Iterator[LogEntry]:
+        """Stream entries of the given types/severity, in first-seen or (code, file, line) order
+
+        With enrich=False, lazily applied enrichments are skipped; call enrich() on the
+        entries that are actually rendered.
+        """
+        if isinstance(self.entries, SpilledEntries):
+            yield from self.entries.select(types, severity, by_location, enrich)
+            return
+
+        selected = (
+            e for e in self.entries
+            if (not types or e.type in types) and (not severity or e.severity == severity)
+        )
+        if by_location:
+            selected = sorted(selected, key=lambda e: (e.code, e.file or '', e.line or 0))
+        yield from selected
+
+    def enrich(self, entry: LogEntry) -> None:
+        """Apply lazy enrichments to an entry streamed with enrich=False"""
+        if isinstance(self.entries, SpilledEntries):
+            self.entries.enrich(entry)
+
     def get_by_type(self, entry_type: str) -> List[LogEntry]:
         """Get all entries of a specific type"""
         return [e for e in self.entries if e.type == entry_type]
@@ -106,6 +428,334 @@ class ParseResult:
         """Get all entries of a specific severity"""
         return [e for e in self.entries if e.severity == severity]
 
+    def apply(self, transform: Callable[[LogEntry], None]) -> None:
+        """Enrich every entry in place (lazily, when entries are streamed from disk)"""
+        if isinstance(self.entries, SpilledEntries):
+            self.entries.add_transform(transform)
+        else:
+            for entry in self.entries:
+                transform(entry)
+
+    def get_assembly_rollup(self) -> Dict[str, Dict[str, int]]:
+        """Get unique error/warning and total occurrence counts per assembly (most errors first)"""
+        rollup = defaultdict(lambda: {'errors': 0, 'warnings': 0, 'occurrences': 0})
+        if isinstance(self.entries, SpilledEntries):
+            rows = self.entries.store.count_by_assembly()
+        else:
+            rows = ((e.assembly, e.type, 1, e.count) for e in self.entries if e.assembly)
+
+        for assembly, entry_type, unique, occurrences in rows:
+            counts = rollup[assembly]
+            if entry_type == ErrorType.COMPILER_ERROR.value:
+                counts['errors'] += unique
+            elif entry_type == ErrorType.COMPILER_WARNING.value:
+                counts['warnings'] += unique
+            counts['occurrences'] += occurrences
+        return dict(sorted(rollup.items(), key=lambda item: (-item[1]['errors'], -item[1]['warnings'], item[0])))
+
+
+@dataclass(frozen=True)
+class FailFastPolicy:
+    """Thresholds that abort parsing as soon as a build is known to be doomed"""
+    severity: Optional[str] = Severity.CRITICAL.value
+    max_errors: Optional[int] = None
+
+    def check(self, entry: LogEntry, error_count: int) -> Optional[str]:
+        """Return the reason to stop parsing, or None to continue"""
+        if self.severity and SEVERITY_RANK[entry.severity] <= SEVERITY_RANK[self.severity]:
+            return f"{entry.severity.upper()} {entry.type} [{entry.code}]: {entry.message}"
+        if self.max_errors and error_count >= self.max_errors:
+            return f"Reached {error_count} unique compile errors (limit: {self.max_errors})"
+        return None
+
+
+class SourceContextProvider:
+    """Reads source lines around log locations through an LRU cache of memory-mapped files"""
+
+    def __init__(self, source_root: Path, max_open_files: int = CONTEXT_CACHE_SIZE):
+        self.source_root = source_root
+        self.max_open_files = max_open_files
+        # path -> (mapped data, line start offsets); None marks a missing/unreadable file
+        self._cache: OrderedDict = OrderedDict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Release all memory-mapped files"""
+        for source in self._cache.values():
+            if source is not None and isinstance(source[0], mmap.mmap):
+                source[0].close()
+        self._cache.clear()
+
+    def attach(self, entry: LogEntry, radius: int) -> None:
+        """Attach surrounding source lines to an entry that has a file location"""
+        if entry.file and entry.line:
+            entry.context = self.get_context(entry.file, entry.line, radius)
+
+    def get_context(self, file: str, line: int, radius: int) -> List[Dict]:
+        """Get lines [line - radius, line + radius] of a source file (empty if unavailable)"""
+        source = self._open(file)
+        if source is None:
+            return []
+
+        data, offsets = source
+        first = max(1, line - radius)
+        last = min(len(offsets), line + radius)
+
+        context = []
+        for number in range(first, last + 1):
+            start = offsets[number - 1]
+            end = offsets[number] if number < len(offsets) else len(data)
+            text = data[start:end].decode('utf-8', errors='replace').rstrip('\r\n')
+            if number == 1:
+                text = text.lstrip('\ufeff')
+            context.append({'line': number, 'text': text, 'current': number == line})
+        return context
+
+    def _open(self, file: str) -> Optional[tuple]:
+        """Get a cached (data, offsets) pair for a file, mapping it on first use"""
+        if file in self._cache:
+            self._cache.move_to_end(file)
+            return self._cache[file]
+
+        source = None
+        path = Path(file)
+        if not path.is_absolute():
+            path = self.source_root / path
+
+        try:
+            with open(path, 'rb') as f:
+                if path.stat().st_size == 0:
+                    source = (b'', [])
+                else:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    source = (data, self._line_offsets(data))
+        except (OSError, ValueError):
+            source = None
+
+        self._cache[file] = source
+        if len(self._cache) > self.max_open_files:
+            _, evicted = self._cache.popitem(last=False)
+            if evicted is not None and isinstance(evicted[0], mmap.mmap):
+                evicted[0].close()
+        return source
+
+    @staticmethod
+    def _line_offsets(data) -> List[int]:
+        """Compute the start offset of every line"""
+        offsets = [0]
+        position = data.find(b'\n')
+        while position != -1:
+            offsets.append(position + 1)
+            position = data.find(b'\n', position + 1)
+        # A trailing newline does not start another line
+        if offsets[-1] == len(data):
+            offsets.pop()
+        return offsets
+
+
+class AssemblyIndex:
+    """Maps source files to their owning Unity assembly through a longest-prefix path trie"""
+
+    CACHE_VERSION = 1
+
+    # Directories Unity never compiles from (plus hidden and '~'-suffixed folders)
+    EXCLUDED_DIRS = {'Library', 'Temp', 'Logs', 'obj', 'bin', 'UserSettings', 'node_modules'}
+
+    # Trie node key holding the assembly name (path segments are never empty)
+    _ASSEMBLY = ''
+
+    def __init__(self, source_root: Path):
+        self.source_root = source_root.resolve()
+        self.assembly_dirs: Dict[str, str] = {}
+        self._trie: Dict = {}
+        self._lookups: Dict[str, str] = {}
+
+    @classmethod
+    def load(cls, source_root: Path, cache_path: Optional[Path] = None) -> 'AssemblyIndex':
+        """Build the index, reusing cached directory listings whose mtime has not changed"""
+        index = cls(source_root)
+        cache_path = cache_path or index.default_cache_path()
+
+        directories = index._scan(index._read_cache(cache_path))
+        index._write_cache(cache_path, directories)
+        index._build(directories)
+        return index
+
+    def default_cache_path(self) -> Path:
+        """Cache inside Unity's Library folder when present, otherwise in the temp directory"""
+        library = self.source_root / 'Library'
+        if library.is_dir():
+            return library / 'asmdef-index.json'
+        digest = hashlib.sha1(str(self.source_root).encode('utf-8')).hexdigest()[:12]
+        return Path(tempfile.gettempdir()) / f'asmdef-index-{digest}.json'
+
+    def lookup(self, file: str) -> str:
+        """Get the assembly that compiles a source file (memoized per log path)"""
+        assembly = self._lookups.get(file)
+        if assembly is None:
+            assembly = self._lookups[file] = self._resolve(file)
+        return assembly
+
+    def _resolve(self, file: str) -> str:
+        relative, inside_root = self._relative_parts(file)
+        if not inside_root:
+            return self._default_assembly(relative)
+
+        # An asmdef at the source root is stored on the trie root itself
+        node = self._trie
+        assembly = node.get(self._ASSEMBLY)
+        for part in relative[:-1]:
+            node = node.get(part)
+            if node is None:
+                break
+            assembly = node.get(self._ASSEMBLY, assembly)
+
+        return assembly or self._default_assembly(relative)
+
+    def _relative_parts(self, file: str) -> tuple:
+        """Split a log path into segments relative to the source root, and whether it is inside it"""
+        path = file.strip().replace('\\', '/')
+        if os.path.isabs(path):
+            try:
+                path = Path(path).resolve().relative_to(self.source_root).as_posix()
+            except ValueError:
+                return list(PurePosixPath(path).parts), False
+        return [part for part in PurePosixPath(path).parts if part != '.'], True
+
+    @staticmethod
+    def _default_assembly(parts: List[str]) -> str:
+        """Unity's predefined assemblies for scripts under Assets/ without an asmdef"""
+        if not parts or parts[0] != 'Assets':
+            return UNASSIGNED_ASSEMBLY
+        editor = 'Editor' in parts[1:-1]
+        if len(parts) > 2 and parts[1] in ('Plugins', 'Standard Assets', 'Pro Standard Assets'):
+            return 'Assembly-CSharp-Editor-firstpass' if editor else 'Assembly-CSharp-firstpass'
+        return 'Assembly-CSharp-Editor' if editor else 'Assembly-CSharp'
+
+    def _scan(self, cached: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Walk the tree, re-listing only directories whose mtime changed"""
+        directories = {}
+        pending = ['']
+        while pending:
+            rel_dir = pending.pop()
+            abs_dir = self.source_root / rel_dir if rel_dir else self.source_root
+            try:
+                mtime = os.stat(abs_dir).st_mtime_ns
+            except OSError:
+                continue
+
+            previous = cached.get(rel_dir)
+            if previous and previous['mtime'] == mtime:
+                subdirs = previous['subdirs']
+                definition_names = list(previous['definitions'])
+            else:
+                subdirs, definition_names = self._list_directory(abs_dir)
+
+            definitions = {}
+            for name in definition_names:
+                known = previous['definitions'].get(name) if previous else None
+                definition = self._read_definition(abs_dir / name, known)
+                if definition is not None:
+                    definitions[name] = definition
+
+            directories[rel_dir] = {'mtime': mtime, 'subdirs': subdirs, 'definitions': definitions}
+            pending.extend(f"{rel_dir}/{sub}" if rel_dir else sub for sub in subdirs)
+
+        return directories
+
+    def _list_directory(self, abs_dir: Path) -> tuple:
+        """List compilable subdirectories and .asmdef/.asmref files of a directory"""
+        subdirs, definitions = [], []
+        try:
+            with os.scandir(abs_dir) as it:
+                for item in it:
+                    if item.is_dir(follow_symlinks=False):
+                        if not (item.name in self.EXCLUDED_DIRS or item.name.startswith('.') or item.name.endswith('~')):
+                            subdirs.append(item.name)
+                    elif item.name.endswith(('.asmdef', '.asmref')):
+                        definitions.append(item.name)
+        except OSError:
+            pass
+        return sorted(subdirs), sorted(definitions)
+
+    @staticmethod
+    def _read_definition(path: Path, known: Optional[Dict]) -> Optional[Dict]:
+        """Read name/reference and GUID of an assembly definition, reusing unchanged cache data"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        if known and known['mtime'] == mtime:
+            return known
+
+        try:
+            data = json.loads(path.read_text(encoding='utf-8-sig'))
+        except (OSError, ValueError):
+            data = {}
+
+        guid = None
+        try:
+            for meta_line in Path(f"{path}.meta").read_text(encoding='utf-8').splitlines():
+                if meta_line.startswith('guid:'):
+                    guid = meta_line.split(':', 1)[1].strip()
+                    break
+        except OSError:
+            pass
+
+        return {'mtime': mtime, 'name': data.get('name'), 'reference': data.get('reference'), 'guid': guid}
+
+    def _build(self, directories: Dict[str, Dict]) -> None:
+        """Resolve assembly names per directory and insert them into the trie"""
+        by_guid = {}
+        for info in directories.values():
+            for file_name, definition in info['definitions'].items():
+                if file_name.endswith('.asmdef') and definition['guid'] and definition['name']:
+                    by_guid[definition['guid']] = definition['name']
+
+        for rel_dir, info in directories.items():
+            assembly = None
+            for file_name, definition in info['definitions'].items():
+                if file_name.endswith('.asmdef') and definition['name']:
+                    assembly = definition['name']
+                    break
+                reference = definition.get('reference') or ''
+                if reference.startswith('GUID:'):
+                    reference = by_guid.get(reference[5:], '')
+                assembly = assembly or reference or None
+
+            if assembly:
+                self.assembly_dirs[rel_dir] = assembly
+                node = self._trie
+                for part in rel_dir.split('/') if rel_dir else []:
+                    node = node.setdefault(part, {})
+                node[self._ASSEMBLY] = assembly
+
+    def _read_cache(self, cache_path: Path) -> Dict[str, Dict]:
+        try:
+            data = json.loads(cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != self.CACHE_VERSION or data.get('root') != str(self.source_root):
+            return {}
+        return data.get('directories', {})
+
+    def _write_cache(self, cache_path: Path, directories: Dict[str, Dict]) -> None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(json.dumps({
+                'version': self.CACHE_VERSION,
+                'root': str(self.source_root),
+                'directories': directories
+            }), encoding='utf-8')
+        except OSError:
+            # Caching is an optimization only
+            pass
+
 
 class UnityLogParser:
     """Parser for Unity build logs"""
@@ -136,6 +786,9 @@ class UnityLogParser:
         'null_reference': re.compile(
             r'NullReferenceException:\s+(?P<message>.+)'
         ),
+        'batchmode_exit': re.compile(
+            r'^(Exiting batchmode|Application will terminate with return code)'
+        ),
     }
 
     # Error code to severity mapping
@@ -166,30 +819,81 @@ class UnityLogParser:
         'MsgPack009': 'Code Generation',
     }
 
-    def __init__(self):
-        self.entries: Dict[str, LogEntry] = {}
+    def __init__(
+        self,
+        fail_fast: Optional[FailFastPolicy] = None,
+        memory_budget: Optional[int] = None,
+        spill_dir: Optional[Path] = None,
+        assembly_index: Optional[AssemblyIndex] = None
+    ):
+        self.entries = EntryStore(memory_budget, spill_dir)
+        self.assembly_index = assembly_index
         self.total_lines = 0
+        self.fail_fast = fail_fast
+        self.fail_fast_reason: Optional[str] = None
+        self._error_count = 0
 
-    def parse_file(self, log_path: Path) -> ParseResult:
-        """Parse a Unity log file"""
-        start_time = datetime.now()
-
+    def parse_file(self, log_path: Path, follow: bool = False, idle_timeout: float = 60.0) -> ParseResult:
+        """Parse a Unity log file, optionally following it while Unity is still writing"""
         if not log_path.exists():
             raise FileNotFoundError(f"Log file not found: {log_path}")
 
         with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                self.total_lines += 1
-                self._parse_line(line.strip())
+            return self.parse_stream(f, follow=follow, idle_timeout=idle_timeout)
+
+    def parse_stream(self, stream: TextIO, follow: bool = False, idle_timeout: float = 60.0) -> ParseResult:
+        """Parse Unity log lines from an open stream (file or stdin)"""
+        start_time = datetime.now()
+
+        for line in self._read_lines(stream, follow, idle_timeout):
+            self.total_lines += 1
+            line = line.strip()
+            self._parse_line(line)
+
+            # Stop as soon as a fail-fast threshold is hit
+            if self.fail_fast_reason:
+                break
+
+            # Unity is done writing; no need to wait for the idle timeout
+            if follow and self.PATTERNS['batchmode_exit'].search(line):
+                break
 
         parse_time = (datetime.now() - start_time).total_seconds()
 
         return ParseResult(
-            entries=list(self.entries.values()),
+            entries=self.entries.values(),
             total_lines=self.total_lines,
-            parse_time=parse_time
+            parse_time=parse_time,
+            fail_fast_reason=self.fail_fast_reason
         )
 
+    @staticmethod
+    def _read_lines(stream: TextIO, follow: bool, idle_timeout: float) -> Iterator[str]:
+        """Yield complete lines, polling for appended data when following a growing file"""
+        if not follow:
+            yield from stream
+            return
+
+        pending = ''
+        last_data = time.monotonic()
+        while True:
+            chunk = stream.readline()
+            if chunk:
+                last_data = time.monotonic()
+                pending += chunk
+                # Hold back partial lines until the writer finishes them
+                if pending.endswith('\n'):
+                    yield pending
+                    pending = ''
+                continue
+
+            if time.monotonic() - last_data >= idle_timeout:
+                break
+            time.sleep(FOLLOW_POLL_INTERVAL)
+
+        if pending:
+            yield pending
+
     def _parse_line(self, line: str) -> None:
         """Parse a single log line"""
         # Try compiler error
@@ -277,250 +981,473 @@ class UnityLogParser:
             category=category
         )
 
-        key = entry.get_key()
+        # Attributed before deduplication so the same error from two assemblies stays two entries
+        if self.assembly_index and file:
+            entry.assembly = self.assembly_index.lookup(file)
+
+        if self.entries.add(entry):
+            if entry_type == ErrorType.COMPILER_ERROR.value:
+                self._error_count += 1
+
+            if self.fail_fast and not self.fail_fast_reason:
+                self.fail_fast_reason = self.fail_fast.check(entry, self._error_count)
 
-        if key in self.entries:
-            self.entries[key].count += 1
-        else:
-            self.entries[key] = entry
+
+class WarningGroup:
+    """Running totals of one warning group plus its most frequent examples"""
+
+    def __init__(self, keep: int):
+        self.keep = keep
+        self.unique = 0
+        self.total = 0
+        self.category: Optional[str] = None
+        # Min-heap of (count, -first seen, entry); ties keep the earliest entries
+        self._top: List[tuple] = []
+
+    def add(self, entry: LogEntry) -> None:
+        """Count an entry, retaining it only while it is among the most frequent"""
+        if self.unique == 0:
+            self.category = entry.category
+        self.unique += 1
+        self.total += entry.count
+
+        heapq.heappush(self._top, (entry.count, -self.unique, entry))
+        if len(self._top) > self.keep:
+            heapq.heappop(self._top)
+
+    def top(self) -> List[LogEntry]:
+        """Retained examples, most frequent first"""
+        return [item[-1] for item in sorted(self._top, reverse=True)]
 
 
 class LogFormatter:
     """Formats parse results for different outputs"""
 
+    @staticmethod
+    def _context_lines(entry: LogEntry, prefix: str) -> List[str]:
+        """Render source context as plain text lines with a marker on the reported line"""
+        width = len(str(entry.context[-1]['line'])) if entry.context else 0
+        return [
+            f"{prefix}{'>' if ctx['current'] else ' '} {ctx['line']:>{width}} | {ctx['text']}"
+            for ctx in entry.context
+        ]
+
+    @staticmethod
+    def _context_markdown(entry: LogEntry, indent: str = "") -> List[str]:
+        """Render source context as a fenced code block"""
+        if not entry.context:
+            return []
+        lines = [f"{indent}```csharp"]
+        lines.extend(f"{indent}{line}" for line in LogFormatter._context_lines(entry, ""))
+        lines.append(f"{indent}```")
+        return lines
+
+    @staticmethod
+    def _emit(stream: TextIO) -> Callable[..., None]:
+        """Line writer for streaming formatters"""
+        def emit(text: str = "") -> None:
+            stream.write(text + "\n")
+        return emit
+
+    @staticmethod
+    def _render(write: Callable[[ParseResult, TextIO, bool], None], result: ParseResult, errors_only: bool) -> str:
+        """Run a streaming formatter into a string"""
+        output = StringIO()
+        write(result, output, errors_only)
+        return output.getvalue()
+
     @staticmethod
     def format_summary(result: ParseResult, errors_only: bool = False) -> str:
         """Format as colored console summary"""
-        lines = []
+        return LogFormatter._render(LogFormatter.write_summary, result, errors_only)
+
+    @staticmethod
+    def write_summary(result: ParseResult, stream: TextIO, errors_only: bool = False) -> None:
+        """Write the console summary, streaming entries instead of collecting them"""
+        emit = LogFormatter._emit(stream)
 
         # Header
-        lines.append("\n" + "=" * 67)
-        lines.append("  Unity Log Analysis")
-        lines.append("=" * 67)
+        emit("\n" + "=" * 67)
+        emit("  Unity Log Analysis")
+        emit("=" * 67)
 
         # Summary
         summary = result.get_summary()
-        errors = result.get_by_type('Error')
-        warnings = result.get_by_type('Warning')
-        exceptions = [e for e in result.entries if e.type in ['Exception', 'BuildError', 'UnityError']]
-
-        lines.append("\nSummary:")
-        lines.append(f"  Unique Errors:      {len(errors)}")
-        lines.append(f"  Unique Warnings:    {len(warnings)}")
-        lines.append(f"  Unique Exceptions:  {len(exceptions)}")
-        lines.append(f"  Total Lines Parsed: {result.total_lines}")
-        lines.append(f"  Parse Time:         {result.parse_time:.3f}s")
+        error_count = summary.get(ErrorType.COMPILER_ERROR.value, 0)
+        warning_count = summary.get(ErrorType.COMPILER_WARNING.value, 0)
+        exception_count = sum(summary.get(t, 0) for t in EXCEPTION_TYPES)
+
+        emit("\nSummary:")
+        emit(f"  Unique Errors:      {error_count}")
+        emit(f"  Unique Warnings:    {warning_count}")
+        emit(f"  Unique Exceptions:  {exception_count}")
+        emit(f"  Total Lines Parsed: {result.total_lines}")
+        emit(f"  Parse Time:         {result.parse_time:.3f}s")
+
+        if result.fail_fast_reason:
+            emit("\n  ⛔ FAIL-FAST: parsing aborted, report is partial")
+            emit(f"  Reason: {result.fail_fast_reason}")
+
+        # Assemblies section
+        rollup = result.get_assembly_rollup()
+        if rollup:
+            emit("\n" + "-" * 67)
+            emit(f"  ASSEMBLIES ({len(rollup)})")
+            emit("-" * 67)
+            for assembly, counts in rollup.items():
+                emit(
+                    f"  {assembly:<40} {counts['errors']:>5} errors "
+                    f"{counts['warnings']:>5} warnings {counts['occurrences']:>7} total"
+                )
 
         # Errors section
-        if errors:
-            lines.append("\n" + "-" * 67)
-            lines.append(f"  ERRORS ({len(errors)} unique)")
-            lines.append("-" * 67)
+        if error_count:
+            emit("\n" + "-" * 67)
+            emit(f"  ERRORS ({error_count} unique)")
+            emit("-" * 67)
 
-            for error in sorted(errors, key=lambda e: (e.code, e.file or '', e.line or 0)):
+            for error in result.iter_entries([ErrorType.COMPILER_ERROR.value], by_location=True):
                 count_suffix = f" (×{error.count})" if error.count > 1 else ""
-                lines.append(f"\n  [{error.code}]{count_suffix} [{error.severity.upper()}]")
+                emit(f"\n  [{error.code}]{count_suffix} [{error.severity.upper()}]")
                 if error.file:
-                    lines.append(f"  📄 {error.get_location()}")
-                lines.append(f"  💬 {error.message}")
+                    emit(f"  📄 {error.get_location()}")
+                emit(f"  💬 {error.message}")
                 if error.category:
-                    lines.append(f"  🏷️  {error.category}")
+                    emit(f"  🏷️  {error.category}")
+                for line in LogFormatter._context_lines(error, "    "):
+                    emit(line)
 
         # Warnings section
-        if not errors_only and warnings:
-            lines.append("\n" + "-" * 67)
-            lines.append(f"  WARNINGS ({len(warnings)} unique)")
-            lines.append("-" * 67)
+        if not errors_only and warning_count:
+            emit("\n" + "-" * 67)
+            emit(f"  WARNINGS ({warning_count} unique)")
+            emit("-" * 67)
 
-            # Group by code
-            by_code = defaultdict(list)
-            for warning in warnings:
-                by_code[warning.code].append(warning)
+            # Group by code, keeping only the examples that are shown
+            by_code: Dict[str, WarningGroup] = {}
+            for warning in result.iter_entries([ErrorType.COMPILER_WARNING.value], enrich=False):
+                by_code.setdefault(warning.code, WarningGroup(3)).add(warning)
 
             for code in sorted(by_code.keys()):
                 group = by_code[code]
-                total_occurrences = sum(w.count for w in group)
-                category = group[0].category
 
-                lines.append(f"\n  [{code}] - {len(group)} unique, {total_occurrences} total")
-                if category:
-                    lines.append(f"  Category: {category}")
+                emit(f"\n  [{code}] - {group.unique} unique, {group.total} total")
+                if group.category:
+                    emit(f"  Category: {group.category}")
 
                 # Show first 3 examples
-                for warning in sorted(group, key=lambda w: w.count, reverse=True)[:3]:
+                for warning in group.top():
+                    result.enrich(warning)
                     count_suffix = f" (×{warning.count})" if warning.count > 1 else ""
                     if warning.file:
-                        lines.append(f"    • {warning.get_location()}{count_suffix}")
-                    lines.append(f"      {warning.message}")
+                        emit(f"    • {warning.get_location()}{count_suffix}")
+                    emit(f"      {warning.message}")
+                    for line in LogFormatter._context_lines(warning, "        "):
+                        emit(line)
 
-                if len(group) > 3:
-                    lines.append(f"    ... and {len(group) - 3} more")
+                if group.unique > 3:
+                    emit(f"    ... and {group.unique - 3} more")
 
         # Exceptions section
-        if exceptions:
-            lines.append("\n" + "-" * 67)
-            lines.append(f"  EXCEPTIONS ({len(exceptions)} unique)")
-            lines.append("-" * 67)
+        if exception_count:
+            emit("\n" + "-" * 67)
+            emit(f"  EXCEPTIONS ({exception_count} unique)")
+            emit("-" * 67)
 
-            for exc in exceptions:
+            for exc in result.iter_entries(EXCEPTION_TYPES):
                 count_suffix = f" (×{exc.count})" if exc.count > 1 else ""
-                lines.append(f"\n  [{exc.code}]{count_suffix}")
-                lines.append(f"  Msg: {exc.message}")
+                emit(f"\n  [{exc.code}]{count_suffix}")
+                emit(f"  Msg: {exc.message}")
 
-        lines.append("\n" + "=" * 67 + "\n")
-
-        return "\n".join(lines)
+        emit("\n" + "=" * 67 + "\n")
 
     @staticmethod
     def format_json(result: ParseResult, errors_only: bool = False) -> str:
         """Format as JSON"""
-        entries = result.entries
-        if errors_only:
-            entries = result.get_by_type('Error')
-
-        output = {
-            'timestamp': result.timestamp,
-            'summary': {
-                'errors': len(result.get_by_type('Error')),
-                'warnings': len(result.get_by_type('Warning')),
-                'exceptions': len([e for e in result.entries if e.type in ['Exception', 'BuildError', 'UnityError']]),
-                'total_lines': result.total_lines,
-                'parse_time': result.parse_time
-            },
-            'entries': [entry.to_dict() for entry in entries]
+        return LogFormatter._render(LogFormatter.write_json, result, errors_only)
+
+    @staticmethod
+    def write_json(result: ParseResult, stream: TextIO, errors_only: bool = False) -> None:
+        """Write JSON, streaming the entries array one entry at a time"""
+        summary = result.get_summary()
+        output_summary = {
+            'errors': summary.get(ErrorType.COMPILER_ERROR.value, 0),
+            'warnings': summary.get(ErrorType.COMPILER_WARNING.value, 0),
+            'exceptions': sum(summary.get(t, 0) for t in EXCEPTION_TYPES),
+            'total_lines': result.total_lines,
+            'parse_time': result.parse_time
         }
+        if result.fail_fast_reason:
+            output_summary['fail_fast_reason'] = result.fail_fast_reason
+
+        def member(key: str, value) -> str:
+            return f'  {json.dumps(key)}: ' + json.dumps(value, indent=2).replace('\n', '\n  ')
+
+        stream.write('{\n')
+        stream.write(member('timestamp', result.timestamp) + ',\n')
+        stream.write(member('summary', output_summary) + ',\n')
+        stream.write('  "entries": [')
 
-        return json.dumps(output, indent=2)
+        types = [ErrorType.COMPILER_ERROR.value] if errors_only else None
+        separator = '\n'
+        for entry in result.iter_entries(types):
+            stream.write(separator + '    ' + json.dumps(entry.to_dict(), indent=2).replace('\n', '\n    '))
+            separator = ',\n'
+        stream.write('\n  ]' if separator != '\n' else ']')
+
+        rollup = result.get_assembly_rollup()
+        if rollup:
+            stream.write(',\n' + member('assemblies', rollup))
+        stream.write('\n}\n')
 
     @staticmethod
     def format_markdown(result: ParseResult, errors_only: bool = False) -> str:
         """Format as Markdown"""
-        lines = []
+        return LogFormatter._render(LogFormatter.write_markdown, result, errors_only)
+
+    @staticmethod
+    def write_markdown(result: ParseResult, stream: TextIO, errors_only: bool = False) -> None:
+        """Write Markdown, streaming entries instead of collecting them"""
+        emit = LogFormatter._emit(stream)
 
-        errors = result.get_by_type('Error')
-        warnings = result.get_by_type('Warning')
-        exceptions = [e for e in result.entries if e.type in ['Exception', 'BuildError', 'UnityError']]
+        summary = result.get_summary()
+        error_count = summary.get(ErrorType.COMPILER_ERROR.value, 0)
+        warning_count = summary.get(ErrorType.COMPILER_WARNING.value, 0)
+        exception_count = sum(summary.get(t, 0) for t in EXCEPTION_TYPES)
 
         # Header
-        lines.append("# Unity Log Analysis")
-        lines.append("")
-        lines.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append(f"**Parse Time:** {result.parse_time:.3f}s")
-        lines.append("")
+        emit("# Unity Log Analysis")
+        emit()
+        emit(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        emit(f"**Parse Time:** {result.parse_time:.3f}s")
+        emit()
+
+        if result.fail_fast_reason:
+            emit("> **⛔ Fail-fast:** parsing aborted, this report is partial.  ")
+            emit(f"> **Reason:** {result.fail_fast_reason}")
+            emit()
 
         # Summary table
-        lines.append("## Summary")
-        lines.append("")
-        lines.append("| Category | Count |")
-        lines.append("|----------|-------|")
-        lines.append(f"| Errors | {len(errors)} |")
-        lines.append(f"| Warnings | {len(warnings)} |")
-        lines.append(f"| Exceptions | {len(exceptions)} |")
-        lines.append(f"| Total Lines | {result.total_lines} |")
-        lines.append("")
+        emit("## Summary")
+        emit()
+        emit("| Category | Count |")
+        emit("|----------|-------|")
+        emit(f"| Errors | {error_count} |")
+        emit(f"| Warnings | {warning_count} |")
+        emit(f"| Exceptions | {exception_count} |")
+        emit(f"| Total Lines | {result.total_lines} |")
+        emit()
+
+        # Assembly rollup
+        rollup = result.get_assembly_rollup()
+        if rollup:
+            emit("## By Assembly")
+            emit()
+            emit("| Assembly | Errors | Warnings | Total Occurrences |")
+            emit("|----------|--------|----------|-------------------|")
+            for assembly, counts in rollup.items():
+                emit(f"| {assembly} | {counts['errors']} | {counts['warnings']} | {counts['occurrences']} |")
+            emit()
 
         # Errors
-        if errors:
-            lines.append("## Errors")
-            lines.append("")
-
-            # Group by severity
-            by_severity = defaultdict(list)
-            for error in errors:
-                by_severity[error.severity].append(error)
+        if error_count:
+            emit("## Errors")
+            emit()
 
+            # Group by severity, one filtered pass per severity
             for severity in ['critical', 'high', 'medium', 'low']:
-                if severity not in by_severity:
-                    continue
+                errors = result.iter_entries([ErrorType.COMPILER_ERROR.value], severity=severity, by_location=True)
+                for index, error in enumerate(errors):
+                    if index == 0:
+                        emit(f"### {severity.upper()} Severity")
+                        emit()
 
-                lines.append(f"### {severity.upper()} Severity")
-                lines.append("")
-
-                for error in sorted(by_severity[severity], key=lambda e: (e.code, e.file or '', e.line or 0)):
                     count_suffix = f" (×{error.count})" if error.count > 1 else ""
-                    lines.append(f"#### [{error.code}]{count_suffix}")
-                    lines.append("")
+                    emit(f"#### [{error.code}]{count_suffix}")
+                    emit()
                     if error.file:
-                        lines.append(f"**Location:** `{error.get_location()}`  ")
+                        emit(f"**Location:** `{error.get_location()}`  ")
                     if error.category:
-                        lines.append(f"**Category:** {error.category}  ")
-                    lines.append(f"**Message:** {error.message}")
-                    lines.append("")
+                        emit(f"**Category:** {error.category}  ")
+                    emit(f"**Message:** {error.message}")
+                    emit()
+                    if error.context:
+                        for line in LogFormatter._context_markdown(error):
+                            emit(line)
+                        emit()
 
         # Warnings
-        if not errors_only and warnings:
-            lines.append("## Warnings")
-            lines.append("")
+        if not errors_only and warning_count:
+            emit("## Warnings")
+            emit()
 
-            # Group by category
-            by_category = defaultdict(list)
-            for warning in warnings:
-                by_category[warning.category or 'General'].append(warning)
+            # Group by category, then by code within category, keeping only the examples that are shown
+            by_category: Dict[str, Dict[str, WarningGroup]] = defaultdict(dict)
+            for warning in result.iter_entries([ErrorType.COMPILER_WARNING.value], enrich=False):
+                codes = by_category[warning.category or 'General']
+                codes.setdefault(warning.code, WarningGroup(5)).add(warning)
 
             for category in sorted(by_category.keys()):
-                group = by_category[category]
-                total = sum(w.count for w in group)
-
-                lines.append(f"### {category} ({len(group)} unique, {total} total)")
-                lines.append("")
+                codes = by_category[category]
+                unique = sum(group.unique for group in codes.values())
+                total = sum(group.total for group in codes.values())
 
-                # Group by code within category
-                by_code = defaultdict(list)
-                for w in group:
-                    by_code[w.code].append(w)
+                emit(f"### {category} ({unique} unique, {total} total)")
+                emit()
 
-                for code in sorted(by_code.keys()):
-                    code_group = by_code[code]
-                    code_total = sum(w.count for w in code_group)
+                for code in sorted(codes.keys()):
+                    code_group = codes[code]
 
-                    lines.append(f"#### [{code}] - {len(code_group)} unique, {code_total} total")
-                    lines.append("")
+                    emit(f"#### [{code}] - {code_group.unique} unique, {code_group.total} total")
+                    emit()
 
-                    for warning in sorted(code_group, key=lambda w: w.count, reverse=True)[:5]:
+                    for warning in code_group.top():
+                        result.enrich(warning)
                         count_suffix = f" (×{warning.count})" if warning.count > 1 else ""
                         if warning.file:
-                            lines.append(f"- `{warning.get_location()}`{count_suffix}")
-                            lines.append(f"  - {warning.message}")
+                            emit(f"- `{warning.get_location()}`{count_suffix}")
+                            emit(f"  - {warning.message}")
+                            for line in LogFormatter._context_markdown(warning, "    "):
+                                emit(line)
                         else:
-                            lines.append(f"- {warning.message}{count_suffix}")
+                            emit(f"- {warning.message}{count_suffix}")
 
-                    if len(code_group) > 5:
-                        lines.append(f"- ... and {len(code_group) - 5} more")
-                    lines.append("")
+                    if code_group.unique > 5:
+                        emit(f"- ... and {code_group.unique - 5} more")
+                    emit()
 
         # Exceptions
-        if exceptions:
-            lines.append("## Exceptions")
-            lines.append("")
+        if exception_count:
+            emit("## Exceptions")
+            emit()
 
-            for exc in exceptions:
+            for exc in result.iter_entries(EXCEPTION_TYPES):
                 count_suffix = f" (×{exc.count})" if exc.count > 1 else ""
-                lines.append(f"### [{exc.code}]{count_suffix}")
-                lines.append("")
-                lines.append(f"**Message:** {exc.message}")
-                lines.append("")
+                emit(f"### [{exc.code}]{count_suffix}")
+                emit()
+                emit(f"**Message:** {exc.message}")
+                emit()
+
+    @staticmethod
+    def write_sarif(
+        result: ParseResult,
+        stream: TextIO,
+        errors_only: bool = False,
+        source_root: Optional[Path] = None
+    ) -> None:
+        """Write SARIF 2.1.0, streaming one result at a time instead of building the whole document"""
+        stream.write('{\n')
+        stream.write(f'  "$schema": {json.dumps(SARIF_SCHEMA)},\n')
+        stream.write('  "version": "2.1.0",\n')
+        stream.write('  "runs": [\n    {\n      "results": [')
+
+        # Rules are collected while streaming and written after the results
+        rule_indexes: Dict[str, int] = {}
+        rules = []
+        separator = '\n'
+        for entry in result.entries:
+            if errors_only and entry.type != ErrorType.COMPILER_ERROR.value:
+                continue
+            if entry.code not in rule_indexes:
+                rule_indexes[entry.code] = len(rules)
+                rules.append(LogFormatter._sarif_rule(entry.code))
+            stream.write(separator + '        ' + json.dumps(LogFormatter._sarif_result(entry, rule_indexes[entry.code])))
+            separator = ',\n'
+        stream.write('\n      ],\n')
+
+        invocation = {
+            'executionSuccessful': not result.fail_fast_reason,
+            'properties': {'totalLines': result.total_lines, 'parseTime': result.parse_time}
+        }
+        if result.fail_fast_reason:
+            invocation['toolExecutionNotifications'] = [
+                {'level': 'error', 'message': {'text': f"Fail-fast: {result.fail_fast_reason}"}}
+            ]
+
+        tail = {
+            'tool': {'driver': {'name': 'parse_unity_log', 'rules': rules}},
+            'invocations': [invocation],
+        }
+        if source_root:
+            tail['originalUriBaseIds'] = {'SRCROOT': {'uri': source_root.resolve().as_uri() + '/'}}
+
+        members = [f'      {json.dumps(key)}: {json.dumps(value)}' for key, value in tail.items()]
+        stream.write(',\n'.join(members))
+        stream.write('\n    }\n  ]\n}\n')
 
-        return "\n".join(lines)
+    @staticmethod
+    def _sarif_rule(code: str) -> dict:
+        """Rule metadata from the parser's severity and category maps"""
+        severity = UnityLogParser.SEVERITY_MAP.get(code, Severity.MEDIUM).value
+        category = UnityLogParser.CATEGORY_MAP.get(code, 'General')
+        return {
+            'id': code,
+            'name': code,
+            'shortDescription': {'text': f"{code}: {category}"},
+            'defaultConfiguration': {'level': SARIF_LEVELS[severity]},
+            'properties': {'severity': severity, 'category': category, 'tags': [category]}
+        }
+
+    @staticmethod
+    def _sarif_result(entry: LogEntry, rule_index: int) -> dict:
+        """Convert a log entry into a SARIF result"""
+        sarif_result = {
+            'ruleId': entry.code,
+            'ruleIndex': rule_index,
+            'level': 'warning' if entry.type == ErrorType.COMPILER_WARNING.value else 'error',
+            'message': {'text': entry.message},
+            'occurrenceCount': entry.count,
+            'partialFingerprints': {
+                'unityLogKey/v1': hashlib.sha1(entry.get_key().encode('utf-8')).hexdigest()
+            },
+            'properties': {'type': entry.type, 'severity': entry.severity, 'category': entry.category}
+        }
+        if entry.assembly:
+            sarif_result['properties']['assembly'] = entry.assembly
+
+        if entry.file:
+            uri = entry.file.replace('\\', '/')
+            if os.path.isabs(entry.file):
+                artifact = {'uri': Path(entry.file).as_uri()}
+            else:
+                artifact = {'uri': uri, 'uriBaseId': 'SRCROOT'}
+
+            physical = {'artifactLocation': artifact}
+            if entry.line:
+                physical['region'] = {'startLine': entry.line}
+                if entry.column:
+                    physical['region']['startColumn'] = entry.column
+            if entry.context:
+                physical['contextRegion'] = {
+                    'startLine': entry.context[0]['line'],
+                    'endLine': entry.context[-1]['line'],
+                    'snippet': {'text': '\n'.join(ctx['text'] for ctx in entry.context)}
+                }
+            sarif_result['locations'] = [{'physicalLocation': physical}]
+
+        return sarif_result
 
     @staticmethod
     def format_csv(result: ParseResult, errors_only: bool = False) -> str:
         """Format as CSV"""
+        return LogFormatter._render(LogFormatter.write_csv, result, errors_only)
+
+    @staticmethod
+    def write_csv(result: ParseResult, stream: TextIO, errors_only: bool = False) -> None:
+        """Write CSV one row at a time"""
         import csv
-        from io import StringIO
 
-        entries = result.entries
-        if errors_only:
-            entries = result.get_by_type('Error')
+        fieldnames = ['type', 'code', 'severity', 'category', 'file', 'line', 'column', 'message', 'count']
+        with_assembly = bool(result.get_assembly_rollup())
+        if with_assembly:
+            fieldnames.insert(fieldnames.index('file'), 'assembly')
 
-        output = StringIO()
-        writer = csv.DictWriter(
-            output,
-            fieldnames=['type', 'code', 'severity', 'category', 'file', 'line', 'column', 'message', 'count']
-        )
+        writer = csv.DictWriter(stream, fieldnames=fieldnames)
         writer.writeheader()
 
-        for entry in entries:
-            writer.writerow({
+        types = [ErrorType.COMPILER_ERROR.value] if errors_only else None
+        for entry in result.iter_entries(types):
+            row = {
                 'type': entry.type,
                 'code': entry.code,
                 'severity': entry.severity,
@@ -530,12 +1457,110 @@ class LogFormatter:
                 'column': entry.column or '',
                 'message': entry.message,
                 'count': entry.count
-            })
+            }
+            if with_assembly:
+                row['assembly'] = entry.assembly or ''
+            writer.writerow(row)
 
-        return output.getvalue()
+
+class ParseCache:
+    """Keeps parsed logs warm across daemon requests, keyed by file identity and parse options"""
+
+    def __init__(self, max_size: int = PARSE_CACHE_SIZE):
+        self.max_size = max_size
+        self._results: OrderedDict = OrderedDict()
+
+    def get_or_parse(self, log_path: Path, options: tuple, parse: Callable[[], ParseResult]) -> ParseResult:
+        """Get a private copy of a cached result, parsing the log on a miss"""
+        if not log_path.exists():
+            return parse()
+
+        stat = log_path.stat()
+        key = (str(log_path.resolve()), stat.st_size, stat.st_mtime_ns, options)
+
+        result = self._results.get(key)
+        if result is None:
+            result = parse()
+            # Results streamed from disk cannot be shared between requests
+            if isinstance(result.entries, SpilledEntries):
+                return result
+            self._results[key] = result
+            if len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+        else:
+            self._results.move_to_end(key)
+
+        # Enrichment mutates entries, so every request works on its own copies
+        return replace(result, entries=[replace(entry) for entry in result.entries])
+
+
+# Set by serve(); None when running as a plain CLI invocation
+_parse_cache: Optional[ParseCache] = None
+
+
+def default_socket_path() -> Path:
+    """Per-user daemon socket in the temp directory"""
+    user = os.getuid() if hasattr(os, 'getuid') else os.environ.get('USERNAME', 'user')
+    return Path(tempfile.gettempdir()) / f'unity-log-parser-{user}.sock'
+
+
+def serve(socket_path: Path) -> None:
+    """Run a long-lived daemon answering CLI requests over a Unix socket"""
+    import signal
+    import socketserver
+
+    global _parse_cache
+    _parse_cache = ParseCache()
+
+    # Let SIGTERM unwind through the cleanup below
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            request = json.loads(self.rfile.readline())
+            self.wfile.write(json.dumps(_run_request(request)).encode('utf-8') + b'\n')
+
+    if socket_path.exists():
+        socket_path.unlink()
+
+    old_umask = os.umask(0o077)
+    try:
+        server = socketserver.UnixStreamServer(str(socket_path), RequestHandler)
+    finally:
+        os.umask(old_umask)
+
+    print(f"Unity log parser daemon listening on {socket_path}", file=sys.stderr)
+    print(f"Point clients at it with: export {SOCKET_ENV_VAR}={socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+
+
+def _run_request(request: dict) -> dict:
+    """Execute one forwarded CLI invocation, capturing its output and exit code"""
+    stdout, stderr = StringIO(), StringIO()
+    exit_code = 0
+    previous_cwd = os.getcwd()
+    try:
+        os.chdir(request['cwd'])
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            main(request['argv'], forward=False)
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 2)
+    except Exception as e:
+        stderr.write(f"Daemon error: {e}\n")
+        exit_code = 2
+    finally:
+        os.chdir(previous_cwd)
+
+    return {'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'exit_code': exit_code}
 
 
-def main():
+def main(argv: Optional[List[str]] = None, forward: bool = True):
     """Main entry point"""
     parser = argparse.ArgumentParser(
         description='Parse Unity build logs and extract errors/warnings',
@@ -546,13 +1571,27 @@ Examples:
     %(prog)s output/unity-build.log --format json > errors.json
     %(prog)s output/unity-build.log --errors-only --format markdown
     %(prog)s output/unity-build.log --format csv > errors.csv
+    %(prog)s output/unity-build.log --format sarif --output errors.sarif
+    %(prog)s output/unity-build.log --follow --fail-fast --max-errors 20
+    %(prog)s - --fail-fast < output/unity-build.log
+    %(prog)s output/unity-build.log --context 3 --source-root projects/client
+    %(prog)s output/unity-build.log --assemblies --source-root projects/client
+    %(prog)s output/unity-build.log --memory-budget 64 --format json
+    %(prog)s --serve
+    %(prog)s output/unity-build.log --socket /tmp/unity-log-parser-1000.sock
+
+Exit codes:
+    0  no errors
+    1  errors found
+    2  parser failure
+    3  fail-fast threshold hit (partial report written)
         """
     )
 
-    parser.add_argument('log_file', type=Path, help='Path to Unity log file')
+    parser.add_argument('log_file', type=Path, nargs='?', help="Path to Unity log file ('-' for stdin)")
     parser.add_argument(
         '--format', '-f',
-        choices=['summary', 'json', 'markdown', 'csv'],
+        choices=['summary', 'json', 'markdown', 'csv', 'sarif'],
         default='summary',
         help='Output format (default: summary)'
     )
@@ -571,41 +1610,176 @@ Examples:
         action='store_true',
         help='Verbose output'
     )
+    parser.add_argument(
+        '--follow',
+        action='store_true',
+        help='Keep reading the log as Unity appends to it'
+    )
+    parser.add_argument(
+        '--idle-timeout',
+        type=float,
+        default=60.0,
+        help='With --follow, stop after this many seconds without new output (default: 60)'
+    )
+    parser.add_argument(
+        '--fail-fast',
+        action='store_true',
+        help=f'Stop at the first issue at or above --fail-severity and exit with code {EXIT_FAIL_FAST}'
+    )
+    parser.add_argument(
+        '--fail-severity',
+        choices=[s.value for s in Severity],
+        default=Severity.CRITICAL.value,
+        help='Severity threshold for --fail-fast (default: critical)'
+    )
+    parser.add_argument(
+        '--max-errors',
+        type=int,
+        help=f'Stop once this many unique compile errors are found and exit with code {EXIT_FAIL_FAST}'
+    )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        '--context',
+        type=int,
+        default=0,
+        metavar='N',
+        help='Include N source lines around each error/warning location (summary, json, markdown, sarif)'
+    )
+    parser.add_argument(
+        '--source-root',
+        type=Path,
+        default=Path('.'),
+        help='Directory that relative log file paths resolve against (default: current directory)'
+    )
+    parser.add_argument(
+        '--assemblies',
+        action='store_true',
+        help='Attribute errors/warnings to their .asmdef assembly and add per-assembly rollups'
+    )
+    parser.add_argument(
+        '--asmdef-cache',
+        type=Path,
+        help='asmdef index cache file (default: <source-root>/Library/asmdef-index.json or temp dir)'
+    )
+    parser.add_argument(
+        '--memory-budget',
+        type=float,
+        metavar='MB',
+        help='Spill the deduplication table to a temporary SQLite file beyond this size (output is exact)'
+    )
+    parser.add_argument(
+        '--spill-dir',
+        type=Path,
+        help='Directory for spill files (default: system temp directory)'
+    )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Run as a daemon on --socket, keeping parsed logs warm for repeated queries'
+    )
+    parser.add_argument(
+        '--socket',
+        type=Path,
+        default=os.environ.get(SOCKET_ENV_VAR),
+        help=f'Daemon socket; when set, requests are forwarded to a running daemon '
+             f'(default: ${SOCKET_ENV_VAR}, or {default_socket_path()} for --serve)'
+    )
+
+    argv = sys.argv[1:] if argv is None else argv
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        if not hasattr(socket, 'AF_UNIX'):
+            parser.error('--serve requires Unix domain socket support')
+        serve(args.socket or default_socket_path())
+        return
+
+    if args.log_file is None:
+        parser.error('the following arguments are required: log_file')
+
+    # stdin is always read until EOF; there is no file to poll for appended data
+    if args.follow and str(args.log_file) == '-':
+        parser.error('--follow cannot be used with stdin (-)')
+
+    # Thin-client mode: let a warm daemon do the work, fall back to parsing locally
+    if forward and args.socket and not _runs_locally(argv):
+        exit_code = forward_to_daemon(args.socket, argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    fail_fast = None
+    if args.fail_fast or args.max_errors:
+        fail_fast = FailFastPolicy(
+            severity=args.fail_severity if args.fail_fast else None,
+            max_errors=args.max_errors
+        )
 
     # Parse log file
     try:
-        log_parser = UnityLogParser()
-        result = log_parser.parse_file(args.log_file)
+        memory_budget = int(args.memory_budget * 1024 * 1024) if args.memory_budget else None
+
+        # Attribute file locations to Unity assemblies while parsing
+        assembly_index = None
+        if args.assemblies:
+            assembly_index = AssemblyIndex.load(args.source_root, args.asmdef_cache)
+
+        log_parser = UnityLogParser(
+            fail_fast=fail_fast,
+            memory_budget=memory_budget,
+            spill_dir=args.spill_dir,
+            assembly_index=assembly_index
+        )
+        if str(args.log_file) == '-':
+            result = log_parser.parse_stream(sys.stdin)
+        elif _parse_cache is not None and not args.follow:
+            options = (fail_fast, memory_budget, str(args.source_root.resolve()) if args.assemblies else None)
+            result = _parse_cache.get_or_parse(
+                args.log_file, options, lambda: log_parser.parse_file(args.log_file)
+            )
+        else:
+            result = log_parser.parse_file(args.log_file, follow=args.follow, idle_timeout=args.idle_timeout)
 
         if args.verbose:
             print(f"Parsed {result.total_lines} lines in {result.parse_time:.3f}s", file=sys.stderr)
             print(f"Found {len(result.entries)} unique issues", file=sys.stderr)
+            if log_parser.entries.spilled:
+                print("Deduplication table spilled to disk (memory budget exceeded)", file=sys.stderr)
 
-        # Format output
-        formatter = LogFormatter()
+        # Attach source context from the working tree
+        context_provider = None
+        if args.context > 0 and args.format != 'csv':
+            context_provider = SourceContextProvider(args.source_root)
+            result.apply(lambda entry: context_provider.attach(entry, args.context))
 
-        if args.format == 'summary':
-            output = formatter.format_summary(result, args.errors_only)
-        elif args.format == 'json':
-            output = formatter.format_json(result, args.errors_only)
-        elif args.format == 'markdown':
-            output = formatter.format_markdown(result, args.errors_only)
-        elif args.format == 'csv':
-            output = formatter.format_csv(result, args.errors_only)
-
-        # Write output
-        if args.output:
-            args.output.write_text(output, encoding='utf-8')
-            if args.verbose:
-                print(f"Output written to {args.output}", file=sys.stderr)
-        else:
-            print(output)
+        # Format output, streamed straight to the destination instead of being built as one string
+        formatter = LogFormatter()
+        newline = '' if args.format == 'csv' else None
+        destination = open(args.output, 'w', encoding='utf-8', newline=newline) if args.output else nullcontext(sys.stdout)
+        with destination as stream:
+            if args.format == 'sarif':
+                formatter.write_sarif(result, stream, args.errors_only, args.source_root)
+            elif args.format == 'summary':
+                formatter.write_summary(result, stream, args.errors_only)
+            elif args.format == 'json':
+                formatter.write_json(result, stream, args.errors_only)
+            elif args.format == 'markdown':
+                formatter.write_markdown(result, stream, args.errors_only)
+            elif args.format == 'csv':
+                formatter.write_csv(result, stream, args.errors_only)
+
+        if args.output and args.verbose:
+            print(f"Output written to {args.output}", file=sys.stderr)
+
+        if context_provider:
+            context_provider.close()
+
+        # Signal the build orchestrator that the build is doomed
+        if result.fail_fast_reason:
+            print(f"Fail-fast: {result.fail_fast_reason}", file=sys.stderr)
+            sys.exit(EXIT_FAIL_FAST)
 
         # Exit with error code if errors found
-        errors = result.get_by_type('Error')
-        if errors:
+        if result.get_summary().get(ErrorType.COMPILER_ERROR.value):
             sys.exit(1)
 
     except FileNotFoundError as e:
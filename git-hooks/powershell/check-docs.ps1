@@ -239,7 +239,7 @@ if ($Report) {
         <ul>
             <li>Fix scattered docs: <code>.\scripts\check-docs.ps1 -Fix</code></li>
             <li>Validate all: <code>python scripts/docs_validate.py</code></li>
-            <li>Pre-commit check: <code>pre-commit run check-scattered-docs --all-files</code></li>
+            <li>Pre-commit check: <code>python git-hooks/python/run_hooks.py --hook check-scattered-docs</code></li>
         </ul>
     </div>
 </body>
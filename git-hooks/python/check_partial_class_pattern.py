@@ -11,14 +11,29 @@ This hook is part of the enforcement strategy for R-CODE-090.
 Rule: R-CODE-090 - Partial Class Interface Separation
 Documentation: docs/CODING-PATTERNS.md
 Enforcement: Pre-commit hook + Roslyn analyzer (future)
+
+--timing (or HOOK_TIMING=1) records phase timings; see hook_timing.py.
 """
 
+import argparse
+import json
 import os
 import re
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+import hook_timing
+
+# Shared C# scanner and symbol index (scripts/csharp_symbols.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+from csharp_symbols import GitBlobReader, SymbolIndex, TypeSymbol, parse_symbols  # noqa: E402
+from find_multiple_types import CSharpTypeScanner  # noqa: E402
+
+# Below this many files to parse, worker process startup costs more than it saves
+PARALLEL_MIN_FILES = 200
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == "win32":
@@ -45,91 +60,304 @@ def print_colored(message: str, color: str = Colors.RESET) -> None:
         print(f"{color}{message.encode('ascii', 'replace').decode('ascii')}{Colors.RESET}")
 
 
-def get_staged_cs_files() -> List[str]:
-    """Get list of staged C# files."""
+def get_staged_cs_files() -> List[Tuple[str, str]]:
+    """Get staged C# files as (path, blob id) pairs; the blob is the staged (index) version."""
     try:
         result = subprocess.run(
-            ["git", "diff", "--cached", "--name-only", "--diff-filter=ACM"],
+            ["git", "diff", "--cached", "--raw", "-z", "--no-abbrev", "--diff-filter=ACMR"],
             capture_output=True,
-            text=True,
             check=True,
         )
-        files = [
-            line.strip()
-            for line in result.stdout.splitlines()
-            if line.strip().endswith(".cs")
-        ]
-        return files
     except subprocess.CalledProcessError as e:
         print_colored(f"Error getting staged files: {e}", Colors.RED)
         return []
 
-
-def check_partial_class_pattern(file_path: str) -> Optional[Dict]:
+    # ":<old mode> <new mode> <old blob> <new blob> <status>" then the path (old and new for renames)
+    fields = os.fsdecode(result.stdout).split("\0")
+    files = []
+    i = 0
+    while i + 1 < len(fields):
+        meta = fields[i].split()
+        paths = 2 if meta[-1][0] in "RC" else 1
+        path = fields[i + paths]
+        i += 1 + paths
+        if path.endswith(".cs"):
+            files.append((path, meta[3]))
+    return files
+
+
+def check_partial_class_pattern(file_path: str, index: Optional[SymbolIndex] = None) -> List[Dict]:
     """
     Check if a C# file follows the partial class interface separation pattern.
 
-    Returns a violation dict if pattern is violated, None otherwise.
+    Every class declaration in the file is checked, nested ones included.
+    Symbols come from the shared index when given (parsing only files changed
+    since they were indexed), otherwise the file is parsed directly.
+
+    Returns a violation dict per offending class (empty if the file passes).
     """
     path = Path(file_path)
     if not path.exists():
-        return None
+        return []
 
     try:
-        content = path.read_text(encoding="utf-8")
+        symbols = index.symbols(path) if index else parse_symbols(path.read_text(encoding="utf-8"))
     except Exception as e:
         print_colored(f"Warning: Could not read {file_path}: {e}", Colors.YELLOW)
-        return None
+        return []
 
-    # Regex to find class declarations with multiple interfaces
-    # Matches: class ClassName : BaseClass, IInterface1, IInterface2
-    # or: class ClassName : IInterface1, IInterface2
-    pattern = r"(?m)^\s*(partial\s+)?class\s+(\w+)\s*:\s*([^{]+?)(?={)"
+    return find_violations(file_path, symbols)
 
-    match = re.search(pattern, content)
-    if not match:
+
+def expected_file_name(class_name: str, interface: str) -> Optional[str]:
+    """Partial class file for one interface, e.g. Foo + IBar<T> -> Foo.Bar.cs
+
+    None when the interface is named after the class (Foo + IFoo), as
+    Foo.Foo.cs would be no useful suggestion.
+    """
+    # Remove 'I' prefix from interface name for file naming
+    interface_name = re.sub(r"^I(?=[A-Z])", "", interface.split("<")[0].split(".")[-1])
+    if interface_name == class_name:
         return None
+    return f"{class_name}.{interface_name}.cs"
 
-    class_declaration = match.group(3).strip()
-    class_name = match.group(2)
 
-    # Split by comma to count inheritance items
-    inheritance_items = [item.strip() for item in class_declaration.split(",") if item.strip()]
+def expected_file_names(class_name: str, interfaces: List[str]) -> List[str]:
+    """Suggested partial class files for interfaces, skipping those without a useful name."""
+    names = (expected_file_name(class_name, interface) for interface in interfaces)
+    return [name for name in names if name]
 
-    if len(inheritance_items) <= 1:
-        return None
+
+def find_violations(file_path: str, symbols: List[TypeSymbol]) -> List[Dict]:
+    """R-CODE-090 violations among the type declarations of one file."""
+    path = Path(file_path)
 
     # Check if this is a base file (ClassName.cs) or interface file (ClassName.IInterfaceName.cs)
     file_name = path.stem  # Filename without extension
-    base_name = file_name.split(".")[0]
 
-    # If file is ClassName.cs and has multiple items, it's likely a violation
-    if file_name == class_name:
+    violations = []
+    for declaration in symbols:
+        # e.g. class ClassName : BaseClass, IInterface1, IInterface2 where T : class
+        # or: class ClassName : IInterface1, IInterface2
+        # Inheritance items are split at top-level commas (generic arguments stay
+        # whole); where clauses are kept separately and never count as bases
+        if declaration.kind != "class" or len(declaration.bases) <= 1:
+            continue
+
+        class_name = declaration.name
+
+        # If file is ClassName.cs and has multiple items, it's likely a violation
+        if file_name != class_name:
+            continue
+
         # This is the base file - should only have one inheritance
-        interfaces = inheritance_items[1:]  # Skip the first item (base class)
+        interfaces = declaration.bases[1:]  # Skip the first item (base class)
 
-        if interfaces:
-            expected_files = []
-            for interface in interfaces:
-                # Remove 'I' prefix from interface name for file naming
-                interface_name = re.sub(r"^I", "", interface)
-                expected_files.append(f"{class_name}.{interface_name}.cs")
+        expected_files = expected_file_names(class_name, interfaces)
 
-            return {
-                "file": file_path,
-                "class": class_name,
-                "message": f"Class '{class_name}' implements multiple interfaces in base file. Each interface should be in a separate partial class file.",
-                "interfaces": interfaces,
-                "expected_files": expected_files,
-            }
+        violations.append({
+            "file": file_path,
+            "class": class_name,
+            "line": declaration.start_line + 1,
+            "message": f"Class '{class_name}' implements multiple interfaces in base file. Each interface should be in a separate partial class file.",
+            "interfaces": interfaces,
+            "expected_files": expected_files,
+        })
+
+    return violations
+
+
+def check_staged_blobs(staged_files: List[Tuple[str, str]], index: Optional[SymbolIndex] = None) -> List[Dict]:
+    """
+    Check the staged (index) versions of C# files, given as (path, blob id) pairs.
+
+    Blobs already in the shared index are not read again. The rest are read
+    through one `git cat-file --batch` process and parsed, across worker
+    processes when there are many; fresh parses are added to the index.
+    """
+    symbols_by_blob: Dict[str, List[TypeSymbol]] = {}
+    if index:
+        with hook_timing.phase("index"):
+            for _, blob in staged_files:
+                if blob not in symbols_by_blob:
+                    symbols = index.lookup_blob(blob)
+                    if symbols is not None:
+                        symbols_by_blob[blob] = symbols
+
+    missing = list(dict.fromkeys(blob for _, blob in staged_files if blob not in symbols_by_blob))
+    sizes: Dict[str, int] = {}
+    texts: Dict[str, str] = {}
+    if missing:
+        with hook_timing.phase("read"), GitBlobReader(Path.cwd()) as reader:
+            for blob, result in reader.read_many(missing):
+                try:
+                    if result is None:
+                        raise ValueError("blob not found")
+                    texts[blob] = result[1].decode("utf-8")
+                    sizes[blob] = len(result[1])
+                except ValueError as e:
+                    print_colored(f"Warning: Could not read staged blob {blob}: {e}", Colors.YELLOW)
+
+        with hook_timing.phase("parse"):
+            if len(texts) >= PARALLEL_MIN_FILES and (os.cpu_count() or 1) > 1:
+                with ProcessPoolExecutor() as pool:
+                    parsed = list(pool.map(parse_symbols, texts.values(), chunksize=16))
+            else:
+                parsed = [parse_symbols(text) for text in texts.values()]
+            symbols_by_blob.update(zip(texts, parsed))
+
+    violations = []
+    for file_path, blob in staged_files:
+        if blob not in symbols_by_blob:
+            continue
+        if index and blob in texts:
+            # No mtime: the working tree copy is checked against the blob id before reuse
+            with hook_timing.phase("index"):
+                index.store(Path.cwd() / file_path, (sizes[blob], -1, blob), symbols_by_blob[blob])
+        with hook_timing.phase("validate"):
+            violations.extend(find_violations(file_path, symbols_by_blob[blob]))
+    return violations
+
+
+def partial_class_files(root: Path, class_names: List[str]) -> List[str]:
+    """Staged .cs files (relative to root) that may declare a part of one of the named partial classes.
+
+    One `git grep --cached` over the git index; a part must contain
+    'partial class Name', so no other file needs to be parsed.
+    Raises OSError/subprocess.CalledProcessError.
+    """
+    if not class_names:
+        return []
+    patterns = []
+    for name in sorted(class_names):
+        patterns.extend(["-e", rf"partial[[:space:]]+class[[:space:]]+{re.escape(name)}([^[:alnum:]_]|$)"])
+    result = subprocess.run(
+        ["git", "grep", "--cached", "-l", "-z", "-E", *patterns, "--", "*.cs"],
+        cwd=root, capture_output=True,
+    )
+    # Exit code 1 means no matches
+    if result.returncode not in (0, 1):
+        raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
+    return [path for path in os.fsdecode(result.stdout).split("\0") if path]
+
+
+def check_partial_parts(staged_files: List[Tuple[str, str]], index: SymbolIndex) -> List[Dict]:
+    """
+    Validate the complete set of parts of every partial class declared in a staged file.
+
+    Only the staged files and the files `git grep` finds declaring a partial
+    class of the same name are synced into the shared index (parsing just the
+    blobs it does not have yet); the tree is never scanned, even when the
+    index is cold. Parts are then looked up by namespace and class name.
+    Checks that the base file (ClassName.cs) exists, that each interface is
+    declared in its own ClassName.Interface.cs part, and that no interface is
+    declared by more than one part.
+    """
+    partials = []
+    for _, blob in staged_files:
+        for symbol in index.lookup_blob(blob) or []:
+            if symbol.kind == "class" and symbol.partial and not symbol.nested:
+                partials.append(symbol)
+    if not partials:
+        return []
+
+    with hook_timing.phase("git"):
+        candidates = partial_class_files(index.root_path, list({symbol.name for symbol in partials}))
+        tracked = index.sync_with_git(dict.fromkeys([path for path, _ in staged_files] + candidates))
+
+    violations = []
+    seen = set()
+    with hook_timing.phase("validate"):
+        for symbol in partials:
+            identity = (symbol.namespace, symbol.name, symbol.arity)
+            if identity in seen:
+                continue
+            seen.add(identity)
+            parts = [
+                (path, part)
+                for path, part in index.types_named(symbol.namespace, symbol.name)
+                if path in tracked and part.kind == "class" and not part.nested and part.arity == symbol.arity
+            ]
+            violations.extend(validate_parts(symbol.name, parts))
+    return violations
+
+
+def validate_parts(class_name: str, parts: List[Tuple[str, TypeSymbol]]) -> List[Dict]:
+    """
+    Cross-file R-CODE-090 violations among the parts of one partial class.
 
-    return None
+    R-CODE-090 covers splitting multiple interfaces, so classes declaring
+    fewer than two interfaces across all their parts always pass (e.g. a
+    platform-specific Foo.iOS.cs repeating Foo.cs's single interface).
+    """
+    base_files = {path for path, _ in parts if Path(path).stem == class_name}
+    violations = []
 
+    def violation(path: str, part: TypeSymbol, message: str, interfaces: List[str]) -> Dict:
+        return {
+            "file": path,
+            "class": class_name,
+            "line": part.start_line + 1,
+            "message": message,
+            "interfaces": interfaces,
+            "expected_files": expected_file_names(class_name, interfaces),
+        }
+
+    # Interfaces per part. The first item in the base file is its base class
+    # unless it is named like an interface (IName); other parts may only add
+    # interfaces, anything else there is skipped.
+    declared: Dict[str, List[Tuple[str, TypeSymbol]]] = {}
+    for path, part in parts:
+        for position, interface in enumerate(part.bases):
+            if re.match(r"I[A-Z]", interface.split(".")[-1]) or (path in base_files and position > 0):
+                declared.setdefault("".join(interface.split()), []).append((path, part))
+    if len(declared) < 2:
+        return []
 
-def check_staged_files() -> bool:
+    if not base_files:
+        named = [(path, part) for path, part in parts if Path(path).stem.startswith(f"{class_name}.")]
+        if named:
+            path, part = named[0]
+            violations.append(violation(
+                path, part,
+                f"Partial class '{class_name}' has no base file {class_name}.cs.",
+                [interface for interface, where in declared.items() if (path, part) in where],
+            ))
+
+    for interface, where in declared.items():
+        paths = sorted({path for path, _ in where})
+        if len(paths) > 1:
+            path, part = where[0]
+            violations.append(violation(
+                path, part,
+                f"Interface '{interface}' of class '{class_name}' is declared in multiple parts: {', '.join(paths)}.",
+                [interface],
+            ))
+
+        # Base file interfaces are reported by the per-file check or as duplicates above
+        if any(path in base_files for path, _ in where):
+            continue
+        expected = expected_file_name(class_name, interface)
+        if expected is None:
+            continue
+        for path, part in where:
+            if Path(path).name != expected:
+                violations.append(violation(
+                    path, part,
+                    f"Interface '{interface}' of class '{class_name}' should be declared in {expected}.",
+                    [interface],
+                ))
+
+    return violations
+
+
+def check_staged_files(staged_files: Optional[List[Tuple[str, str]]] = None) -> bool:
     """
     Check all staged C# files for partial class pattern violations.
 
+    staged_files defaults to get_staged_cs_files() (the hook runner passes
+    its shared list).
+
     Returns True if all files pass, False if violations found.
     """
     print_colored(
@@ -137,68 +365,215 @@ def check_staged_files() -> bool:
         Colors.BLUE,
     )
 
-    staged_files = get_staged_cs_files()
+    if staged_files is None:
+        with hook_timing.phase("git"):
+            staged_files = get_staged_cs_files()
 
     if not staged_files:
         print_colored("✅ No C# files staged for commit.", Colors.GREEN)
         return True
 
-    violations = []
-    for file_path in staged_files:
-        violation = check_partial_class_pattern(file_path)
-        if violation:
-            violations.append(violation)
+    index = None
+    try:
+        with hook_timing.phase("index"):
+            index = SymbolIndex.open(Path.cwd())
+    except Exception as e:
+        print_colored(f"Warning: C# symbol index unavailable, parsing files directly: {e}", Colors.YELLOW)
+
+    try:
+        violations = check_staged_blobs(staged_files, index)
+        if index:
+            try:
+                violations.extend(check_partial_parts(staged_files, index))
+            except (OSError, subprocess.CalledProcessError) as e:
+                print_colored(f"Warning: Could not validate partial class parts across files: {e}", Colors.YELLOW)
+    finally:
+        if index:
+            index.close()
 
     if violations:
+        with hook_timing.phase("report"):
+            print_violations(violations)
+            print_colored(
+                "To bypass this check (not recommended): git commit --no-verify\n",
+                Colors.YELLOW,
+            )
+        return False
+
+    print_colored("✅ All staged C# files follow partial class pattern.", Colors.GREEN)
+    return True
+
+
+def print_violations(violations: List[Dict]) -> None:
+    """Print violations with the expected file structure."""
+    print_colored(
+        "\n❌ Partial class pattern violations detected (R-CODE-090):\n",
+        Colors.RED,
+    )
+
+    for v in violations:
+        print_colored(f"  File: {v['file']}:{v['line']}", Colors.YELLOW)
+        print_colored(f"  Class: {v['class']}", Colors.YELLOW)
+        print_colored(f"  Issue: {v['message']}", Colors.RED)
+        print_colored(f"  Interfaces: {', '.join(v['interfaces'])}", Colors.YELLOW)
+        print()
+        print_colored("  Expected structure:", Colors.BLUE)
         print_colored(
-            "\n❌ Partial class pattern violations detected (R-CODE-090):\n",
-            Colors.RED,
+            f"    - {v['class']}.cs → partial class {v['class']} : BaseClass",
+            Colors.BLUE,
         )
-
-        for v in violations:
-            print_colored(f"  File: {v['file']}", Colors.YELLOW)
-            print_colored(f"  Class: {v['class']}", Colors.YELLOW)
-            print_colored(f"  Issue: {v['message']}", Colors.RED)
-            print_colored(f"  Interfaces: {', '.join(v['interfaces'])}", Colors.YELLOW)
-            print()
-            print_colored("  Expected structure:", Colors.BLUE)
+        for expected_file in v["expected_files"]:
             print_colored(
-                f"    - {v['class']}.cs → partial class {v['class']} : BaseClass",
+                f"    - {expected_file} → partial class {v['class']} : [Interface]",
                 Colors.BLUE,
             )
-            for expected_file in v["expected_files"]:
-                print_colored(
-                    f"    - {expected_file} → partial class {v['class']} : [Interface]",
-                    Colors.BLUE,
-                )
-            print()
+        print()
 
-        print_colored(
-            "See docs/CODING-PATTERNS.md for details on R-CODE-090 pattern.",
-            Colors.YELLOW,
-        )
-        print_colored(
-            "To bypass this check (not recommended): git commit --no-verify\n",
-            Colors.YELLOW,
-        )
+    print_colored(
+        "See docs/CODING-PATTERNS.md for details on R-CODE-090 pattern.",
+        Colors.YELLOW,
+    )
 
-        return False
 
-    print_colored("✅ All staged C# files follow partial class pattern.", Colors.GREEN)
-    return True
+def audit_repository(
+    root: Path,
+    jobs: int = 1,
+    index: Optional[SymbolIndex] = None,
+    exclude: Optional[List[str]] = None,
+) -> Tuple[int, List[Dict]]:
+    """
+    Check every C# file in the working tree; returns (files checked, violations).
+
+    Walks like find_multiple_types (build output and .gitignore'd directories
+    are pruned, never entered), parses in a process pool when jobs > 1 and
+    reuses the shared index, whose entries are validated by size, mtime and
+    content hash. Partial class parts are validated across the whole tree.
+    """
+    scanner = CSharpTypeScanner(root)
+    patterns = [re.compile(pattern) for pattern in exclude or []]
+    files = (
+        file_path for file_path in scanner.iter_csharp_files()
+        if not any(pattern.search(file_path.relative_to(scanner.root_path).as_posix()) for pattern in patterns)
+    )
+    # Walking, reading and parsing are interleaved in parse_files
+    with hook_timing.phase("parse"):
+        results = scanner.parse_files(files, jobs, index)
+
+    violations = []
+    parts: Dict[Tuple[str, str, int], List[Tuple[str, TypeSymbol]]] = {}
+    with hook_timing.phase("validate"):
+        for file_path, symbols in results:
+            if symbols is None:
+                continue
+            relative_path = file_path.relative_to(scanner.root_path).as_posix()
+            violations.extend(find_violations(relative_path, symbols))
+            for symbol in symbols:
+                if symbol.kind == "class" and not symbol.nested:
+                    parts.setdefault((symbol.namespace, symbol.name, symbol.arity), []).append((relative_path, symbol))
+
+        for (_, class_name, _), class_parts in parts.items():
+            if any(part.partial for _, part in class_parts):
+                violations.extend(validate_parts(class_name, class_parts))
+
+    return len(results), violations
+
+
+def json_report(files_checked: int, violations: List[Dict]) -> str:
+    """Audit report as JSON."""
+    return json.dumps({
+        "rule": "R-CODE-090",
+        "files_checked": files_checked,
+        "total_violations": len(violations),
+        "violations": violations,
+    }, indent=2)
+
+
+def markdown_report(files_checked: int, violations: List[Dict]) -> str:
+    """Audit report as markdown."""
+    lines = [
+        "# Partial Class Interface Separation (R-CODE-090)",
+        "",
+        f"**Files checked:** {files_checked}",
+        f"**Total violations:** {len(violations)}",
+    ]
+    if not violations:
+        return "\n".join(lines + ["", "✓ No violations found!"])
+
+    lines.extend([
+        "",
+        "| File | Line | Class | Issue | Expected files |",
+        "|------|------|-------|-------|----------------|",
+    ])
+    for v in violations:
+        expected = ", ".join(f"`{name}`" for name in v["expected_files"])
+        lines.append(f"| `{v['file']}` | {v['line']} | `{v['class']}` | {v['message']} | {expected} |")
+
+    lines.extend(["", "See docs/CODING-PATTERNS.md for details on R-CODE-090 pattern."])
+    return "\n".join(lines)
+
+
+def run_audit(args: argparse.Namespace) -> int:
+    """Audit the whole repository (--all); exits 1 if violations were found."""
+    root = Path(args.path)
+    index = None
+    if not args.no_cache:
+        try:
+            index = SymbolIndex.open(root)
+        except Exception as e:
+            print_colored(f"Warning: C# symbol index unavailable, parsing files directly: {e}", Colors.YELLOW)
+
+    try:
+        files_checked, violations = audit_repository(root, args.jobs or os.cpu_count() or 1, index, args.exclude)
+    finally:
+        if index:
+            index.close()
+
+    with hook_timing.phase("report"):
+        if args.format == "console":
+            if violations:
+                print_violations(violations)
+            else:
+                print_colored(f"✅ All {files_checked} C# files follow partial class pattern.", Colors.GREEN)
+            return 1 if violations else 0
+
+        output = json_report(files_checked, violations) if args.format == "json" else markdown_report(files_checked, violations)
+        if args.output:
+            Path(args.output).write_text(output + "\n", encoding="utf-8")
+            print_colored(f"Report saved to: {args.output} ({len(violations)} violations in {files_checked} files)", Colors.BLUE)
+        else:
+            print(output)
+        return 1 if violations else 0
 
 
 def main() -> int:
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Check the partial class interface separation pattern (R-CODE-090)")
+    parser.add_argument("--all", action="store_true", help="Audit every C# file in the repository instead of staged files")
+    parser.add_argument("path", nargs="?", default=".", help="Root directory for --all (default: current directory)")
+    parser.add_argument("--format", choices=["console", "json", "markdown"], default="console", help="Report format for --all")
+    parser.add_argument("--output", "-o", help="Write the --all report to a file")
+    parser.add_argument("--jobs", "-j", type=int, default=0, help="Worker processes for --all (0 = one per CPU, default)")
+    parser.add_argument("--exclude", action="append", metavar="REGEX", help="Skip paths matching REGEX in --all (repeatable)")
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the shared symbol index")
+    parser.add_argument("--timing", action="store_true", help="Record phase timings (same as HOOK_TIMING=1)")
+    args = parser.parse_args()
+
+    hook_timing.start("partial-class-audit" if args.all else "partial-class-interface-separation", force=args.timing)
+    code = 1
     try:
-        result = check_staged_files()
-        return 0 if result else 1
+        if args.all:
+            code = run_audit(args)
+        else:
+            code = 0 if check_staged_files() else 1
+        return code
     except Exception as e:
         print_colored(f"❌ Pre-commit hook error: {e}", Colors.RED)
         import traceback
 
         print_colored(f"Stack trace:\n{traceback.format_exc()}", Colors.RED)
         return 1
+    finally:
+        hook_timing.finish(code)
 
 
 if __name__ == "__main__":
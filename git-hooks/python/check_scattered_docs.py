@@ -4,12 +4,19 @@ Pre-commit hook to detect scattered documentation files.
 
 Checks for markdown files in non-canonical locations and blocks commit if found.
 Part of the documentation management system (R-DOC-xxx).
+
+--all checks every tracked markdown file instead of the staged ones.
+--timing (or HOOK_TIMING=1) records phase timings; see hook_timing.py.
 """
 
+import argparse
+import os
 import re
 import subprocess
 import sys
-from typing import List
+from typing import Dict, List, Optional, Pattern
+
+import hook_timing
 
 
 # ANSI color codes
@@ -68,84 +75,196 @@ def get_staged_markdown_files() -> List[str]:
         return []
 
 
+def get_tracked_markdown_files() -> List[str]:
+    """Get list of all tracked markdown files."""
+    result = subprocess.run(
+        ["git", "ls-files", "-z", "--", "*.md"],
+        capture_output=True,
+        check=True,
+    )
+    return [path for path in os.fsdecode(result.stdout).split("\0") if path.endswith(".md")]
+
+
+class _Node:
+    """Path segment in the prefix trie."""
+
+    __slots__ = ("children", "exact", "prefix", "prefix_md")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.exact = False  # ^a/b$: the path ends here
+        self.prefix = False  # ^a/b/: anything below
+        self.prefix_md = False  # ^a/b/.*\.md$: any markdown file below
+
+
+class PathClassifier:
+    r"""
+    ALLOWED_PATTERNS compiled into one matcher.
+
+    Anchored literal rules (^README\.md$, ^docs/, ^build/preparation/.*\.md$)
+    go into a trie keyed by path segment, so a path is matched by walking its
+    own segments once. All other patterns are joined into a single regex.
+    Matches what re.search with each pattern would (for paths without newlines).
+    """
+
+    # "^" + literal text (escaped specials allowed) + optional ".*\.md" + optional "$"
+    _ANCHORED = re.compile(r"\^((?:[^\\.^$*+?{}\[\]|()]|\\[^\w])*)(\.\*\\\.md)?(\$?)")
+
+    def __init__(self, patterns: List[str]):
+        self.root = _Node()
+        others = []
+        for pattern in patterns:
+            if not self._add_anchored(pattern):
+                # A leading .* changes nothing for re.search but makes it try every start position
+                others.append(pattern[2:] if pattern.startswith(".*") else pattern)
+        self.regex: Optional[Pattern] = re.compile("|".join(f"(?:{p})" for p in others)) if others else None
+
+    def _add_anchored(self, pattern: str) -> bool:
+        match = self._ANCHORED.fullmatch(pattern)
+        if not match:
+            return False
+        literal = re.sub(r"\\(.)", r"\1", match.group(1))
+        md, end = bool(match.group(2)), bool(match.group(3))
+        if (md and not end) or ((md or not end) and not literal.endswith("/")):
+            return False  # e.g. ^docs (part of a segment): leave it to the regex
+
+        segments = literal.split("/")
+        if not end or md:
+            segments = segments[:-1]  # trailing "/" of a directory rule
+        node = self.root
+        for segment in segments:
+            node = node.children.setdefault(segment, _Node())
+        if md:
+            node.prefix_md = True
+        elif end:
+            node.exact = True
+        else:
+            node.prefix = True
+        return True
+
+    def is_allowed(self, path: str) -> bool:
+        node = self.root
+        segments = path.split("/")
+        last = len(segments) - 1
+        for i, segment in enumerate(segments):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if i == last:
+                if node.exact:
+                    return True
+            elif node.prefix or (node.prefix_md and path.endswith(".md")):
+                return True
+        return bool(self.regex and self.regex.search(path))
+
+
+_classifier = PathClassifier(ALLOWED_PATTERNS)
+
+
 def is_allowed_location(file_path: str) -> bool:
     """Check if a markdown file is in an allowed location."""
-    for pattern in ALLOWED_PATTERNS:
-        if re.search(pattern, file_path):
-            return True
-    return False
+    return _classifier.is_allowed(file_path)
 
 
-def check_scattered_docs() -> int:
+def check_scattered_docs(staged_files: Optional[List[str]] = None) -> int:
     """
     Check for scattered documentation files.
 
+    staged_files defaults to the staged markdown files (the hook runner passes
+    its shared list, --all every tracked one).
+
     Returns 0 if all files are in allowed locations, 1 if scattered docs found.
     """
-    staged_files = get_staged_markdown_files()
+    if staged_files is None:
+        with hook_timing.phase("git"):
+            staged_files = get_staged_markdown_files()
 
     if not staged_files:
         return 0
 
-    scattered_docs = [f for f in staged_files if not is_allowed_location(f)]
+    with hook_timing.phase("validate"):
+        scattered_docs = [f for f in staged_files if not is_allowed_location(f)]
 
     if scattered_docs:
-        print()
-        print(f"{Colors.RED}ERROR: Scattered documentation detected!{Colors.RESET}")
-        print()
-        print(
-            f"{Colors.YELLOW}The following markdown files are in non-canonical locations:{Colors.RESET}"
-        )
-        print()
+        with hook_timing.phase("report"):
+            print_scattered_docs(scattered_docs)
+        return 1
 
-        for doc in scattered_docs:
-            print(f"{Colors.RED}  - {doc}{Colors.RESET}")
+    return 0
 
-        print()
-        print(
-            f"{Colors.CYAN}Documentation must be in canonical locations:{Colors.RESET}"
-        )
-        print(f"{Colors.GREEN}  - New docs        -> docs/_inbox/{Colors.RESET}")
-        print(f"{Colors.GREEN}  - Guides          -> docs/guides/{Colors.RESET}")
-        print(f"{Colors.GREEN}  - Specifications  -> docs/specs/{Colors.RESET}")
-        print(f"{Colors.GREEN}  - RFCs            -> docs/rfcs/{Colors.RESET}")
-        print(f"{Colors.GREEN}  - ADRs            -> docs/adrs/{Colors.RESET}")
-        print(f"{Colors.GREEN}  - Plans           -> docs/plans/{Colors.RESET}")
-        print(f"{Colors.GREEN}  - Findings        -> docs/findings/{Colors.RESET}")
-        print(f"{Colors.GREEN}  - Obsolete docs   -> docs/archive/{Colors.RESET}")
-        print()
-        print(f"{Colors.CYAN}See: docs/DOCUMENTATION-SCHEMA.md{Colors.RESET}")
-        print(
-            f"{Colors.CYAN}See: .agent/base/40-documentation.md (R-DOC-001){Colors.RESET}"
-        )
-        print()
-        print(f"{Colors.YELLOW}To fix:{Colors.RESET}")
-        print(
-            f"{Colors.WHITE}  1. Move files to proper location (usually docs/_inbox/){Colors.RESET}"
-        )
-        print(
-            f"{Colors.WHITE}  2. Add YAML front-matter (see docs/DOCUMENTATION-SCHEMA.md){Colors.RESET}"
-        )
-        print(
-            f"{Colors.WHITE}  3. Or remove from staging: git reset HEAD <file>{Colors.RESET}"
-        )
-        print()
 
-        return 1
+def print_scattered_docs(scattered_docs: List[str]) -> None:
+    """Print the scattered files and where documentation belongs."""
+    print()
+    print(f"{Colors.RED}ERROR: Scattered documentation detected!{Colors.RESET}")
+    print()
+    print(
+        f"{Colors.YELLOW}The following markdown files are in non-canonical locations:{Colors.RESET}"
+    )
+    print()
 
-    return 0
+    # One write: --all can list thousands of files
+    print("\n".join(f"{Colors.RED}  - {doc}{Colors.RESET}" for doc in scattered_docs))
+
+    print()
+    print(
+        f"{Colors.CYAN}Documentation must be in canonical locations:{Colors.RESET}"
+    )
+    print(f"{Colors.GREEN}  - New docs        -> docs/_inbox/{Colors.RESET}")
+    print(f"{Colors.GREEN}  - Guides          -> docs/guides/{Colors.RESET}")
+    print(f"{Colors.GREEN}  - Specifications  -> docs/specs/{Colors.RESET}")
+    print(f"{Colors.GREEN}  - RFCs            -> docs/rfcs/{Colors.RESET}")
+    print(f"{Colors.GREEN}  - ADRs            -> docs/adrs/{Colors.RESET}")
+    print(f"{Colors.GREEN}  - Plans           -> docs/plans/{Colors.RESET}")
+    print(f"{Colors.GREEN}  - Findings        -> docs/findings/{Colors.RESET}")
+    print(f"{Colors.GREEN}  - Obsolete docs   -> docs/archive/{Colors.RESET}")
+    print()
+    print(f"{Colors.CYAN}See: docs/DOCUMENTATION-SCHEMA.md{Colors.RESET}")
+    print(
+        f"{Colors.CYAN}See: .agent/base/40-documentation.md (R-DOC-001){Colors.RESET}"
+    )
+    print()
+    print(f"{Colors.YELLOW}To fix:{Colors.RESET}")
+    print(
+        f"{Colors.WHITE}  1. Move files to proper location (usually docs/_inbox/){Colors.RESET}"
+    )
+    print(
+        f"{Colors.WHITE}  2. Add YAML front-matter (see docs/DOCUMENTATION-SCHEMA.md){Colors.RESET}"
+    )
+    print(
+        f"{Colors.WHITE}  3. Or remove from staging: git reset HEAD <file>{Colors.RESET}"
+    )
+    print()
 
 
 def main() -> int:
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Detect scattered documentation files (R-DOC-001)")
+    parser.add_argument("--all", action="store_true", help="Check every tracked markdown file instead of staged files")
+    parser.add_argument("--timing", action="store_true", help="Record phase timings (same as HOOK_TIMING=1)")
+    args = parser.parse_args()
+
+    hook_timing.start("scattered-docs-audit" if args.all else "check-scattered-docs", force=args.timing)
+    code = 1
     try:
-        return check_scattered_docs()
+        if not args.all:
+            code = check_scattered_docs()
+            return code
+
+        with hook_timing.phase("git"):
+            files = get_tracked_markdown_files()
+        code = check_scattered_docs(files)
+        if not code:
+            print(f"{Colors.GREEN}✅ All {len(files)} tracked markdown files are in canonical locations.{Colors.RESET}")
+        return code
     except Exception as e:
         print(f"{Colors.RED}❌ Pre-commit hook error: {e}{Colors.RESET}")
         import traceback
 
         print(f"{Colors.RED}Stack trace:\n{traceback.format_exc()}{Colors.RESET}")
         return 1
+    finally:
+        hook_timing.finish(code)
 
 
 if __name__ == "__main__":
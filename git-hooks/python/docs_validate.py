@@ -18,6 +18,20 @@ Validates all markdown files in docs/ for:
 
 Generates docs/index/registry.json for agent consumption.
 
+
+Per-file results are cached in docs/index/registry.cache.json (keyed by
+
+path, mtime, size and content hash), so a run only reprocesses changed
+
+files; --no-cache reprocesses everything. Near-duplicates are looked up in a
+
+banded SimHash index of the corpus, saved as docs/index/simhash-index.json
+
+(local, ignored by git like the cache).
+
+
+--timing (or HOOK_TIMING=1) records phase timings; see hook_timing.py.
+
 """
 
 
@@ -36,6 +50,9 @@ from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timezone
 
 
+import hook_timing
+
+
 try:
 
     import yaml
@@ -74,7 +91,7 @@ except ImportError:
 
 
 
-ROOT = pathlib.Path(__file__).resolve().parents[1]
+ROOT = pathlib.Path(__file__).resolve().parents[2]
 
 DOCS = ROOT / "docs"
 
@@ -84,6 +101,15 @@ ARCHIVE = DOCS / "archive"
 
 REGISTRY = DOCS / "index" / "registry.json"
 
+CACHE = DOCS / "index" / "registry.cache.json"
+
+SIMHASH_INDEX = DOCS / "index" / "simhash-index.json"
+
+
+# Bump when validation rules or registry entry fields change
+
+CACHE_VERSION = 1
+
 
 # Paths to exclude from validation
 
@@ -107,6 +133,11 @@ EXCLUDE_PATTERNS = [
 REQUIRED_FIELDS = ["doc_id", "title", "doc_type", "status", "canonical", "created", "tags", "summary"]
 
 
+# Near-duplicate threshold: max Hamming distance between 64-bit SimHashes
+
+SIMHASH_MAX_DISTANCE = 8
+
+
 # Valid values
 
 VALID_DOC_TYPES = ["spec", "rfc", "adr", "plan", "finding", "guide", "glossary", "reference"]
@@ -368,7 +399,214 @@ def validate_canonical_uniqueness(entries: List[Dict]) -> List[ValidationError]:
 
 
 
-def detect_near_duplicates(entries: List[Dict]) -> List[ValidationError]:
+class SimhashIndex:
+
+    """
+
+    Banded SimHash index for Hamming radius queries.
+
+
+    The hash bits are split into max_distance + 1 bands. Two hashes within
+
+    max_distance differ in at most that many bands, so they share at least one
+
+    band value (pigeonhole): a query only compares against the documents in
+
+    its band buckets instead of every document.
+
+    """
+
+
+    VERSION = 1
+
+
+    def __init__(self, bits: int = 64, max_distance: int = SIMHASH_MAX_DISTANCE):
+
+        self.bits = bits
+
+        self.max_distance = max_distance
+
+        count = max_distance + 1
+
+        self.bands: List[Tuple[int, int]] = []  # (shift, mask)
+
+        shift = 0
+
+        for i in range(count):
+
+            width = bits // count + (1 if i < bits % count else 0)
+
+            self.bands.append((shift, (1 << width) - 1))
+
+            shift += width
+
+        self.hashes: Dict[str, int] = {}
+
+        self.buckets: List[Dict[int, List[str]]] = [{} for _ in self.bands]
+
+
+    def add(self, path: str, value: int):
+
+        self.hashes[path] = value
+
+        for (shift, mask), bucket in zip(self.bands, self.buckets):
+
+            bucket.setdefault((value >> shift) & mask, []).append(path)
+
+
+    def remove(self, path: str):
+
+        value = self.hashes.pop(path)
+
+        for (shift, mask), bucket in zip(self.bands, self.buckets):
+
+            key = (value >> shift) & mask
+
+            bucket[key].remove(path)
+
+            if not bucket[key]:
+
+                del bucket[key]
+
+
+    def update(self, hashes: Dict[str, int]) -> bool:
+
+        """Make the index hold exactly these documents; returns True if it changed."""
+
+        stale = [path for path, value in self.hashes.items() if hashes.get(path) != value]
+
+        for path in stale:
+
+            self.remove(path)
+
+        added = [path for path in hashes if path not in self.hashes]
+
+        for path in added:
+
+            self.add(path, hashes[path])
+
+        return bool(stale or added)
+
+
+    def query(self, value: int) -> List[Tuple[str, int]]:
+
+        """Documents within max_distance of value, as (path, Hamming distance)."""
+
+        # A document sharing several bands with the query is compared only once
+
+        compared = set()
+
+        matches = []
+
+        for (shift, mask), bucket in zip(self.bands, self.buckets):
+
+            for path in bucket.get((value >> shift) & mask, ()):
+
+                if path in compared:
+
+                    continue
+
+                compared.add(path)
+
+                distance = bin(value ^ self.hashes[path]).count("1")
+
+                if distance <= self.max_distance:
+
+                    matches.append((path, distance))
+
+        return matches
+
+
+    @classmethod
+
+    def load(cls, path: pathlib.Path) -> Optional["SimhashIndex"]:
+
+        """Saved index, or None if missing, unreadable or built with other parameters."""
+
+        try:
+
+            with open(path, encoding="utf-8") as f:
+
+                data = json.load(f)
+
+            if data["version"] != cls.VERSION or data["max_distance"] != SIMHASH_MAX_DISTANCE:
+
+                return None
+
+            index = cls(data["bits"], data["max_distance"])
+
+            index.hashes = {doc: int(value) for doc, value in data["docs"].items()}
+
+            index.buckets = [{int(key): paths for key, paths in bucket.items()} for bucket in data["bands"]]
+
+            return index
+
+        except (OSError, ValueError, KeyError, TypeError):
+
+            return None
+
+
+    def save(self, path: pathlib.Path):
+
+        """Write the index (sorted, so an unchanged corpus gives an unchanged file)."""
+
+        data = {
+
+            "version": self.VERSION,
+
+            "bits": self.bits,
+
+            "max_distance": self.max_distance,
+
+            "docs": {doc: str(value) for doc, value in sorted(self.hashes.items())},
+
+            "bands": [
+
+                {str(key): sorted(paths) for key, paths in sorted(bucket.items())}
+
+                for bucket in self.buckets
+
+            ],
+
+        }
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w", encoding="utf-8", newline='\n') as f:
+
+            json.dump(data, f, indent=1)
+
+            f.write('\n')
+
+
+
+def corpus_simhash_index(entries: List[Dict]) -> Tuple[SimhashIndex, bool]:
+
+    """Saved index updated to the current corpus (non-inbox) entries; returns it and whether it changed."""
+
+    index = SimhashIndex.load(SIMHASH_INDEX)
+
+    loaded = index is not None
+
+    if not loaded:
+
+        index = SimhashIndex()
+
+    changed = index.update({
+
+        e["path"]: int(e["simhash"])
+
+        for e in entries
+
+        if "/_inbox/" not in e["path"] and e.get("simhash")
+
+    })
+
+    return index, changed or not loaded
+
+
+
+def detect_near_duplicates(entries: List[Dict], index: Optional[SimhashIndex] = None) -> List[ValidationError]:
 
     """Detect near-duplicate documents between inbox and corpus."""
 
@@ -383,6 +621,19 @@ def detect_near_duplicates(entries: List[Dict]) -> List[ValidationError]:
 
     corpus_entries = [e for e in entries if "/_inbox/" not in e["path"]]
 
+    if not inbox_entries:
+
+        return errors
+
+
+    if index is None:
+
+        index, _ = corpus_simhash_index(entries)
+
+    # Candidates are checked in corpus order, so the reported match is the first one
+
+    position = {e["path"]: i for i, e in enumerate(corpus_entries)}
+
 
     for inbox_entry in inbox_entries:
 
@@ -393,147 +644,260 @@ def detect_near_duplicates(entries: List[Dict]) -> List[ValidationError]:
             continue
 
 
-        for corpus_entry in corpus_entries:
+        # Fast SimHash comparison (Hamming distance), only against documents sharing a band
+
+        for path, hamming in sorted(index.query(int(inbox_hash)), key=lambda match: position[match[0]]):
 
-            corpus_hash = corpus_entry.get("simhash")
+            corpus_entry = corpus_entries[position[path]]
 
-            if not corpus_hash:
 
-                continue
+            # Double-check with title similarity
 
+            inbox_title = inbox_entry.get("title", "")
 
-            # Fast SimHash comparison (Hamming distance)
+            corpus_title = corpus_entry.get("title", "")
 
-            hamming = bin(int(inbox_hash) ^ int(corpus_hash)).count("1")
+            title_score = fuzz.token_set_ratio(inbox_title, corpus_title)
 
 
-            if hamming <= 8:  # Threshold for similarity
+            if title_score >= 80:
 
-                # Double-check with title similarity
+                errors.append(ValidationError(
 
-                inbox_title = inbox_entry.get("title", "")
+                    ROOT,
 
-                corpus_title = corpus_entry.get("title", "")
+                    f"Near-duplicate detected:\n"
 
-                title_score = fuzz.token_set_ratio(inbox_title, corpus_title)
+                    f"  Inbox:  {inbox_entry['path']}\n"
 
+                    f"  Corpus: {corpus_entry['path']}\n"
 
-                if title_score >= 80:
+                    f"  Title similarity: {title_score}%, Content similarity: {100 - hamming * 2}%",
 
-                    errors.append(ValidationError(
+                    severity="warning"
 
-                        ROOT,
+                ))
 
-                        f"Near-duplicate detected:\n"
+                break  # Only report first match per inbox doc
 
-                        f"  Inbox:  {inbox_entry['path']}\n"
 
-                        f"  Corpus: {corpus_entry['path']}\n"
+    return errors
 
-                        f"  Title similarity: {title_score}%, Content similarity: {100 - hamming * 2}%",
 
-                        severity="warning"
 
-                    ))
+def load_cache() -> Dict[str, Dict]:
 
-                    break  # Only report first match per inbox doc
+    """Per-file results of the last run, keyed by path; empty if missing or outdated."""
 
+    try:
 
-    return errors
+        with open(CACHE, encoding="utf-8") as f:
 
+            cache = json.load(f)
 
+    except (OSError, ValueError):
 
-def process_documents() -> Tuple[List[Dict], List[ValidationError]]:
+        return {}
 
-    """Process all markdown documents and collect errors."""
 
-    entries = []
+    # SimHash availability changes the entries
 
-    errors = []
+    if cache.get("version") != CACHE_VERSION or cache.get("simhash") != (Simhash is not None):
 
+        return {}
 
-    # Find all markdown files in docs/
+    return cache.get("files", {})
 
-    for md_path in DOCS.rglob("*.md"):
 
-        if should_exclude(md_path):
 
-            continue
+def save_cache(files: Dict[str, Dict]):
 
+    """Write the per-file results (atomically; a failed write only costs a full run)."""
 
-        try:
+    temp = CACHE.with_suffix(".tmp")
 
-            content = md_path.read_text(encoding="utf-8")
+    try:
 
-        except Exception as e:
+        CACHE.parent.mkdir(parents=True, exist_ok=True)
 
-            errors.append(ValidationError(md_path, f"Failed to read file: {e}"))
+        with open(temp, "w", encoding="utf-8", newline='\n') as f:
 
-            continue
+            json.dump({"version": CACHE_VERSION, "simhash": Simhash is not None, "files": files}, f)
+
+        temp.replace(CACHE)
+
+    except (OSError, TypeError, ValueError) as e:
+
+        print(f"WARNING: Could not write {CACHE.name}: {e}")
 
+        temp.unlink(missing_ok=True)
+
+
+
+def analyze_document(md_path: pathlib.Path, content: str, sha256: str) -> Dict:
+
+    """Validate one document and build its registry entry; returns its cache record."""
+
+    with hook_timing.phase("parse"):
 
         meta, body = extract_frontmatter(content)
 
 
-        # Files without front-matter
+    # Files without front-matter
 
-        if meta is None:
+    if meta is None:
 
-            # Only warn for non-inbox files
+        errors = []
 
-            if "/_inbox/" not in str(md_path):
+        # Only warn for non-inbox files
 
-                errors.append(ValidationError(
+        if "/_inbox/" not in str(md_path):
 
-                    md_path,
+            errors.append(ValidationError(
 
-                    "Missing YAML front-matter. See docs/DOCUMENTATION-SCHEMA.md",
+                md_path,
 
-                    severity="warning"
+                "Missing YAML front-matter. See docs/DOCUMENTATION-SCHEMA.md",
 
-                ))
+                severity="warning"
 
-            continue
+            ))
 
+        return {"sha256": sha256, "entry": None, "errors": [[e.message, e.severity] for e in errors]}
 
-        # Validate front-matter
 
-        errors.extend(validate_frontmatter(md_path, meta))
+    # Validate front-matter
 
+    with hook_timing.phase("validate"):
 
-        # Build registry entry
+        errors = validate_frontmatter(md_path, meta)
 
-        entry = {
 
-            "path": str(md_path.relative_to(ROOT)).replace("\\", "/"),
+    with hook_timing.phase("hash"):
 
-            "doc_id": meta.get("doc_id", ""),
+        simhash = compute_simhash(body)
 
-            "title": meta.get("title", ""),
 
-            "doc_type": meta.get("doc_type", ""),
+    # Build registry entry
 
-            "status": meta.get("status", ""),
+    entry = {
 
-            "canonical": bool(meta.get("canonical", False)),
+        "path": str(md_path.relative_to(ROOT)).replace("\\", "/"),
 
-            "tags": meta.get("tags", []),
+        "doc_id": meta.get("doc_id", ""),
 
-            "created": str(meta.get("created", "")),
+        "title": meta.get("title", ""),
 
-            "summary": meta.get("summary", ""),
+        "doc_type": meta.get("doc_type", ""),
 
-            "supersedes": meta.get("supersedes", []),
+        "status": meta.get("status", ""),
 
-            "related": meta.get("related", []),
+        "canonical": bool(meta.get("canonical", False)),
 
-            "sha256": compute_sha256(content),
+        "tags": meta.get("tags", []),
 
-            "simhash": compute_simhash(body),
+        "created": str(meta.get("created", "")),
 
-        }
+        "summary": meta.get("summary", ""),
+
+        "supersedes": meta.get("supersedes", []),
+
+        "related": meta.get("related", []),
+
+        "sha256": sha256,
+
+        "simhash": simhash,
 
-        entries.append(entry)
+    }
+
+    return {"sha256": sha256, "entry": entry, "errors": [[e.message, e.severity] for e in errors]}
+
+
+
+def process_documents(use_cache: bool = True) -> Tuple[List[Dict], List[ValidationError]]:
+
+    """
+
+    Process all markdown documents and collect errors.
+
+
+    A cached result is reused while the file's size and mtime are unchanged;
+
+    when only the mtime changed (checkout, touch), the content hash decides.
+
+    """
+
+    entries = []
+
+    errors = []
+
+
+    with hook_timing.phase("cache"):
+
+        cache = load_cache() if use_cache else {}
+
+    files = {}
+
+
+    # Find all markdown files in docs/
+
+    with hook_timing.phase("read"):
+
+        md_paths = [md_path for md_path in DOCS.rglob("*.md") if not should_exclude(md_path)]
+
+
+    for md_path in md_paths:
+
+        key = str(md_path.relative_to(ROOT)).replace("\\", "/")
+
+        record = cache.get(key)
+
+        content = None
+
+        try:
+
+            with hook_timing.phase("read"):
+
+                stat = md_path.stat()
+
+                if not record or (record["size"], record["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+
+                    content = md_path.read_text(encoding="utf-8")
+
+        except Exception as e:
+
+            errors.append(ValidationError(md_path, f"Failed to read file: {e}"))
+
+            continue
+
+
+        if content is not None:
+
+            with hook_timing.phase("hash"):
+
+                sha256 = compute_sha256(content)
+
+            if not record or record["sha256"] != sha256:
+
+                record = analyze_document(md_path, content, sha256)
+
+            record = dict(record, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+        files[key] = record
+
+
+        errors.extend(ValidationError(md_path, message, severity) for message, severity in record["errors"])
+
+        if record["entry"] is not None:
+
+            entries.append(record["entry"])
+
+
+    if use_cache and files != cache:
+
+        with hook_timing.phase("cache"):
+
+            save_cache(files)
 
 
     return entries, errors
@@ -592,42 +956,48 @@ def generate_registry(entries: List[Dict]):
 
 
 
-def main():
+def validate_docs(pre_commit: bool = False, use_cache: bool = True) -> int:
 
-    import argparse
+    """Validate all documents (and regenerate the registry unless pre_commit); returns the exit code."""
 
+    print("Validating documentation...")
 
-    parser = argparse.ArgumentParser(description="Validate documentation and generate registry")
-
-    parser.add_argument("--pre-commit", action="store_true",
+    print()
 
-                        help="Pre-commit mode: validate only, don't regenerate registry")
 
-    args = parser.parse_args()
+    # Process all documents
 
+    entries, errors = process_documents(use_cache)
 
-    print("Validating documentation...")
 
-    print()
+    # Additional validations
 
+    with hook_timing.phase("validate"):
 
-    # Process all documents
+        errors.extend(validate_canonical_uniqueness(entries))
 
-    entries, errors = process_documents()
+    index, index_changed = None, False
 
+    with hook_timing.phase("duplicates"):
 
-    # Additional validations
+        if Simhash is not None:
 
-    errors.extend(validate_canonical_uniqueness(entries))
+            index, index_changed = corpus_simhash_index(entries)
 
-    errors.extend(detect_near_duplicates(entries))
+        errors.extend(detect_near_duplicates(entries, index))
 
 
     # Generate registry (skip in pre-commit mode to avoid infinite loop)
 
-    if not args.pre_commit:
+    if not pre_commit:
 
-        generate_registry(entries)
+        with hook_timing.phase("registry"):
+
+            generate_registry(entries)
+
+            if index and index_changed:
+
+                index.save(SIMHASH_INDEX)
 
         print()
 
@@ -638,7 +1008,15 @@ def main():
         print()
 
 
-    # Report errors
+    with hook_timing.phase("report"):
+
+        return report_errors(errors)
+
+
+
+def report_errors(errors: List[ValidationError]) -> int:
+
+    """Print errors grouped by severity; returns 1 if any is an error."""
 
     if errors:
 
@@ -673,19 +1051,57 @@ def main():
 
         if by_severity["error"]:
 
-            sys.exit(1)
+            return 1
 
         else:
 
             print("Warnings found but validation passed.")
 
-            sys.exit(0)
+            return 0
 
     else:
 
         print("All documentation validated successfully!")
 
-        sys.exit(0)
+        return 0
+
+
+
+def main(argv: Optional[List[str]] = None):
+
+    import argparse
+
+
+    parser = argparse.ArgumentParser(description="Validate documentation and generate registry")
+
+    parser.add_argument("--pre-commit", action="store_true",
+
+                        help="Pre-commit mode: validate only, don't regenerate registry")
+
+    parser.add_argument("--no-cache", action="store_true",
+
+                        help="Reprocess every document instead of reusing cached results")
+
+    parser.add_argument("--timing", action="store_true",
+
+                        help="Record phase timings (same as HOOK_TIMING=1)")
+
+    args = parser.parse_args(argv)
+
+
+    hook_timing.start("docs-validate", force=args.timing)
+
+    code = 1
+
+    try:
+
+        code = validate_docs(args.pre_commit, not args.no_cache)
+
+    finally:
+
+        hook_timing.finish(code)
+
+    sys.exit(code)
 
 
 
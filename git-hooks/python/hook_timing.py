@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Opt-in timing and profiling for the Python pre-commit hooks.
+
+Enable with HOOK_TIMING=1 (or the hooks' --timing flag). Each hook run
+appends one JSON line with its wall time per phase (git, read, parse,
+validate, report, ...) to the timing log: HOOK_TIMING_LOG, or
+.git/hook-timings.jsonl of the current repository. With HOOK_TIMING=profile
+the run is also profiled with cProfile, and the stats are written next to
+the log as hook-profile-<hook>.prof (latest run per hook); when another
+profiler is already active (run_hooks on Python 3.12+), nested runs are
+only timed and the outer profile covers them.
+
+Summary of recent runs (p50/p95 per hook and phase):
+
+    python git-hooks/python/hook_timing.py summary [--last 50] [--hook NAME]
+"""
+
+import argparse
+import contextvars
+import cProfile
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+ENV_VAR = "HOOK_TIMING"
+LOG_ENV_VAR = "HOOK_TIMING_LOG"
+LOG_NAME = "hook-timings.jsonl"
+
+_current: contextvars.ContextVar = contextvars.ContextVar("hook_timer", default=None)
+_write_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    """True when timing was requested through the environment."""
+    return os.environ.get(ENV_VAR, "").lower() not in ("", "0", "false", "no", "off")
+
+
+def log_path() -> Path:
+    """Timing log: $HOOK_TIMING_LOG, else inside the repository's git directory, else the temp directory."""
+    if os.environ.get(LOG_ENV_VAR):
+        return Path(os.environ[LOG_ENV_VAR])
+    for directory in [Path.cwd()] + list(Path.cwd().parents):
+        git = directory / ".git"
+        if git.is_dir():
+            return git / LOG_NAME
+        if git.is_file():
+            # Worktrees and submodules: ".git" holds "gitdir: <path>"
+            content = git.read_text(encoding="utf-8").strip()
+            if content.startswith("gitdir:"):
+                return (directory / content[len("gitdir:"):].strip()).resolve() / LOG_NAME
+    return Path(tempfile.gettempdir()) / LOG_NAME
+
+
+class HookTimer:
+    """Wall time of one hook run, split into named phases (repeated phases add up)."""
+
+    def __init__(self, hook: str, profile: bool = False):
+        self.hook = hook
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.profiler = cProfile.Profile() if profile else None
+        if self.profiler:
+            try:
+                self.profiler.enable()
+            except ValueError:
+                # Python 3.12+ allows one active profiler per process; the one already
+                # running (e.g. run_hooks' own timer) covers this run, so only time it
+                self.profiler = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def record(self, exit_code: int, **extra) -> Dict:
+        """Stop timing and append the run to the timing log; returns the record."""
+        duration = time.perf_counter() - self.started
+        if self.profiler:
+            self.profiler.disable()
+
+        record = {
+            "hook": self.hook,
+            "time": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "duration_ms": round(duration * 1000, 2),
+            "phases": {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()},
+            "exit_code": exit_code,
+            **extra,
+        }
+
+        path = log_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with _write_lock, open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+            if self.profiler:
+                self.profiler.dump_stats(str(path.parent / f"hook-profile-{self.hook}.prof"))
+        except OSError as e:
+            print(f"Warning: Could not write hook timing to {path}: {e}", file=sys.stderr)
+        return record
+
+
+def start(hook: str, force: bool = False) -> Optional[HookTimer]:
+    """Start timing a hook run in this thread if enabled (or forced); returns the timer or None."""
+    if not (force or enabled()):
+        _current.set(None)
+        return None
+    timer = HookTimer(hook, profile=os.environ.get(ENV_VAR, "").lower() == "profile")
+    _current.set(timer)
+    return timer
+
+
+def finish(exit_code: int, **extra) -> None:
+    """Record the current hook run, if timed."""
+    timer = _current.get()
+    if timer is not None:
+        timer.record(exit_code, **extra)
+        _current.set(None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a block as part of a phase of the current hook run (no-op when not timing)."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - started)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of values."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def load_records(path: Path) -> List[Dict]:
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # Partially written line
+    return records
+
+
+def summarize(records: List[Dict], last: int) -> Dict[str, Dict]:
+    """p50/p95 of total and per-phase wall time over the last runs of each hook."""
+    by_hook: Dict[str, List[Dict]] = {}
+    for record in records:
+        by_hook.setdefault(record.get("hook", "?"), []).append(record)
+
+    summary = {}
+    for hook, runs in sorted(by_hook.items()):
+        runs = runs[-last:]
+        phases: Dict[str, List[float]] = {}
+        for run in runs:
+            for name, ms in run.get("phases", {}).items():
+                phases.setdefault(name, []).append(ms)
+        durations = [run["duration_ms"] for run in runs]
+        summary[hook] = {
+            "runs": len(runs),
+            "failures": sum(1 for run in runs if run.get("exit_code")),
+            "p50_ms": percentile(durations, 0.50),
+            "p95_ms": percentile(durations, 0.95),
+            "phases": {
+                name: {"p50_ms": percentile(values, 0.50), "p95_ms": percentile(values, 0.95)}
+                for name, values in sorted(phases.items(), key=lambda item: -sum(item[1]))
+            },
+        }
+    return summary
+
+
+def print_summary(summary: Dict[str, Dict], last: int) -> None:
+    print(f"Hook timings (last {last} runs per hook)")
+    print()
+    print(f"{'Hook / phase':<44} {'Runs':>5} {'p50 ms':>10} {'p95 ms':>10}")
+    print("-" * 72)
+    for hook, stats in summary.items():
+        print(f"{hook:<44} {stats['runs']:>5} {stats['p50_ms']:>10.1f} {stats['p95_ms']:>10.1f}")
+        for name, phase_stats in stats["phases"].items():
+            print(f"  {name:<42} {'':>5} {phase_stats['p50_ms']:>10.1f} {phase_stats['p95_ms']:>10.1f}")
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Summarize Python hook timings")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    summary_parser = subparsers.add_parser("summary", help="Show p50/p95 wall time per hook and phase")
+    summary_parser.add_argument("--last", type=int, default=50, help="Runs per hook to include (default: 50)")
+    summary_parser.add_argument("--hook", action="append", help="Only this hook (repeatable)")
+    summary_parser.add_argument("--log", type=Path, help=f"Timing log (default: ${LOG_ENV_VAR} or .git/{LOG_NAME})")
+    summary_parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    path = args.log or log_path()
+    if not path.exists():
+        print(f"No timing log at {path}. Run hooks with {ENV_VAR}=1 to record timings.")
+        return 1
+
+    records = [r for r in load_records(path) if not args.hook or r.get("hook") in args.hook]
+    if not records:
+        print(f"No matching timing records in {path}.")
+        return 1
+
+    summary = summarize(records, max(1, args.last))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary, max(1, args.last))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
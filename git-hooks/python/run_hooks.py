@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Run the Python pre-commit hooks in one process.
+
+Gets the staged file list from git once, shares it with every check, and
+runs the selected checks concurrently in threads. Checks that may start
+worker processes run on the main thread once the threaded batch is done,
+so CPUs are not oversubscribed and no process is forked while other threads
+run. Output is collected per check and printed in a fixed order, so
+interleaving never garbles it.
+
+Checks (selected with --hook, default all):
+- partial-class-interface-separation: check_partial_class_pattern.py (R-CODE-090)
+- check-scattered-docs: check_scattered_docs.py (R-DOC-001)
+- docs-validate: docs_validate.py --pre-commit (R-DOC-002)
+
+A check only runs when a staged file matches its files/exclude patterns, the
+same ones the individual hooks used in .pre-commit-config.yaml. Each check
+keeps its own exit code semantics; the runner exits 1 if any check failed.
+
+With --timing (or HOOK_TIMING=1) the runner and each check record their
+phase timings; see hook_timing.py.
+"""
+
+import argparse
+import contextvars
+import io
+import os
+import re
+import subprocess
+import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+# Importing the hooks also sets up UTF-8 console output on Windows
+import check_partial_class_pattern  # noqa: E402
+import check_scattered_docs  # noqa: E402
+import hook_timing  # noqa: E402
+
+
+# ANSI color codes for better output
+class Colors:
+    RED = "\033[31m"
+    GREEN = "\033[32m"
+    YELLOW = "\033[33m"
+    CYAN = "\033[36m"
+    RESET = "\033[0m"
+
+
+@dataclass
+class StagedFile:
+    path: str
+    blob: str  # staged (index) blob id
+    status: str  # git status letter: A, C, M, R, ...
+
+
+@dataclass
+class Check:
+    hook_id: str
+    name: str
+    files: str  # regex a staged path must match for the check to run
+    exclude: Optional[str]
+    run: Callable[[List[StagedFile]], int]
+    processes: bool = False  # may start a process pool, so it never runs in a worker thread
+
+    def applies_to(self, staged: List[StagedFile]) -> bool:
+        return any(
+            re.search(self.files, f.path) and not (self.exclude and re.search(self.exclude, f.path))
+            for f in staged
+        )
+
+
+# Statuses pre-commit considers staged when matching files
+TRIGGER_STATUSES = "ACMRTUXB"
+
+
+def get_staged_files() -> List[StagedFile]:
+    """All staged files with their blob ids, from one `git diff --cached` call."""
+    result = subprocess.run(
+        ["git", "diff", "--cached", "--raw", "-z", "--no-abbrev", f"--diff-filter={TRIGGER_STATUSES}"],
+        capture_output=True,
+        check=True,
+    )
+
+    # ":<old mode> <new mode> <old blob> <new blob> <status>" then the path (old and new for renames)
+    fields = os.fsdecode(result.stdout).split("\0")
+    files = []
+    i = 0
+    while i + 1 < len(fields):
+        meta = fields[i].split()
+        paths = 2 if meta[-1][0] in "RC" else 1
+        files.append(StagedFile(fields[i + paths], meta[3], meta[-1][0]))
+        i += 1 + paths
+    return files
+
+
+def run_partial_class_pattern(staged: List[StagedFile]) -> int:
+    files = [(f.path, f.blob) for f in staged if f.status in "ACMR" and f.path.endswith(".cs")]
+    return 0 if check_partial_class_pattern.check_staged_files(files) else 1
+
+
+def run_scattered_docs(staged: List[StagedFile]) -> int:
+    files = [f.path for f in staged if f.status in "ACM" and f.path.endswith(".md")]
+    return check_scattered_docs.check_scattered_docs(files)
+
+
+def run_docs_validate(staged: List[StagedFile]) -> int:
+    # Imported on demand: PyYAML, simhash and rapidfuzz are only loaded when docs changed
+    try:
+        import docs_validate
+    except SystemExit as e:  # PyYAML missing
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    return docs_validate.validate_docs(pre_commit=True)
+
+
+CHECKS = [
+    Check(
+        "partial-class-interface-separation",
+        "Partial Class Interface Separation (R-CODE-090)",
+        r"\.cs$",
+        r"projects/client/|\.g\.cs$|\.designer\.cs$",
+        run_partial_class_pattern,
+        processes=True,
+    ),
+    Check(
+        "check-scattered-docs",
+        "Scattered Documentation Detection (R-DOC-001)",
+        r"\.md$",
+        None,
+        run_scattered_docs,
+    ),
+    Check(
+        "docs-validate",
+        "Documentation Front-Matter Validation (R-DOC-002)",
+        r"^docs/.*\.md$",
+        r"docs/index/registry\.json$",
+        run_docs_validate,
+    ),
+]
+
+
+class OutputRouter(io.TextIOBase):
+    """Stream that sends writes from a thread running a check to that check's buffer."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self) -> None:
+        if getattr(self.local, "buffer", None) is None:
+            self.stream.flush()
+
+
+def run_check(check: Check, staged: List[StagedFile], router: OutputRouter, timing: bool = False) -> Dict:
+    """Run one check with its output captured; returns its exit code and output."""
+    buffer = io.StringIO()
+    router.local.buffer = buffer
+    try:
+        hook_timing.start(check.hook_id, force=timing)
+        code = check.run(staged)
+    except Exception as e:
+        print(f"{Colors.RED}❌ Pre-commit hook error: {e}{Colors.RESET}")
+        print(f"{Colors.RED}Stack trace:\n{traceback.format_exc()}{Colors.RESET}")
+        code = 1
+    finally:
+        router.local.buffer = None
+    hook_timing.finish(code, runner=True)
+    return {"code": code, "output": buffer.getvalue()}
+
+
+def run_checks(checks: List[Check], staged: List[StagedFile], timing: bool = False) -> int:
+    """Run checks concurrently and report them in order; returns 1 if any failed."""
+    selected = [check for check in checks if check.applies_to(staged)]
+    width = max(len(check.name) for check in checks) + 4
+
+    results: Dict[str, Dict] = {}
+    if selected:
+        stdout, stderr = sys.stdout, sys.stderr
+        router = OutputRouter(stdout)
+        sys.stdout = sys.stderr = router
+        try:
+            threaded = [check for check in selected if not check.processes]
+            if threaded:
+                with ThreadPoolExecutor(max_workers=len(threaded)) as pool:
+                    futures = {
+                        check.hook_id: pool.submit(run_check, check, staged, router, timing) for check in threaded
+                    }
+                    results = {hook_id: future.result() for hook_id, future in futures.items()}
+
+            # The worker threads have exited; a copied context keeps the runner's own timer intact
+            for check in selected:
+                if check.processes:
+                    results[check.hook_id] = contextvars.copy_context().run(
+                        run_check, check, staged, router, timing
+                    )
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+
+    failed = False
+    for check in checks:
+        result = results.get(check.hook_id)
+        label = check.name.ljust(width, ".")
+        if result is None:
+            print(f"{label}{Colors.CYAN}Skipped{Colors.RESET}")
+            continue
+        if result["code"]:
+            failed = True
+            print(f"{label}{Colors.RED}Failed{Colors.RESET} (exit code {result['code']})")
+        else:
+            print(f"{label}{Colors.GREEN}Passed{Colors.RESET}")
+        if result["output"].strip():
+            print(result["output"].rstrip())
+            print()
+
+    return 1 if failed else 0
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Run the Python pre-commit hooks in one process")
+    parser.add_argument(
+        "--hook",
+        action="append",
+        choices=[check.hook_id for check in CHECKS],
+        help="Run only this check (repeatable; default: all)",
+    )
+    parser.add_argument("--timing", action="store_true", help="Record phase timings (same as HOOK_TIMING=1)")
+    args = parser.parse_args()
+    timing = args.timing or hook_timing.enabled()
+
+    hook_timing.start("run-hooks", force=timing)
+    try:
+        with hook_timing.phase("git"):
+            staged = get_staged_files()
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"{Colors.RED}Error getting staged files: {e}{Colors.RESET}")
+        hook_timing.finish(1)
+        return 1
+
+    checks = [check for check in CHECKS if not args.hook or check.hook_id in args.hook]
+    with hook_timing.phase("checks"):
+        code = run_checks(checks, staged, timing)
+    hook_timing.finish(code, files=len(staged))
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Tests for the R-CODE-090 per-file and cross-file partial class checks."""
+
+from check_partial_class_pattern import expected_file_name, find_violations, validate_parts
+from csharp_symbols import parse_symbols
+
+
+def parts(files):
+    """(path, class symbol) pairs for {path: source}."""
+    return [
+        (path, symbol)
+        for path, source in files.items()
+        for symbol in parse_symbols(source)
+        if symbol.kind == "class"
+    ]
+
+
+def messages(violations):
+    return sorted((v["file"], v["message"]) for v in violations)
+
+
+def test_expected_file_name():
+    assert expected_file_name("Foo", "IBar<T>") == "Foo.Bar.cs"
+    assert expected_file_name("Foo", "Some.Namespace.IBar") == "Foo.Bar.cs"
+    assert expected_file_name("Foo", "Item") == "Foo.Item.cs"
+    assert expected_file_name("Foo", "IFoo") is None
+
+
+def test_single_interface_repeated_in_platform_part_passes():
+    # Shape of PostprocessBuildWithReport.cs / PostprocessBuildWithReport.iOS.cs
+    report = "internal partial class PostprocessBuildWithReport : IPostprocessBuildWithReport { }\n"
+    files = {
+        "Report/PostprocessBuildWithReport.cs": report,
+        "Report/PostprocessBuildWithReport.iOS.cs": "#if UNITY_IOS\n" + report + "#endif\n",
+    }
+    assert validate_parts("PostprocessBuildWithReport", parts(files)) == []
+
+
+def test_interfaces_split_into_own_parts_pass():
+    files = {
+        "Foo.cs": "partial class Foo : Base { }",
+        "Foo.Bar.cs": "partial class Foo : IBar { }",
+        "Foo.Baz.cs": "partial class Foo : IBaz<int> { }",
+    }
+    assert validate_parts("Foo", parts(files)) == []
+
+
+def test_interface_declared_by_two_parts_is_reported():
+    files = {
+        "Foo.cs": "partial class Foo : Base { }",
+        "Foo.Bar.cs": "partial class Foo : IBar { }",
+        "Foo.Baz.cs": "partial class Foo : IBaz, IBar { }",
+    }
+    assert messages(validate_parts("Foo", parts(files))) == [
+        ("Foo.Bar.cs", "Interface 'IBar' of class 'Foo' is declared in multiple parts: Foo.Bar.cs, Foo.Baz.cs."),
+        ("Foo.Baz.cs", "Interface 'IBar' of class 'Foo' should be declared in Foo.Bar.cs."),
+    ]
+
+
+def test_misnamed_part_and_missing_base_file_are_reported():
+    files = {
+        "Foo.Other.cs": "partial class Foo : IBar { }",
+        "Foo.Baz.cs": "partial class Foo : IBaz { }",
+    }
+    violations = validate_parts("Foo", parts(files))
+    assert messages(violations) == [
+        ("Foo.Other.cs", "Interface 'IBar' of class 'Foo' should be declared in Foo.Bar.cs."),
+        ("Foo.Other.cs", "Partial class 'Foo' has no base file Foo.cs."),
+    ]
+
+
+def test_base_file_with_multiple_interfaces_is_reported():
+    symbols = parse_symbols("namespace N { class Foo : Base, IBar, IFoo where T : class { } }")
+    [violation] = find_violations("Foo.cs", symbols)
+    assert violation["interfaces"] == ["IBar", "IFoo"]
+    assert violation["expected_files"] == ["Foo.Bar.cs"]
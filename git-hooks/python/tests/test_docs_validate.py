@@ -0,0 +1,37 @@
+"""Tests for the banded SimHash index used for near-duplicate lookups."""
+
+import random
+
+from docs_validate import SimhashIndex
+
+
+def test_query_matches_brute_force_within_radius():
+    rng = random.Random(7)
+    index = SimhashIndex()
+    base = rng.getrandbits(64)
+    hashes = {}
+    for i in range(300):
+        value = base
+        for bit in rng.sample(range(64), rng.randint(0, 20)):
+            value ^= 1 << bit
+        hashes[f"doc{i}.md"] = value
+    index.update(hashes)
+
+    matches = index.query(base)
+    expected = {
+        path: bin(base ^ value).count("1")
+        for path, value in hashes.items()
+        if bin(base ^ value).count("1") <= index.max_distance
+    }
+    # Each document is reported once, even when it shares several bands with the query
+    assert len(matches) == len({path for path, _ in matches})
+    assert dict(matches) == expected
+
+
+def test_update_removes_changed_documents_from_buckets():
+    index = SimhashIndex()
+    index.update({"a.md": 0, "b.md": 0})
+    assert index.update({"a.md": (1 << 64) - 1}) is True
+    assert index.query(0) == []
+    assert index.query((1 << 64) - 1) == [("a.md", 0)]
+    assert index.update({"a.md": (1 << 64) - 1}) is False
@@ -0,0 +1,21 @@
+"""Tests for hook timing when profiling is requested."""
+
+import cProfile
+
+import hook_timing
+
+
+def test_profile_falls_back_to_timing_when_a_profiler_is_active(monkeypatch, tmp_path):
+    def already_active(self):
+        raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setenv(hook_timing.ENV_VAR, "profile")
+    monkeypatch.setenv(hook_timing.LOG_ENV_VAR, str(tmp_path / "timings.jsonl"))
+    monkeypatch.setattr(cProfile.Profile, "enable", already_active)
+
+    timer = hook_timing.start("check")
+    assert timer is not None and timer.profiler is None
+    hook_timing.finish(0)
+
+    assert (tmp_path / "timings.jsonl").exists()
+    assert not (tmp_path / "hook-profile-check.prof").exists()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Benchmark the C# scanners on synthetic source trees.
+
+Generates reproducible C# trees (file count, file size, directory depth,
+namespace style and multi-type ratio are configurable) and measures
+find_multiple_types (CSharpTypeScanner) and the R-CODE-090 hook
+(check_partial_class_pattern) without the symbol index, with a cold index and
+with a warm one. Every measurement runs in a fresh process so peak memory is
+per run. Results are written as JSON; --compare flags regressions against a
+previous result file.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import List, Dict, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+HOOKS_DIR = SCRIPTS_DIR.parent / 'git-hooks' / 'python'
+
+WORKLOADS = ['multiple-types', 'partial-class']
+MODES = ['no-index', 'cold', 'warm']
+NAMESPACE_STYLES = ['block', 'file-scoped', 'none', 'mixed']
+
+
+@dataclass
+class TreeConfig:
+    """Shape of a synthetic C# tree."""
+    files: int = 1000
+    members: int = 8               # members per type; drives file size
+    depth: int = 3                 # directory nesting depth
+    fan_out: int = 8               # subdirectories per directory
+    namespace_style: str = 'mixed'
+    multi_type_ratio: float = 0.1  # share of files declaring 2-4 top-level types
+    seed: int = 42
+
+
+class TreeGenerator:
+    """Writes a deterministic synthetic C# tree for a TreeConfig."""
+
+    BASES = ['MonoBehaviour', 'ScriptableObject', 'EventArgs', 'Exception']
+    INTERFACES = ['IDisposable', 'IComparable<{name}>', 'IEquatable<{name}>', 'IEnumerable<KeyValuePair<string, int>>',
+                  'IInitializable', 'ITickable', 'IReadOnlyList<{name}>']
+
+    def __init__(self, config: TreeConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+
+    def generate(self, root: Path) -> int:
+        """Create the tree under root; returns the number of bytes written."""
+        directories = self._directories(root)
+        written = 0
+        for index in range(self.config.files):
+            directory = directories[index % len(directories)]
+            directory.mkdir(parents=True, exist_ok=True)
+            name = f'Type{index:06d}'
+            content = self._file(name, index)
+            (directory / f'{name}.cs').write_text(content, encoding='utf-8')
+            written += len(content)
+        return written
+
+    def _directories(self, root: Path) -> List[Path]:
+        level = [root]
+        for depth in range(self.config.depth):
+            level = [parent / f'Module{depth}_{child}' for parent in level for child in range(self.config.fan_out)]
+            # Keep at least a few files per directory
+            if len(level) * 4 > self.config.files:
+                break
+        return level
+
+    def _file(self, name: str, index: int) -> str:
+        style = self.config.namespace_style
+        if style == 'mixed':
+            style = NAMESPACE_STYLES[index % 3]
+
+        count = 1
+        if self.random.random() < self.config.multi_type_ratio:
+            count = self.random.randint(2, 4)
+        types = [self._type(name if i == 0 else f'{name}Part{i}') for i in range(count)]
+
+        header = 'using System;\nusing System.Collections.Generic;\n\n'
+        namespace = f'Sango.Generated.Module{index % 17}'
+        if style == 'block':
+            body = '\n\n'.join(_indent(t) for t in types)
+            return f'{header}namespace {namespace}\n{{\n{body}\n}}\n'
+        if style == 'file-scoped':
+            return f'{header}namespace {namespace};\n\n' + '\n\n'.join(types) + '\n'
+        return header + '\n\n'.join(types) + '\n'
+
+    def _type(self, name: str) -> str:
+        rnd = self.random
+        kind = rnd.choices(['class', 'struct', 'interface', 'enum', 'record'], [70, 8, 10, 7, 5])[0]
+        if kind == 'enum':
+            values = ',\n'.join(f'    Value{i} = {i}' for i in range(self.config.members))
+            return f'/// <summary>{name} values.</summary>\npublic enum {name}\n{{\n{values}\n}}'
+
+        bases = []
+        if kind == 'class' and rnd.random() < 0.3:
+            bases.append(rnd.choice(self.BASES))
+        if kind != 'interface':
+            bases += [i.format(name=name) for i in rnd.sample(self.INTERFACES, rnd.randint(0, 3))]
+        generic = '<T>' if rnd.random() < 0.15 else ''
+        constraint = ' where T : class, new()' if generic else ''
+        base_list = f' : {", ".join(bases)}' if bases else ''
+        partial = 'partial ' if kind in ('class', 'struct') and rnd.random() < 0.3 else ''
+
+        members = []
+        for i in range(self.config.members):
+            if kind == 'interface':
+                members.append(f'    void Operation{i}(int value);')
+            elif i % 3 == 0:
+                members.append(f'    private readonly Dictionary<string, int> _field{i} = new() {{ ["k{{"] = {i} }};')
+            elif i % 3 == 1:
+                members.append(f'    public string Property{i} {{ get; set; }} = $"{{nameof({name})}}-{i}";')
+            else:
+                members.append(
+                    f'    public int Method{i}(int value)\n    {{\n'
+                    f'        // closing brace in comment }}\n'
+                    f'        if (value > {i}) {{ return value * {i}; }}\n'
+                    f'        var text = @"verbatim {{ brace";\n'
+                    f'        return text.Length;\n    }}'
+                )
+        body = '\n\n'.join(members)
+        return (f'/// <summary>Generated {kind} {name}.</summary>\n[Serializable]\n'
+                f'public {partial}{kind} {name}{generic}{base_list}{constraint}\n{{\n{body}\n}}')
+
+
+def _indent(text: str) -> str:
+    return '\n'.join(f'    {line}' if line else line for line in text.splitlines())
+
+
+def run_workload(workload: str, tree: Path, db: Optional[Path], jobs: int) -> Dict:
+    """Run one measurement in this process; returns timing and peak memory."""
+    import resource
+
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    sys.path.insert(0, str(HOOKS_DIR))
+    from csharp_symbols import SymbolIndex
+    from find_multiple_types import CSharpTypeScanner
+
+    started = time.perf_counter()
+    index = SymbolIndex(db, tree) if db else None
+    scanner = CSharpTypeScanner(tree)
+    if workload == 'multiple-types':
+        analyses = scanner.analyze_files(scanner.iter_csharp_files(), jobs, index)
+        files = len(analyses)
+        violations = sum(1 for analysis in analyses if analysis.type_count > 1)
+    else:
+        from check_partial_class_pattern import check_partial_class_pattern
+        paths = list(scanner.iter_csharp_files())
+        files = len(paths)
+        violations = sum(1 for path in paths if check_partial_class_pattern(str(path), index))
+    if index:
+        index.close()
+    seconds = time.perf_counter() - started
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        peak *= 1024  # Linux reports kilobytes
+    return {
+        'seconds': round(seconds, 4),
+        'files': files,
+        'files_per_sec': round(files / seconds, 1) if seconds else None,
+        'violations': violations,
+        'peak_rss_bytes': peak,
+    }
+
+
+def measure(workload: str, mode: str, tree: Path, db: Path, jobs: int) -> Dict:
+    """Run a workload in a fresh interpreter."""
+    command = [sys.executable, __file__, '--run-one', workload, '--tree', str(tree), '--jobs', str(jobs)]
+    if mode != 'no-index':
+        command += ['--db', str(db)]
+    started = time.perf_counter()
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process_seconds'] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def remove_index(db: Path) -> None:
+    for suffix in ('', '-wal', '-shm'):
+        Path(f'{db}{suffix}').unlink(missing_ok=True)
+
+
+def tree_name(config: TreeConfig) -> str:
+    """Directory name identifying a generated tree, e.g. '1000-8-3-8-mixed-0.1-42'."""
+    return '-'.join(str(value) for value in asdict(config).values())
+
+
+def run_benchmarks(config: TreeConfig, workloads: List[str], jobs: int, repeat: int, keep: Optional[Path]) -> Dict:
+    """Generate a tree for config and measure every workload in every mode."""
+    work_dir = Path(tempfile.mkdtemp(prefix='csharp-bench-'))
+    # Kept trees live in one subdirectory per config, so each run measures its own shape
+    tree = keep / tree_name(config) if keep else work_dir / 'tree'
+    db = work_dir / 'index.sqlite'
+    try:
+        started = time.perf_counter()
+        if not keep or not tree.exists():
+            written = TreeGenerator(config).generate(tree)
+        else:
+            written = sum(path.stat().st_size for path in tree.rglob('*.cs'))
+        print(f"  tree: {config.files} files, {written / 1e6:.1f} MB "
+              f"({time.perf_counter() - started:.1f}s to generate)", file=sys.stderr)
+
+        results = {}
+        for workload in workloads:
+            runs = {}
+            for mode in MODES:
+                samples = []
+                for _ in range(repeat):
+                    if mode == 'cold':
+                        remove_index(db)
+                    samples.append(measure(workload, mode, tree, db, jobs))
+                # Median run by wall time
+                runs[mode] = sorted(samples, key=lambda r: r['seconds'])[len(samples) // 2]
+                print(f"  {workload:15} {mode:9} {runs[mode]['seconds']:8.3f}s "
+                      f"{runs[mode]['files_per_sec'] or 0:10.0f} files/s "
+                      f"{runs[mode]['peak_rss_bytes'] / 1e6:7.1f} MB", file=sys.stderr)
+            remove_index(db)
+            results[workload] = runs
+        return {'tree': asdict(config), 'bytes': written, 'results': results}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Regressions of files/sec beyond threshold (fraction) versus a baseline result file."""
+    previous = {(run['tree']['files'], workload, mode): result
+                for run in baseline.get('runs', [])
+                for workload, modes in run['results'].items()
+                for mode, result in modes.items()}
+    regressions = []
+    for run in current['runs']:
+        for workload, modes in run['results'].items():
+            for mode, result in modes.items():
+                before = previous.get((run['tree']['files'], workload, mode))
+                if not before or not before.get('files_per_sec') or not result.get('files_per_sec'):
+                    continue
+                change = result['files_per_sec'] / before['files_per_sec'] - 1
+                if change < -threshold:
+                    regressions.append(
+                        f"{workload} {mode} @ {run['tree']['files']} files: "
+                        f"{before['files_per_sec']:.0f} -> {result['files_per_sec']:.0f} files/s ({change:+.0%})"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the C# scanners on synthetic source trees"
+    )
+    parser.add_argument(
+        '--files',
+        default='1000',
+        help='Comma-separated file counts, one tree each (default: 1000; e.g. 1000,10000,100000)'
+    )
+    parser.add_argument('--members', type=int, default=8, help='Members per type, drives file size (default: 8)')
+    parser.add_argument('--depth', type=int, default=3, help='Directory nesting depth (default: 3)')
+    parser.add_argument(
+        '--namespace-style',
+        choices=NAMESPACE_STYLES,
+        default='mixed',
+        help='Namespace declarations to generate (default: mixed)'
+    )
+    parser.add_argument(
+        '--multi-type-ratio',
+        type=float,
+        default=0.1,
+        help='Share of files declaring several top-level types (default: 0.1)'
+    )
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    parser.add_argument(
+        '--workload',
+        choices=WORKLOADS,
+        action='append',
+        help='Workload to run (repeatable; default: all)'
+    )
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Worker processes for find_multiple_types (default: 1)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the median is kept (default: 3)')
+    parser.add_argument('--output', type=Path, help='Write JSON results to file (default: stdout)')
+    parser.add_argument('--compare', type=Path, help='Baseline JSON from a previous run')
+    parser.add_argument(
+        '--max-regression',
+        type=float,
+        default=0.15,
+        help='With --compare, exit 1 if files/sec drops by more than this fraction (default: 0.15)'
+    )
+    parser.add_argument(
+        '--keep-tree',
+        type=Path,
+        help='Generate trees under this directory (one subdirectory per config) and reuse them on later runs'
+    )
+    # Internal: one measurement in a child process
+    parser.add_argument('--run-one', choices=WORKLOADS, help=argparse.SUPPRESS)
+    parser.add_argument('--tree', type=Path, help=argparse.SUPPRESS)
+    parser.add_argument('--db', type=Path, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_workload(args.run_one, args.tree, args.db, args.jobs)))
+        return 0
+
+    runs = []
+    for files in [int(count) for count in args.files.split(',')]:
+        config = TreeConfig(
+            files=files,
+            members=args.members,
+            depth=args.depth,
+            namespace_style=args.namespace_style,
+            multi_type_ratio=args.multi_type_ratio,
+            seed=args.seed
+        )
+        print(f"Benchmarking {files} files...", file=sys.stderr)
+        runs.append(run_benchmarks(config, args.workload or WORKLOADS, args.jobs, max(1, args.repeat), args.keep_tree))
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'jobs': args.jobs,
+            'repeat': args.repeat,
+        },
+        'runs': runs,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + '\n', encoding='utf-8')
+        print(f"[OK] Results saved to: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text(encoding='utf-8')), args.max_regression)
+        for regression in regressions:
+            print(f"[REGRESSION] {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"[OK] No regressions beyond {args.max_regression:.0%} versus {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,767 @@
+#!/usr/bin/env python3
+"""
+Shared C# symbol scanner and on-disk symbol index.
+
+Used by the code-quality tools (scripts/find_multiple_types.py and the
+R-CODE-090 pre-commit hook) so C# is parsed one way, once per file change.
+Git contents (staged or committed blobs) are read through GitBlobReader.
+The index records every type declaration, nested ones included, with its
+namespace, containing types, modifiers (including partial), base list,
+constraints and file spans.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator
+
+
+# Bump when scan results change for unchanged input, to invalidate indexes
+SCANNER_VERSION = 6
+
+
+@dataclass
+class TypeSymbol:
+    """A type declaration in a C# file.
+
+    Lines are 0-based. The declaration text, including the attribute and
+    comment lines above it, spans lines text_start_line..end_line and bytes
+    start_byte..end_byte (end exclusive) of the UTF-8 file.
+    """
+    kind: str  # class, interface, struct, enum, delegate, record
+    name: str
+    arity: int  # number of generic type parameters
+    namespace: str
+    modifiers: str  # canonical order, 'internal' when none given
+    bases: List[str] = field(default_factory=list)
+    constraints: List[str] = field(default_factory=list)
+    start_line: int = 0
+    end_line: int = 0
+    text_start_line: int = 0
+    start_byte: int = 0
+    end_byte: int = 0
+    container: str = ''  # dotted names of the enclosing types, '' for top-level types
+
+    @property
+    def partial(self) -> bool:
+        return 'partial' in self.modifiers.split()
+
+    @property
+    def nested(self) -> bool:
+        return bool(self.container)
+
+    @property
+    def full_name(self) -> str:
+        return '.'.join(part for part in (self.namespace, self.container, self.name) if part)
+
+
+class CSharpLexer:
+    """Single-pass C# scanner that reports type declarations, including nested ones.
+
+    Tracks brace depth while skipping comments, preprocessor lines, and all
+    string/char literal forms (regular, verbatim, interpolated, raw), so braces
+    inside them never affect nesting. Types declared directly inside block or
+    file-scoped namespaces count as top level; types declared in a type body
+    are nested. Member bodies are skipped, and a type keyword only starts a
+    declaration when nothing but attributes and modifiers precede it, so
+    'where T : class' in a method header is never mistaken for a type.
+    """
+
+    TYPE_KINDS = {'class', 'interface', 'struct', 'enum', 'delegate', 'record'}
+    MODIFIERS = ['public', 'internal', 'protected', 'private', 'static', 'sealed', 'abstract', 'partial']
+    DECLARATION_KEYWORDS = set(MODIFIERS) | {'readonly', 'unsafe', 'new', 'file', 'ref'}
+
+    TOKEN = re.compile(
+        r'(?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))'
+        r'|(?P<raw_interpolated>\$+"""+)'
+        r'|(?P<interpolated>\$+@?"|@\$+")'
+        r'|(?P<raw>"""+)'
+        r'|(?P<verbatim>@"(?:[^"]|"")*(?:"|\Z))'
+        r'|(?P<string>"(?:[^"\\\n]|\\.)*"?)'
+        r"|(?P<char>'(?:[^'\\\n]|\\.)*'?)"
+        r'|(?P<directive>^[ \t]*\#[^\n]*)'
+        r'|(?P<ident>@?[A-Za-z_]\w*)'
+        r'|(?P<punct>[{};()<>\[\]])',
+        re.MULTILINE
+    )
+
+    # Tokens of a declaration header (text between the type name and its body)
+    HEADER_TOKEN = re.compile(r'//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)|[<>()\[\],:]|\bwhere\b')
+    COMMENT = re.compile(r'//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)')
+
+    def __init__(self, text: str):
+        self.text = text
+        self._line_pos = 0
+        self._line_no = 0
+
+    def line_of(self, pos: int) -> int:
+        """0-based line number of an offset; offsets must be queried in increasing order"""
+        self._line_no += self.text.count('\n', self._line_pos, pos)
+        self._line_pos = pos
+        return self._line_no
+
+    def symbols(self) -> List[TypeSymbol]:
+        """Scan once; returns every type declaration with its spans, in source order"""
+        text = self.text
+        results: List[TypeSymbol] = []
+        offsets: List[List[int]] = []   # [start, end] character offsets per result
+        # Brace stack entries: namespace name (str), None for other blocks, or the index of the type in results
+        stack: List = []
+        file_namespace = ''
+        blocks = 0            # number of None entries (member bodies and other blocks) on the stack
+        brackets = 0          # attribute [...] depth
+        modifiers: List[str] = []
+        decl_start: Optional[int] = None
+        member = False        # current declaration is not a type (field, method, property, ...)
+        pending: Optional[Dict] = None   # type header seen but body not yet opened
+        namespace_start: Optional[int] = None
+
+        def reset():
+            nonlocal modifiers, decl_start, member, pending, namespace_start
+            modifiers, decl_start, member, pending, namespace_start = [], None, False, None, None
+
+        def declare(end_pos: int, end: Optional[int]) -> None:
+            arity, bases, constraints = self._parse_header(text[pending['name_end']:end_pos])
+            namespaces = [file_namespace] + [entry for entry in stack if isinstance(entry, str)]
+            results.append(TypeSymbol(
+                kind=pending['kind'],
+                name=pending['name'].lstrip('@'),
+                arity=arity,
+                namespace='.'.join(part for part in namespaces if part),
+                modifiers=' '.join(m for m in self.MODIFIERS if m in pending['modifiers']) or 'internal',
+                bases=bases,
+                constraints=constraints,
+                start_line=self.line_of(pending['start']),
+                end_line=self.line_of(end_pos) if end is not None else -1,
+                container='.'.join(results[entry].name for entry in stack if isinstance(entry, int))
+            ))
+            offsets.append([pending['start'], end])
+
+        pos = 0
+        while True:
+            match = self.TOKEN.search(text, pos)
+            if not match:
+                break
+            kind = match.lastgroup
+            pos = match.end()
+
+            if kind == 'raw_interpolated':
+                pos = self._skip_raw_interpolated(pos, match.group())
+                continue
+            if kind == 'interpolated':
+                pos = self._skip_interpolated(pos, '@' in match.group(), match.group().count('$'))
+                continue
+            if kind == 'raw':
+                closing = text.find(match.group(), pos)
+                pos = len(text) if closing == -1 else closing + len(match.group())
+                continue
+            if kind in ('comment', 'verbatim', 'string', 'char', 'directive'):
+                continue
+
+            token = match.group()
+            if kind == 'ident':
+                if blocks or brackets or member or namespace_start is not None:
+                    continue
+                if pending is not None:
+                    if pending['name'] is None:
+                        if pending['kind'] == 'delegate':
+                            if pending['angle'] == 0:
+                                pending['candidate'] = (token, match.end())
+                        elif not (pending['kind'] == 'record' and token in ('class', 'struct')):
+                            pending['name'], pending['name_end'] = token, match.end()
+                    continue
+                if decl_start is None:
+                    decl_start = match.start()
+                if token in self.DECLARATION_KEYWORDS:
+                    if token in self.MODIFIERS and token not in modifiers:
+                        modifiers.append(token)
+                elif token == 'namespace':
+                    namespace_start = match.end()
+                elif token in self.TYPE_KINDS:
+                    pending = {'kind': token, 'name': None, 'name_end': None, 'start': decl_start,
+                               'modifiers': modifiers, 'angle': 0, 'candidate': None}
+                else:
+                    member = True
+                continue
+
+            # Punctuation
+            if token == '{':
+                if blocks or pending is None or not pending['name']:
+                    if namespace_start is not None and not blocks:
+                        stack.append(self._clean_name(text[namespace_start:match.start()]))
+                    else:
+                        stack.append(None)
+                        blocks += 1
+                else:
+                    declare(match.start(), None)
+                    stack.append(len(results) - 1)
+                reset()
+            elif token == '}':
+                if stack:
+                    entry = stack.pop()
+                    if entry is None:
+                        blocks -= 1
+                    elif isinstance(entry, int):
+                        results[entry].end_line = self.line_of(match.start())
+                        offsets[entry][1] = match.end()
+                reset()
+            elif blocks:
+                continue
+            elif token == ';':
+                if namespace_start is not None:
+                    # File-scoped namespace
+                    file_namespace = self._clean_name(text[namespace_start:match.start()])
+                # Delegates and positional records end without a body
+                elif pending is not None and pending['name'] and brackets == 0:
+                    declare(match.start(), match.end())
+                if brackets == 0:
+                    reset()
+            elif token == '[':
+                brackets += 1
+            elif token == ']':
+                brackets = max(0, brackets - 1)
+                if brackets == 0 and pending is None:
+                    modifiers, decl_start = [], None
+            elif pending is not None and pending['kind'] == 'delegate' and pending['name'] is None:
+                if token == '<':
+                    pending['angle'] += 1
+                elif token == '>':
+                    pending['angle'] -= 1
+                elif token == '(' and pending['angle'] == 0 and pending['candidate']:
+                    pending['name'], pending['name_end'] = pending['candidate']
+
+        # Types left open at end of file extend to the last line
+        last_line = text.count('\n') - (1 if text.endswith('\n') else 0)
+        spans = []
+        for symbol, (start, end) in zip(results, offsets):
+            if end is None:
+                symbol.end_line = max(last_line, symbol.start_line)
+                end = len(text)
+            symbol.text_start_line, text_start, text_end = type_text_span(text, symbol.start_line, start, end)
+            spans.append((text_start, text_end))
+        # Nested spans lie inside their parents', so convert offsets in sorted order
+        byte_offset = _utf8_offsets(text)
+        byte_offsets = {pos: byte_offset(pos) for pos in sorted({pos for span in spans for pos in span})}
+        for symbol, (text_start, text_end) in zip(results, spans):
+            symbol.start_byte = byte_offsets[text_start]
+            symbol.end_byte = byte_offsets[text_end]
+        return results
+
+    def _clean_name(self, text: str) -> str:
+        """Dotted name with comments and whitespace removed"""
+        return ''.join(self.COMMENT.sub(' ', text).split())
+
+    @classmethod
+    def _parse_header(cls, header: str) -> Tuple[int, List[str], List[str]]:
+        """Split the text after a type name into (arity, bases, constraints).
+
+        Handles type parameters, a primary constructor, the base list and where
+        clauses in one linear pass; commas only split at nesting depth 0, so
+        generic arguments such as Dictionary<K, V> stay whole.
+        """
+        openers: List[str] = []
+        arity = 0
+        section = 'name'      # name -> bases -> constraints
+        piece_start = 0
+        bases: List[str] = []
+        constraints: List[str] = []
+        clause_start: Optional[int] = None
+
+        def add_base(end: int) -> None:
+            item = header[piece_start:end]
+            # Record/primary-constructor base arguments: Base(x) -> Base
+            paren = cls._top_level_paren(item)
+            item = ' '.join(cls.COMMENT.sub(' ', item[:paren] if paren != -1 else item).split())
+            if item:
+                bases.append(item)
+
+        for match in cls.HEADER_TOKEN.finditer(header):
+            token = match.group()
+            if token.startswith('/'):
+                continue
+            if token in '<([':
+                if section == 'name' and token == '<' and not openers:
+                    arity = 1
+                openers.append(token)
+            elif token in '>)]':
+                if openers:
+                    openers.pop()
+            elif openers:
+                # Commas directly inside the type parameter list
+                if token == ',' and section == 'name' and openers == ['<']:
+                    arity += 1
+            elif token == ':' and section == 'name':
+                section = 'bases'
+                piece_start = match.end()
+            elif token == ',' and section == 'bases':
+                add_base(match.start())
+                piece_start = match.end()
+            elif token == 'where':
+                if section == 'bases':
+                    add_base(match.start())
+                elif clause_start is not None:
+                    constraints.append(' '.join(cls.COMMENT.sub(' ', header[clause_start:match.start()]).split()))
+                section = 'constraints'
+                clause_start = match.start()
+
+        if section == 'bases':
+            add_base(len(header))
+        elif clause_start is not None:
+            constraints.append(' '.join(cls.COMMENT.sub(' ', header[clause_start:]).split()))
+        return arity, bases, constraints
+
+    @staticmethod
+    def _top_level_paren(text: str) -> int:
+        depth = 0
+        for pos, char in enumerate(text):
+            if char == '<':
+                depth += 1
+            elif char == '>':
+                depth -= 1
+            elif char == '(' and depth == 0:
+                return pos
+        return -1
+
+    def _skip_interpolated(self, pos: int, verbatim: bool, dollars: int) -> int:
+        """Skip the rest of an interpolated string, including nested expressions"""
+        text = self.text
+        length = len(text)
+        while pos < length:
+            char = text[pos]
+            if char == '"':
+                if verbatim and text.startswith('""', pos):
+                    pos += 2
+                    continue
+                return pos + 1
+            if char == '\\' and not verbatim:
+                pos += 2
+            elif char == '\n' and not verbatim:
+                return pos
+            elif char == '{':
+                if dollars == 1 and text.startswith('{{', pos):
+                    pos += 2
+                else:
+                    pos = self._skip_hole(pos + dollars)
+            else:
+                pos += 1
+        return length
+
+    def _skip_raw_interpolated(self, pos: int, opening: str) -> int:
+        """Skip the rest of a raw interpolated string, including nested expressions.
+
+        With N leading '$', a run of fewer than N braces is literal content and
+        a longer run opens a hole; the string ends at a quote run as long as
+        the opening one.
+        """
+        text = self.text
+        length = len(text)
+        dollars = opening.count('$')
+        quotes = len(opening) - dollars
+        while pos < length:
+            char = text[pos]
+            if char == '"' or char == '{':
+                run = pos
+                while run < length and text[run] == char:
+                    run += 1
+                if char == '"' and run - pos >= quotes:
+                    return run
+                if char == '{' and run - pos >= dollars:
+                    pos = self._skip_hole(run)
+                else:
+                    pos = run
+            else:
+                pos += 1
+        return length
+
+    def _skip_hole(self, pos: int) -> int:
+        """Skip an interpolation hole up to its closing brace"""
+        text = self.text
+        depth = 1
+        while pos < len(text):
+            match = self.TOKEN.search(text, pos)
+            if not match:
+                return len(text)
+            pos = match.end()
+            kind = match.lastgroup
+            if kind == 'raw_interpolated':
+                pos = self._skip_raw_interpolated(pos, match.group())
+            elif kind == 'interpolated':
+                pos = self._skip_interpolated(pos, '@' in match.group(), match.group().count('$'))
+            elif kind == 'raw':
+                closing = text.find(match.group(), pos)
+                pos = len(text) if closing == -1 else closing + len(match.group())
+            elif match.group() == '{':
+                depth += 1
+            elif match.group() == '}':
+                depth -= 1
+                if depth == 0:
+                    return pos
+        return len(text)
+
+
+def _utf8_offsets(text: str):
+    """Map character offsets in text to UTF-8 byte offsets; fastest when queried in increasing order."""
+    if text.isascii():
+        return lambda pos: pos
+
+    last_pos = last_byte = 0
+
+    def byte_offset(pos: int) -> int:
+        nonlocal last_pos, last_byte
+        if pos < last_pos:
+            last_pos = last_byte = 0
+        last_byte += len(text[last_pos:pos].encode('utf-8'))
+        last_pos = pos
+        return last_byte
+
+    return byte_offset
+
+
+def type_text_span(content: str, start_line: int, start: int, end: int) -> Tuple[int, int, int]:
+    """Full-line span of a type declaration, extended upwards over attribute, comment and blank lines.
+
+    Returns (first_line, start, end) as character offsets; end is exclusive
+    and stops before the final line break.
+    """
+    start = content.rfind('\n', 0, start) + 1
+    first_line = start_line
+    while start > 0:
+        previous = content.rfind('\n', 0, start - 1) + 1
+        line = content[previous:start - 1].strip()
+        if line.startswith('[') or line.startswith('//') or line == '':
+            start = previous
+            first_line -= 1
+        else:
+            break
+
+    end = content.find('\n', end)
+    if end == -1:
+        end = len(content)
+    if end > start and content[end - 1] == '\r':
+        end -= 1
+    return first_line, start, end
+
+
+def parse_symbols(content: str) -> List[TypeSymbol]:
+    """Type declarations in C# source text."""
+    return CSharpLexer(content).symbols()
+
+
+def git_blob_id(data: bytes) -> str:
+    """The object id git assigns to a blob with these contents."""
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+def parse_file(file_path: Path) -> Tuple[List[TypeSymbol], Tuple[int, int, str]]:
+    """Parse a file; returns its symbols and (size, mtime_ns, blob id) stamp. Raises OSError/UnicodeDecodeError."""
+    stat = file_path.stat()
+    data = file_path.read_bytes()
+    return parse_symbols(data.decode('utf-8')), (stat.st_size, stat.st_mtime_ns, git_blob_id(data))
+
+
+def repository_root(path: Path) -> Path:
+    """Nearest ancestor (or path itself) containing .git, else path."""
+    path = path.resolve()
+    for directory in [path] + list(path.parents):
+        if (directory / '.git').exists():
+            return directory
+    return path
+
+
+class GitBlobReader:
+    """Reads file contents through one long-lived `git cat-file --batch` process."""
+
+    def __init__(self, cwd: Path):
+        self.process = subprocess.Popen(
+            ['git', 'cat-file', '--batch'],
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE
+        )
+
+    def read(self, object_name: str) -> Optional[Tuple[str, bytes]]:
+        """Get a blob's (sha, contents) by object name (e.g. 'HEAD:./src/Foo.cs'), or None if missing."""
+        self.process.stdin.write(object_name.encode('utf-8') + b'\n')
+        self.process.stdin.flush()
+        return self._read_response()
+
+    def read_many(self, object_names: List[str]) -> Iterator[Tuple[str, Optional[Tuple[str, bytes]]]]:
+        """Yield (object name, read() result) for several objects, in order.
+
+        Requests are written from a background thread while responses are
+        read, so large batches stream through the pipe without blocking.
+        Consume the whole iterator before issuing other reads.
+        """
+        def write_requests():
+            try:
+                self.process.stdin.write(b''.join(name.encode('utf-8') + b'\n' for name in object_names))
+                self.process.stdin.flush()
+            except OSError:
+                pass
+
+        writer = threading.Thread(target=write_requests, daemon=True)
+        writer.start()
+        for name in object_names:
+            yield name, self._read_response()
+        writer.join()
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        self.process.wait()
+
+    def __enter__(self) -> 'GitBlobReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _read_response(self) -> Optional[Tuple[str, bytes]]:
+        # "<sha> <type> <size>" followed by the contents and a newline, or "<name> missing"
+        header = self.process.stdout.readline().split()
+        if len(header) != 3 or not header[2].isdigit():
+            return None
+        data = self.process.stdout.read(int(header[2]))
+        self.process.stdout.read(1)
+        return (header[0].decode('ascii'), data) if header[1] == b'blob' else None
+
+
+class SymbolIndex:
+    """Incremental SQLite index of C# type declarations.
+
+    Files are keyed by path relative to the index root (normally the repository
+    top level) and validated by size and mtime; when only the mtime changed,
+    the git blob id decides. Only changed files are parsed again. The index is
+    rebuilt from scratch when the scanner version or token patterns change.
+    """
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, blob TEXT);
+        CREATE INDEX IF NOT EXISTS files_blob ON files (blob);
+        CREATE TABLE IF NOT EXISTS types (
+            path TEXT, ordinal INTEGER, kind TEXT, name TEXT, arity INTEGER,
+            namespace TEXT, modifiers TEXT, bases TEXT, constraints TEXT,
+            start_line INTEGER, end_line INTEGER, text_start_line INTEGER,
+            start_byte INTEGER, end_byte INTEGER, container TEXT,
+            PRIMARY KEY (path, ordinal));
+        CREATE INDEX IF NOT EXISTS types_name ON types (namespace, name);
+    '''
+    COLUMNS = ('kind', 'name', 'arity', 'namespace', 'modifiers', 'bases', 'constraints',
+               'start_line', 'end_line', 'text_start_line', 'start_byte', 'end_byte', 'container')
+
+    def __init__(self, db_path: Path, root_path: Path):
+        self.db_path = db_path
+        self.root_path = root_path.resolve()
+        self._root = str(self.root_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(db_path), timeout=30)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self._setup()
+        self._files: Dict[str, Tuple[int, int, str]] = {
+            path: (size, mtime_ns, blob)
+            for path, size, mtime_ns, blob in self.connection.execute('SELECT path, size, mtime_ns, blob FROM files')
+        }
+
+    @staticmethod
+    def default_path(root_path: Path) -> Path:
+        """Per-repository index file in the system temp directory."""
+        digest = hashlib.sha1(str(root_path.resolve()).encode('utf-8')).hexdigest()[:12]
+        return Path(tempfile.gettempdir()) / f'csharp-symbols-{digest}.sqlite'
+
+    @classmethod
+    def open(cls, path: Path, db_path: Optional[Path] = None) -> 'SymbolIndex':
+        """Open the shared index of the repository containing path."""
+        root_path = repository_root(path)
+        return cls(db_path or cls.default_path(root_path), root_path)
+
+    @classmethod
+    def fingerprint(cls) -> str:
+        """Identifies the scanner logic that produced indexed symbols."""
+        parts = [
+            str(SCANNER_VERSION),
+            cls.SCHEMA,
+            CSharpLexer.TOKEN.pattern,
+            CSharpLexer.HEADER_TOKEN.pattern,
+            ','.join(sorted(CSharpLexer.TYPE_KINDS)),
+            ','.join(CSharpLexer.MODIFIERS),
+            ','.join(sorted(CSharpLexer.DECLARATION_KEYWORDS)),
+        ]
+        return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    def key(self, file_path: Path) -> str:
+        """Index key of a file: its '/'-separated path relative to the index root."""
+        path = str(file_path)
+        if path.startswith(self._root + os.sep):
+            path = path[len(self._root) + 1:]
+        else:
+            path = str(Path(path).resolve().relative_to(self.root_path))
+        return path.replace(os.sep, '/')
+
+    def lookup(self, file_path: Path) -> Optional[List[TypeSymbol]]:
+        """Indexed symbols of a file, or None if it is not indexed or changed."""
+        key = self.key(file_path)
+        entry = self._files.get(key)
+        if entry is None:
+            return None
+
+        size, mtime_ns, blob = entry
+        try:
+            stat = file_path.stat()
+            if stat.st_size != size:
+                return None
+            if stat.st_mtime_ns != mtime_ns:
+                # Touched but possibly unchanged (checkout, rebase): compare contents
+                if git_blob_id(file_path.read_bytes()) != blob:
+                    return None
+                self._files[key] = (size, stat.st_mtime_ns, blob)
+                self.connection.execute('UPDATE files SET mtime_ns = ? WHERE path = ?', (stat.st_mtime_ns, key))
+        except OSError:
+            return None
+        return self._load(key)
+
+    def lookup_blob(self, blob: str) -> Optional[List[TypeSymbol]]:
+        """Symbols of any indexed file with exactly this content (git blob id)."""
+        row = self.connection.execute('SELECT path FROM files WHERE blob = ? LIMIT 1', (blob,)).fetchone()
+        return self._load(row[0]) if row else None
+
+    def store(self, file_path: Path, stamp: Tuple[int, int, str], symbols: List[TypeSymbol]) -> None:
+        """Record a fresh parse of a file."""
+        key = self.key(file_path)
+        self._files[key] = stamp
+        self.connection.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)', (key, *stamp))
+        self.connection.execute('DELETE FROM types WHERE path = ?', (key,))
+        self.connection.executemany(
+            f'INSERT INTO types VALUES ({", ".join("?" * (len(self.COLUMNS) + 2))})',
+            [
+                (key, ordinal, s.kind, s.name, s.arity, s.namespace, s.modifiers,
+                 json.dumps(s.bases), json.dumps(s.constraints),
+                 s.start_line, s.end_line, s.text_start_line, s.start_byte, s.end_byte, s.container)
+                for ordinal, s in enumerate(symbols)
+            ]
+        )
+
+    def symbols(self, file_path: Path) -> List[TypeSymbol]:
+        """Symbols of a file, parsing and indexing it if needed. Raises OSError/UnicodeDecodeError."""
+        symbols = self.lookup(file_path)
+        if symbols is None:
+            symbols, stamp = parse_file(file_path)
+            self.store(file_path, stamp, symbols)
+        return symbols
+
+    def types_named(self, namespace: str, name: str) -> List[Tuple[str, TypeSymbol]]:
+        """All indexed declarations (e.g. partial parts) of a type, as (path, symbol)."""
+        rows = self.connection.execute(
+            f'SELECT path, {", ".join(self.COLUMNS)} FROM types WHERE namespace = ? AND name = ? ORDER BY path, ordinal',
+            (namespace, name)
+        )
+        return [(row[0], self._symbol(row[1:])) for row in rows]
+
+    def sync_with_git(self, paths: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Index the staged contents of tracked .cs files; returns {key: blob id} of those files.
+
+        Covers every tracked .cs file, or only the given paths (relative to
+        the index root). Driven by `git ls-files --stage`, so files whose
+        blob is already indexed are never read. Other blobs are reused from
+        any indexed file with the same contents, or read through one
+        `git cat-file --batch` process and parsed.
+        Raises OSError/subprocess.CalledProcessError.
+        """
+        pathspecs = ['*.cs'] if paths is None else [f':(literal){path}' for path in paths]
+        if not pathspecs:
+            return {}
+        output = subprocess.run(
+            ['git', 'ls-files', '--stage', '-z', '--', *pathspecs],
+            cwd=self.root_path, capture_output=True, check=True
+        ).stdout
+
+        tracked: Dict[str, str] = {}
+        for entry in os.fsdecode(output).split('\0'):
+            if not entry:
+                continue
+            # "<mode> <blob> <stage>\t<path>"; during a conflict use our side (stage 2)
+            info, key = entry.split('\t', 1)
+            _, blob, stage = info.split()
+            if stage in ('0', '2'):
+                tracked[key] = blob
+
+        missing: Dict[str, List[str]] = {}
+        for key, blob in tracked.items():
+            entry = self._files.get(key)
+            if entry is not None and entry[2] == blob:
+                continue
+            row = self.connection.execute('SELECT path, size FROM files WHERE blob = ? LIMIT 1', (blob,)).fetchone()
+            if row:
+                # No mtime: the working tree copy is checked against the blob id before reuse
+                self.store(self.root_path / key, (row[1], -1, blob), self._load(row[0]))
+            else:
+                missing.setdefault(blob, []).append(key)
+
+        if missing:
+            with GitBlobReader(self.root_path) as reader:
+                for blob, result in reader.read_many(list(missing)):
+                    if result is None:
+                        continue
+                    try:
+                        symbols = parse_symbols(result[1].decode('utf-8'))
+                    except UnicodeDecodeError:
+                        continue
+                    for key in missing[blob]:
+                        self.store(self.root_path / key, (len(result[1]), -1, blob), symbols)
+        return tracked
+
+    def forget(self, paths: Iterable[str]) -> None:
+        """Drop index entries by key."""
+        for key in paths:
+            if self._files.pop(key, None) is not None:
+                self.connection.execute('DELETE FROM files WHERE path = ?', (key,))
+                self.connection.execute('DELETE FROM types WHERE path = ?', (key,))
+
+    def prune(self, directory: Path, seen: Iterable[Path]) -> None:
+        """Drop entries under directory for files not in seen (deleted or now excluded)."""
+        prefix = self.key(directory / 'x')[:-1]
+        prefix = '' if prefix == '/' else prefix
+        keep = {self.key(path) for path in seen}
+        self.forget([key for key in self._files if key.startswith(prefix) and key not in keep])
+
+    def save(self) -> None:
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.commit()
+        self.connection.close()
+
+    def __enter__(self) -> 'SymbolIndex':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _setup(self) -> None:
+        self.connection.executescript(self.SCHEMA)
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is None or row[0] != self.fingerprint():
+            # Recreate the tables, as the schema may have changed too
+            self.connection.executescript('DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS types;' + self.SCHEMA)
+            with self.connection:
+                self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (self.fingerprint(),))
+
+    def _load(self, key: str) -> List[TypeSymbol]:
+        rows = self.connection.execute(
+            f'SELECT {", ".join(self.COLUMNS)} FROM types WHERE path = ? ORDER BY ordinal', (key,)
+        )
+        return [self._symbol(row) for row in rows]
+
+    @staticmethod
+    def _symbol(row: tuple) -> TypeSymbol:
+        kind, name, arity, namespace, modifiers, bases, constraints, *spans, container = row
+        return TypeSymbol(kind, name, arity, namespace, modifiers, json.loads(bases), json.loads(constraints),
+                          *spans, container=container)
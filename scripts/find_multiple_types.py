@@ -7,25 +7,44 @@ top-level type declarations (classes, interfaces, structs, enums, delegates, rec
 It can optionally attempt to automatically split them into separate files.
 """
 
+import os
 import re
 import argparse
+import select
+import struct
+import time
+import difflib
 import json
+import shutil
+import sqlite3
+import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Tuple
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator, Set
+from dataclasses import dataclass, asdict, field
+
+from csharp_symbols import GitBlobReader, SymbolIndex, TypeSymbol, parse_file, parse_symbols
 
 
 @dataclass
 class TypeDeclaration:
-    """Represents a type declaration in a C# file."""
+    """Represents a type declaration in a C# file.
+
+    The declaration text (including attributes and comments above it) is not
+    stored; it spans lines text_start_line..end_line and bytes
+    start_byte..end_byte of the file. Use FileAnalysis.type_text to read it.
+    """
     type_kind: str  # class, interface, struct, enum, delegate, record
     name: str
     line: int
     start_line: int
     end_line: int
-    full_text: str
     modifiers: str  # public, internal, etc.
+    text_start_line: int
+    start_byte: int
+    end_byte: int
 
 
 @dataclass
@@ -35,152 +54,273 @@ class FileAnalysis:
     relative_path: str
     type_count: int
     types: List[TypeDeclaration]
+    blob: Optional[str] = None  # git object the analysis was made from, if not the working tree
+
+    def read_source(self) -> bytes:
+        """Raw contents that were analyzed."""
+        if self.blob:
+            directory = os.path.dirname(self.file_path)
+            return subprocess.run(
+                ['git', 'cat-file', 'blob', self.blob],
+                cwd=directory if os.path.isdir(directory) else None,
+                capture_output=True,
+                check=True
+            ).stdout
+        return Path(self.file_path).read_bytes()
+
+    def type_text(self, type_decl: TypeDeclaration, source: Optional[bytes] = None) -> str:
+        """Materialize a declaration's text; pass source to avoid re-reading the file."""
+        if source is None:
+            source = self.read_source()
+        return '\n'.join(source[type_decl.start_byte:type_decl.end_byte].decode('utf-8').splitlines())
+
+
+class GitIgnore:
+    """Patterns from one .gitignore file.
+
+    Supports comments, negation (!), directory-only (trailing /) and anchored
+    patterns, and the *, ?, [...] and ** wildcards.
+    """
+
+    def __init__(self, base: str, rules: List[Tuple['re.Pattern', bool, bool, bool]]):
+        self.base = base
+        self.rules = rules  # (regex, negate, dir_only, anchored)
+
+    @classmethod
+    def load(cls, directory: str, file_name: str = '.gitignore') -> Optional['GitIgnore']:
+        """Read the ignore file in a directory, if any."""
+        try:
+            with open(os.path.join(directory, file_name), encoding='utf-8', errors='replace') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+
+        rules = []
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            elif line.startswith('\\'):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if line:
+                rules.append((re.compile(cls._translate(line)), negate, dir_only, anchored))
+
+        return cls(directory, rules) if rules else None
+
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        """Convert a gitignore glob to a regex over '/'-separated relative paths."""
+        parts = []
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith('**/', i):
+                parts.append('(?:.*/)?')
+                i += 3
+            elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+                parts.append('/.*')
+                i += 3
+            elif pattern.startswith('**', i):
+                parts.append('.*')
+                i += 2
+            elif pattern[i] == '*':
+                parts.append('[^/]*')
+                i += 1
+            elif pattern[i] == '?':
+                parts.append('[^/]')
+                i += 1
+            elif pattern[i] == '[' and pattern.find(']', i + 2) != -1:
+                end = pattern.find(']', i + 2)
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end + 1
+            elif pattern[i] == '\\' and i + 1 < len(pattern):
+                parts.append(re.escape(pattern[i + 1]))
+                i += 2
+            else:
+                parts.append(re.escape(pattern[i]))
+                i += 1
+        return ''.join(parts)
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included by a negation, None if no pattern applies."""
+        relative = path[len(self.base) + 1:].replace(os.sep, '/')
+        name = relative.rsplit('/', 1)[-1]
+        for regex, negate, dir_only, anchored in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.fullmatch(relative if anchored else name):
+                return not negate
+        return None
 
 
 class CSharpTypeScanner:
     """Scanner for finding type declarations in C# files."""
 
-    # Patterns for top-level type declarations
-    TYPE_PATTERNS = [
-        # With explicit access modifiers
-        r'^\s*(public|internal|private|protected)\s+(static\s+)?(sealed\s+)?(abstract\s+)?(partial\s+)?(class|interface|struct|enum|delegate|record)\s+(\w+)',
-        # Without access modifiers (implicit internal)
-        r'^\s*(static\s+)?(sealed\s+)?(abstract\s+)?(partial\s+)?(class|interface|struct|enum|delegate|record)\s+(\w+)',
-    ]
+    EXCLUDED_DIRS = {'obj', 'bin', 'Library', 'Temp', '.git', 'node_modules'}
+
+    # Files per worker task when streaming paths into the process pool
+    BATCH_SIZE = 64
 
     def __init__(self, root_path: Path):
         self.root_path = root_path.resolve()
 
     def find_csharp_files(self) -> List[Path]:
         """Find all C# files, excluding build artifacts."""
-        exclude_patterns = {'obj', 'bin', 'Library', 'Temp', '.git', 'node_modules'}
+        return list(self.iter_csharp_files())
 
-        files = []
-        for cs_file in self.root_path.rglob('*.cs'):
-            # Skip if any parent directory matches exclude patterns
-            if any(part in exclude_patterns for part in cs_file.parts):
+    def iter_csharp_files(
+        self,
+        use_git: bool = False,
+        directories: Optional[Dict[str, List[GitIgnore]]] = None
+    ) -> Iterator[Path]:
+        """Yield C# files as they are found, skipping build artifacts and ignored paths.
+
+        With use_git, the list comes from `git ls-files`; outside a repository
+        this falls back to walking the tree. When walking, every visited
+        directory is recorded in directories (if given) with its ignore rules.
+        """
+        if use_git:
+            files = self._git_ls_files()
+            if files is not None:
+                yield from files
+                return
+
+        yield from self.walk(str(self.root_path), self._ancestor_ignores(), directories)
+
+    def is_candidate(self, name: str, is_dir: bool) -> bool:
+        """Whether a directory may be descended into, or a file is a C# source, by name alone."""
+        if is_dir:
+            return name not in self.EXCLUDED_DIRS
+        # Skip non-C# and temp files
+        return name.endswith('.cs') and not name.startswith('.#')
+
+    def walk(
+        self,
+        directory: str,
+        ignores: List[GitIgnore],
+        directories: Optional[Dict[str, List[GitIgnore]]] = None
+    ) -> Iterator[Path]:
+        """Depth-first scandir walk that prunes excluded and ignored directories before descending.
+
+        ignores are the rules inherited from the parent directories.
+        """
+        own = GitIgnore.load(directory)
+        if own:
+            ignores = ignores + [own]
+        if directories is not None:
+            directories[directory] = ignores
+
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return
+
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
                 continue
-            # Skip temp files
-            if cs_file.name.startswith('.#'):
+            if not self.is_candidate(entry.name, is_dir) or self.is_ignored(ignores, entry.path, is_dir):
                 continue
-            files.append(cs_file)
+            if is_dir:
+                yield from self.walk(entry.path, ignores, directories)
+            else:
+                yield Path(entry.path)
 
-        return files
+    @staticmethod
+    def is_ignored(ignores: List[GitIgnore], path: str, is_dir: bool) -> bool:
+        # Deeper ignore files override shallower ones
+        ignored = False
+        for ignore in ignores:
+            result = ignore.match(path, is_dir)
+            if result is not None:
+                ignored = result
+        return ignored
 
-    def count_brace_depth(self, lines: List[str], up_to_line: int) -> int:
-        """Calculate brace nesting depth up to a specific line."""
-        depth = 0
-        for i in range(up_to_line):
-            line = lines[i]
-            # Simple brace counting (doesn't handle strings/comments perfectly)
-            depth += line.count('{')
-            depth -= line.count('}')
-        return depth
-
-    def is_nested_type(self, lines: List[str], line_index: int) -> bool:
-        """Check if a type declaration is nested inside another type."""
-        return self.count_brace_depth(lines, line_index) > 0
-
-    def find_type_end(self, lines: List[str], start_line: int) -> int:
-        """Find the closing brace of a type declaration."""
-        depth = 0
-        in_type = False
-
-        for i in range(start_line, len(lines)):
-            line = lines[i]
-
-            # Track when we enter the type body
-            if '{' in line:
-                in_type = True
-
-            if in_type:
-                depth += line.count('{')
-                depth -= line.count('}')
-
-                if depth == 0:
-                    return i
-
-        return len(lines) - 1  # Fallback to end of file
-
-    def extract_type_text(self, lines: List[str], start: int, end: int) -> str:
-        """Extract the full text of a type declaration including attributes."""
-        # Look backwards for attributes
-        attr_start = start
-        for i in range(start - 1, -1, -1):
-            line = lines[i].strip()
-            if line.startswith('[') or line.startswith('//') or line == '':
-                attr_start = i
-            else:
-                break
+    def _ancestor_ignores(self) -> List[GitIgnore]:
+        """Ignore files between the repository top level and the scan root (exclusive)."""
+        ancestors = []
+        for directory in self.root_path.parents:
+            if (directory / '.git').exists():
+                ignores = [GitIgnore.load(str(directory), os.path.join('.git', 'info', 'exclude'))]
+                ignores += [GitIgnore.load(str(path)) for path in reversed([directory] + ancestors)]
+                return [ignore for ignore in ignores if ignore]
+            ancestors.append(directory)
 
-        return '\n'.join(lines[attr_start:end + 1])
+        if (self.root_path / '.git').exists():
+            ignore = GitIgnore.load(str(self.root_path), os.path.join('.git', 'info', 'exclude'))
+            return [ignore] if ignore else []
+        return []
 
-    def parse_modifiers(self, line: str) -> str:
-        """Extract access modifiers from a type declaration line."""
-        modifiers = []
-        tokens = ['public', 'internal', 'protected', 'private', 'static', 'sealed', 'abstract', 'partial']
-        for token in tokens:
-            if re.search(rf'\b{token}\b', line):
-                modifiers.append(token)
-        return ' '.join(modifiers) if modifiers else 'internal'
+    def _git_ls_files(self) -> Optional[List[Path]]:
+        """Tracked and untracked, non-ignored C# files under the root, or None outside git."""
+        try:
+            output = subprocess.run(
+                ['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard', '--', '*.cs'],
+                cwd=self.root_path,
+                capture_output=True,
+                check=True
+            ).stdout
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+        files = []
+        for name in dict.fromkeys(os.fsdecode(output).split('\0')):
+            if not name:
+                continue
+            parts = name.split('/')
+            if parts[-1].startswith('.#') or any(part in self.EXCLUDED_DIRS for part in parts[:-1]):
+                continue
+            file_path = self.root_path / name
+            # Tracked files deleted from the working tree are still listed
+            if file_path.is_file():
+                files.append(file_path)
+        return files
 
     def analyze_file(self, file_path: Path) -> FileAnalysis:
         """Analyze a C# file for type declarations."""
+        parsed = self.parse_file(file_path)
+        return self.to_analysis(file_path, parsed[0]) if parsed else self._empty_analysis(file_path)
+
+    def parse_file(self, file_path: Path) -> Optional[Tuple[List[TypeSymbol], Tuple[int, int, str]]]:
+        """Symbols and (size, mtime_ns, blob id) stamp of a C# file, or None if unreadable."""
         try:
-            content = file_path.read_text(encoding='utf-8')
-            lines = content.splitlines()
+            return parse_file(file_path)
         except Exception as e:
             print(f"Error reading {file_path}: {e}", file=sys.stderr)
-            return FileAnalysis(
-                file_path=str(file_path),
-                relative_path=str(file_path.relative_to(self.root_path)),
-                type_count=0,
-                types=[]
-            )
+            return None
 
-        types = []
-        in_multiline_comment = False
+    def analyze_content(self, file_path: Path, content: str) -> FileAnalysis:
+        """Analyze C# source text that belongs to file_path (which need not exist on disk)."""
+        return self.to_analysis(file_path, parse_symbols(content))
 
-        for i, line in enumerate(lines):
-            # Skip multiline comments
-            if '/*' in line:
-                in_multiline_comment = True
-            if '*/' in line:
-                in_multiline_comment = False
-                continue
-            if in_multiline_comment or line.strip().startswith('//'):
-                continue
-
-            # Try to match type declaration patterns
-            for pattern in self.TYPE_PATTERNS:
-                match = re.match(pattern, line)
-                if match:
-                    # Check if it's a top-level type (not nested)
-                    if not self.is_nested_type(lines, i):
-                        # Extract type kind and name
-                        groups = match.groups()
-                        type_kind = groups[-2]  # Second to last group is always the type kind
-                        type_name = groups[-1]  # Last group is always the name
-
-                        # Find where the type ends
-                        end_line = self.find_type_end(lines, i)
-
-                        # Extract full text
-                        full_text = self.extract_type_text(lines, i, end_line)
-
-                        # Parse modifiers
-                        modifiers = self.parse_modifiers(line)
-
-                        types.append(TypeDeclaration(
-                            type_kind=type_kind,
-                            name=type_name,
-                            line=i + 1,  # 1-indexed for display
-                            start_line=i,
-                            end_line=end_line,
-                            full_text=full_text,
-                            modifiers=modifiers
-                        ))
-                    break
+    def to_analysis(self, file_path: Path, symbols: List[TypeSymbol]) -> FileAnalysis:
+        """Report view of a file's top-level symbols (nested types belong to their parent)."""
+        types = [
+            TypeDeclaration(
+                type_kind=symbol.kind,
+                name=symbol.name,
+                line=symbol.start_line + 1,  # 1-indexed for display
+                start_line=symbol.start_line,
+                end_line=symbol.end_line,
+                modifiers=symbol.modifiers,
+                text_start_line=symbol.text_start_line,
+                start_byte=symbol.start_byte,
+                end_byte=symbol.end_byte
+            )
+            for symbol in symbols
+            if not symbol.nested
+        ]
 
         relative_path = file_path.relative_to(self.root_path)
 
@@ -191,12 +331,646 @@ class CSharpTypeScanner:
             types=types
         )
 
+    def _empty_analysis(self, file_path: Path) -> FileAnalysis:
+        return FileAnalysis(
+            file_path=str(file_path),
+            relative_path=str(file_path.relative_to(self.root_path)),
+            type_count=0,
+            types=[]
+        )
+
+    def changed_files(self, since: Optional[str] = None) -> List[str]:
+        """C# files under the root changed between a ref and HEAD, or staged when since is None.
+
+        Paths are relative to the root; deleted files are omitted.
+        """
+        command = ['git', 'diff', '--name-only', '-z', '--relative', '--diff-filter=ACMR']
+        command += [since, 'HEAD'] if since else ['--cached']
+        command += ['--', '*.cs']
+        try:
+            output = subprocess.run(command, cwd=self.root_path, capture_output=True, check=True).stdout
+        except OSError as e:
+            raise RuntimeError(f"Could not run git: {e}")
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(e.stderr.decode('utf-8', errors='replace').strip() or f"git diff failed ({e.returncode})")
+
+        files = []
+        for name in os.fsdecode(output).split('\0'):
+            parts = name.split('/')
+            if not name or parts[-1].startswith('.#') or any(part in self.EXCLUDED_DIRS for part in parts[:-1]):
+                continue
+            files.append(name)
+        return files
+
+    def analyze_changed(self, since: Optional[str] = None) -> List[FileAnalysis]:
+        """Analyze C# files changed since a ref (HEAD contents) or staged (index contents).
+
+        Contents come from git rather than the working tree, read through a
+        single `git cat-file --batch` process.
+        """
+        # Object names relative to the root, which is git's working directory
+        prefix = 'HEAD:./' if since else ':./'
+        names = self.changed_files(since)
+        analyses = []
+        with GitBlobReader(self.root_path) as reader:
+            for name, (_, blob) in zip(names, reader.read_many([prefix + name for name in names])):
+                file_path = self.root_path / name
+                try:
+                    if blob is None:
+                        raise ValueError(f"no blob for {prefix}{name}")
+                    analysis = self.analyze_content(file_path, blob[1].decode('utf-8'))
+                    analysis.blob = blob[0]
+                    analyses.append(analysis)
+                except ValueError as e:
+                    print(f"Error reading {file_path}: {e}", file=sys.stderr)
+                    analyses.append(self._empty_analysis(file_path))
+        return analyses
+
+    def parse_batch(self, files: List[Path]) -> List[Optional[Tuple[List[TypeSymbol], Tuple[int, int, str]]]]:
+        """Parse several files in one worker task."""
+        return [self.parse_file(file_path) for file_path in files]
+
+    def analyze_files(
+        self,
+        files: Iterable[Path],
+        jobs: int = 1,
+        index: Optional[SymbolIndex] = None
+    ) -> List[FileAnalysis]:
+        """Analyze files as they are discovered, in a process pool when jobs > 1. Results keep the input order.
+
+        Files unchanged since they were last indexed are not parsed again;
+        fresh results are written back to the index.
+        """
+        return [
+            self.to_analysis(file_path, symbols) if symbols is not None else self._empty_analysis(file_path)
+            for file_path, symbols in self.parse_files(files, jobs, index)
+        ]
+
+    def parse_files(
+        self,
+        files: Iterable[Path],
+        jobs: int = 1,
+        index: Optional[SymbolIndex] = None
+    ) -> List[Tuple[Path, Optional[List[TypeSymbol]]]]:
+        """All symbols (nested types included) of each file, None if unreadable; see analyze_files."""
+        results: List[Tuple[Path, Optional[List[TypeSymbol]]]] = []
+        batches = []
+        pending: List[Tuple[int, Path]] = []
+        pool = None
+        try:
+            for file_path in files:
+                symbols = index.lookup(file_path) if index else None
+                if symbols is None:
+                    pending.append((len(results), file_path))
+                results.append((file_path, symbols))
+
+                # Hand full batches to the pool while the walk continues
+                if jobs > 1 and len(pending) >= self.BATCH_SIZE:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=jobs)
+                    batches.append((pending, pool.submit(self.parse_batch, [path for _, path in pending])))
+                    pending = []
+
+            # The remainder runs in-process while the pool drains
+            batches.insert(0, (pending, None))
+            for batch, future in batches:
+                parsed = future.result() if future else self.parse_batch([path for _, path in batch])
+                for (position, file_path), result in zip(batch, parsed):
+                    if result is None:
+                        continue
+                    symbols, stamp = result
+                    results[position] = (file_path, symbols)
+                    if index:
+                        index.store(file_path, stamp, symbols)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return results
+
+
+@dataclass
+class SplitPlan:
+    """Planned rewrite of one file into one file per type."""
+    file_path: str
+    relative_path: str
+    rewrite: bytes = b''                                   # new contents of the original file
+    creates: Dict[str, bytes] = field(default_factory=dict)  # new file path -> contents
+    skip_reason: Optional[str] = None
+
+
+def _split_blank_lines(text: bytes) -> Tuple[bytes, bytes]:
+    """Split leading blank lines off text; returns (blank_lines, rest)."""
+    pos = 0
+    while True:
+        newline = text.find(b'\n', pos)
+        if newline == -1 or text[pos:newline].strip():
+            return text[:pos], text[pos:]
+        pos = newline + 1
+
+
+class TypeSplitter:
+    """Plans and applies splitting files into one top-level type per file.
+
+    Every new file gets the original file's header (comments, usings, namespace
+    opening) and footer (namespace closing), with the type's attributes and doc
+    comments carried along. The type named like the file (or else the first)
+    stays in the original file. Files whose types are separated by anything but
+    whitespace (several namespaces, #region blocks, ...) are skipped.
+    """
+
+    def __init__(self, scanner: CSharpTypeScanner):
+        self.scanner = scanner
+
+    def plan(self, file_path: Path) -> SplitPlan:
+        """Plan the split of one file from its current contents."""
+        relative_path = str(file_path.relative_to(self.scanner.root_path))
+        try:
+            source = file_path.read_bytes()
+            types = self.scanner.analyze_content(file_path, source.decode('utf-8')).types
+        except (OSError, UnicodeDecodeError) as e:
+            return SplitPlan(str(file_path), relative_path, skip_reason=f"unreadable: {e}")
+
+        def skip(reason: str) -> SplitPlan:
+            return SplitPlan(str(file_path), relative_path, skip_reason=reason)
+
+        if len(types) < 2:
+            return skip("no longer has multiple types")
+        names = [t.name for t in types]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            return skip(f"several types named {', '.join(duplicates)}")
+        for previous, current in zip(types, types[1:]):
+            if current.start_byte < previous.end_byte:
+                return skip(f"{previous.name} and {current.name} share a line")
+            if source[previous.end_byte:current.start_byte].strip():
+                return skip(f"code between {previous.name} and {current.name}")
+
+        leading_blank, _ = _split_blank_lines(source[types[0].start_byte:types[0].end_byte])
+        header = source[:types[0].start_byte] + leading_blank
+        footer = source[types[-1].end_byte:]
+
+        keep = next((t for t in types if t.name == file_path.stem), types[0])
+        plan = SplitPlan(str(file_path), relative_path)
+        for type_decl in types:
+            _, body = _split_blank_lines(source[type_decl.start_byte:type_decl.end_byte])
+            content = header + body + footer
+            if type_decl is keep:
+                plan.rewrite = content
+                continue
+            target = file_path.with_name(f'{type_decl.name}.cs')
+            if target.exists():
+                return skip(f"{target.name} already exists")
+            plan.creates[str(target)] = content
+        return plan
+
+    def plan_all(self, files: List[Path], jobs: int = 1) -> List[SplitPlan]:
+        """Plan all files (in a process pool when jobs > 1), then skip plans whose new files collide."""
+        if jobs <= 1 or len(files) < 2:
+            plans = [self.plan(file_path) for file_path in files]
+        else:
+            chunksize = max(1, len(files) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                plans = list(pool.map(self.plan, files, chunksize=chunksize))
+
+        # Case-insensitive, as on Windows and macOS file systems
+        claimed = {}
+        for plan in plans:
+            if plan.skip_reason:
+                continue
+            targets = [path.lower() for path in plan.creates]
+            clash = next((claimed[target] for target in targets if target in claimed), None)
+            if clash:
+                plan.skip_reason = f"new file would collide with a type moved out of {clash}"
+                plan.rewrite, plan.creates = b'', {}
+                continue
+            claimed.update((target, plan.relative_path) for target in targets)
+        return plans
+
+    def diff(self, plans: List[SplitPlan]) -> str:
+        """Unified diff of all planned changes."""
+        root = self.scanner.root_path
+        chunks = []
+        for plan in plans:
+            if plan.skip_reason:
+                continue
+            original = Path(plan.file_path).read_bytes().decode('utf-8')
+            chunks.extend(difflib.unified_diff(
+                original.splitlines(keepends=True),
+                plan.rewrite.decode('utf-8').splitlines(keepends=True),
+                f'a/{plan.relative_path}',
+                f'b/{plan.relative_path}'
+            ))
+            for path, content in plan.creates.items():
+                chunks.extend(difflib.unified_diff(
+                    [],
+                    content.decode('utf-8').splitlines(keepends=True),
+                    '/dev/null',
+                    f'b/{Path(path).relative_to(root)}'
+                ))
+        return ''.join(chunk if chunk.endswith('\n') else chunk + '\n' for chunk in chunks)
+
+
+class SplitJournal:
+    """Applies a batch of file writes all-or-nothing.
+
+    Before anything is replaced, the journal directory records every target
+    with a backup of its original contents, so a failed batch is rolled back
+    immediately and an interrupted one can be rolled back later (--rollback).
+    """
+
+    DIRECTORY = '.split-journal'
+
+    def __init__(self, root_path: Path):
+        self.directory = root_path / self.DIRECTORY
+        self.journal_path = self.directory / 'journal.json'
+
+    def apply(self, rewrites: Dict[str, bytes], creates: Dict[str, bytes]) -> None:
+        """Replace existing files and create new ones; raises after rolling back on failure."""
+        if self.directory.exists():
+            raise RuntimeError(f"An interrupted split left {self.directory}; run with --rollback first")
+        existing = [path for path in creates if os.path.exists(path)]
+        if existing:
+            raise RuntimeError(f"Refusing to overwrite {existing[0]}")
+
+        entries = []
+        for index, path in enumerate(list(rewrites) + list(creates)):
+            entries.append({
+                'path': path,
+                'temp': f'{path}.split-tmp',
+                'backup': str(self.directory / f'{index:06d}.bak') if path in rewrites else None
+            })
+
+        self.directory.mkdir()
+        try:
+            with open(self.journal_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+                f.flush()
+                os.fsync(f.fileno())
+
+            # Stage everything first, so the replace phase is only renames
+            for entry in entries:
+                path = entry['path']
+                if entry['backup']:
+                    try:
+                        os.link(path, entry['backup'])
+                    except OSError:
+                        shutil.copy2(path, entry['backup'])
+                with open(entry['temp'], 'wb') as f:
+                    f.write(rewrites[path] if path in rewrites else creates[path])
+
+            for entry in entries:
+                os.replace(entry['temp'], entry['path'])
+        except BaseException:
+            self.rollback()
+            raise
+
+        shutil.rmtree(self.directory)
+
+    def rollback(self) -> int:
+        """Undo a journaled batch; returns the number of files restored or removed."""
+        try:
+            entries = json.loads(self.journal_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            entries = []
+
+        undone = 0
+        for entry in reversed(entries):
+            if os.path.exists(entry['temp']):
+                os.remove(entry['temp'])
+            if entry['backup']:
+                if os.path.exists(entry['backup']):
+                    os.replace(entry['backup'], entry['path'])
+                    undone += 1
+            elif os.path.exists(entry['path']):
+                os.remove(entry['path'])
+                undone += 1
+
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
+        return undone
+
+
+class PollingWatcher:
+    """Detects changes by re-listing the watched directories every interval; works on any platform.
+
+    Only directory entries and .cs file stats are compared, so a tick costs
+    one scandir per directory and no file reads.
+    """
+
+    name = 'polling'
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        # directory -> {name: (is_dir, mtime_ns, size)}
+        self._listings: Dict[str, Dict[str, Tuple[bool, int, int]]] = {}
+
+    def add(self, directory: str) -> None:
+        self._listings[directory] = self._list(directory) or {}
+
+    def remove(self, directory: str) -> None:
+        self._listings.pop(directory, None)
+
+    def wait(self) -> List[Tuple[str, str]]:
+        """Block until something changes; returns (event, path) pairs."""
+        while True:
+            time.sleep(self.interval)
+            events = []
+            for directory, before in list(self._listings.items()):
+                after = self._list(directory)
+                if after is None:
+                    events.append(('dir_deleted', directory))
+                    self._listings.pop(directory, None)
+                    continue
+                if after == before:
+                    continue
+                self._listings[directory] = after
+                for name in before.keys() | after.keys():
+                    old, new = before.get(name), after.get(name)
+                    if old == new:
+                        continue
+                    path = os.path.join(directory, name)
+                    if (new or old)[0]:
+                        if new and not old:
+                            events.append(('dir_created', path))
+                        elif old and not new:
+                            events.append(('dir_deleted', path))
+                    else:
+                        events.append(('file', path))
+            if events:
+                return events
+
+    def close(self) -> None:
+        self._listings.clear()
+
+    @staticmethod
+    def _list(directory: str) -> Optional[Dict[str, Tuple[bool, int, int]]]:
+        listing = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        listing[entry.name] = (True, 0, 0)
+                    elif entry.name.endswith('.cs'):
+                        stat = entry.stat(follow_symlinks=False)
+                        listing[entry.name] = (False, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+        return listing
+
+
+class InotifyWatcher:
+    """Linux inotify watch on every directory, through ctypes (no extra dependencies)."""
+
+    name = 'inotify'
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+    # struct inotify_event header: wd, mask, cookie, len
+    EVENT = struct.Struct('iIII')
+
+    # Events arriving within this window are reported as one batch
+    SETTLE_SECONDS = 0.1
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        self._ctypes = ctypes
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._directories: Dict[int, str] = {}
+        self._watches: Dict[str, int] = {}
+
+    @staticmethod
+    def available() -> bool:
+        return sys.platform.startswith('linux')
+
+    def add(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            errno = self._ctypes.get_errno()
+            raise OSError(errno, f"Cannot watch {directory}: {os.strerror(errno)}")
+        self._directories[wd] = directory
+        self._watches[directory] = wd
+
+    def remove(self, directory: str) -> None:
+        wd = self._watches.pop(directory, None)
+        if wd is not None:
+            self._directories.pop(wd, None)
+            # Fails harmlessly if the kernel already dropped the watch
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def wait(self) -> List[Tuple[str, str]]:
+        """Block until something changes; returns (event, path) pairs."""
+        events: List[Tuple[str, str]] = []
+        timeout = None
+        while True:
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+            if not ready:
+                if events:
+                    return events
+                timeout = None
+                continue
+            events.extend(self._parse(os.read(self._fd, 64 * 1024)))
+            timeout = self.SETTLE_SECONDS
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+    def _parse(self, data: bytes) -> Iterator[Tuple[str, str]]:
+        pos = 0
+        while pos + self.EVENT.size <= len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, pos)
+            name = os.fsdecode(data[pos + self.EVENT.size:pos + self.EVENT.size + length].rstrip(b'\0'))
+            pos += self.EVENT.size + length
+
+            if mask & self.IN_Q_OVERFLOW:
+                yield 'rescan', ''
+                continue
+            directory = self._directories.get(wd)
+            if directory is None:
+                continue
+            if mask & self.IN_DELETE_SELF:
+                yield 'dir_deleted', directory
+                continue
+
+            path = os.path.join(directory, name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    yield 'dir_created', path
+                elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                    yield 'dir_deleted', path
+            elif mask & (self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_MOVED_FROM | self.IN_DELETE):
+                yield 'file', path
+
+
+class TreeWatch:
+    """In-memory analyses of a tree, kept current from file system events.
+
+    Only files reported by the watcher are analyzed again; each update returns
+    violation events ('added', 'changed', 'cleared') for files whose
+    multiple-type status or type list changed.
+    """
+
+    def __init__(self, scanner: CSharpTypeScanner, watcher, index: Optional[SymbolIndex] = None):
+        self.scanner = scanner
+        self.watcher = watcher
+        self.index = index
+        self.directories: Dict[str, List[GitIgnore]] = {}
+        self.analyses: Dict[str, FileAnalysis] = {}
+
+    def scan(self) -> List[Dict]:
+        """Full scan; returns events against the previous model (all 'added' at start)."""
+        for directory in self.directories:
+            self.watcher.remove(directory)
+        self.directories = {}
+        files = list(self.scanner.iter_csharp_files(directories=self.directories))
+        for directory in self.directories:
+            self.watcher.add(directory)
+        return self._update(files + [Path(path) for path in self.analyses])
+
+    def step(self) -> List[Dict]:
+        """Wait for the next batch of changes and apply it."""
+        changed: Set[str] = set()
+        for event, path in self.watcher.wait():
+            if event == 'rescan':
+                # Event queue overflowed; changes may have been lost
+                return self.scan()
+            if event == 'dir_created':
+                ignores = self.directories.get(os.path.dirname(path))
+                if (ignores is None or path in self.directories
+                        or not self.scanner.is_candidate(os.path.basename(path), True)
+                        or self.scanner.is_ignored(ignores, path, True)):
+                    continue
+                added: Dict[str, List[GitIgnore]] = {}
+                changed.update(str(file_path) for file_path in self.scanner.walk(path, ignores, added))
+                for directory, directory_ignores in added.items():
+                    self.directories[directory] = directory_ignores
+                    self.watcher.add(directory)
+            elif event == 'dir_deleted':
+                prefix = path + os.sep
+                for directory in [d for d in self.directories if d == path or d.startswith(prefix)]:
+                    del self.directories[directory]
+                    self.watcher.remove(directory)
+                changed.update(file_path for file_path in self.analyses if file_path.startswith(prefix))
+            elif path in self.analyses:
+                changed.add(path)
+            else:
+                ignores = self.directories.get(os.path.dirname(path))
+                if (ignores is not None and self.scanner.is_candidate(os.path.basename(path), False)
+                        and not self.scanner.is_ignored(ignores, path, False)):
+                    changed.add(path)
+        return self._update([Path(path) for path in sorted(changed)])
+
+    def violations(self) -> List[FileAnalysis]:
+        return [analysis for analysis in self.analyses.values() if analysis.type_count > 1]
+
+    def _update(self, paths: List[Path]) -> List[Dict]:
+        events = []
+        present = []
+        for path in dict.fromkeys(paths):
+            if path.is_file():
+                present.append(path)
+                continue
+            before = self.analyses.pop(str(path), None)
+            if self.index and before:
+                self.index.forget([self.index.key(path)])
+            if before and before.type_count > 1:
+                events.append(self._event('cleared', before))
+
+        for analysis in self.scanner.analyze_files(present, 1, self.index):
+            before = self.analyses.get(analysis.file_path)
+            self.analyses[analysis.file_path] = analysis
+            was = before is not None and before.type_count > 1
+            if analysis.type_count > 1 and not was:
+                events.append(self._event('added', analysis))
+            elif was and analysis.type_count <= 1:
+                events.append(self._event('cleared', analysis))
+            elif was and self._signature(before) != self._signature(analysis):
+                events.append(self._event('changed', analysis))
+
+        if self.index:
+            self.index.save()
+        return events
+
+    @staticmethod
+    def _signature(analysis: FileAnalysis) -> List[Tuple[str, str, int]]:
+        return [(t.type_kind, t.name, t.line) for t in analysis.types]
+
+    @staticmethod
+    def _event(kind: str, analysis: FileAnalysis) -> Dict:
+        return {
+            "event": kind,
+            "time": datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+            "file": analysis.relative_path,
+            "type_count": analysis.type_count,
+            "types": [
+                {"kind": t.type_kind, "name": t.name, "line": t.line}
+                for t in analysis.types
+            ]
+        }
+
+
+def format_watch_event(event: Dict, as_json: bool) -> str:
+    """One output line per violation event: NDJSON or console text."""
+    if as_json:
+        return json.dumps(event)
+    marker = {'added': '+', 'changed': '~', 'cleared': '-'}[event['event']]
+    if event['event'] == 'cleared':
+        return f"[{marker}] {event['file']}: cleared"
+    types = ', '.join(f"{t['kind']} {t['name']}" for t in event['types'])
+    return f"[{marker}] {event['file']}: {event['type_count']} types ({types})"
+
+
+def run_watch(scanner: CSharpTypeScanner, index: Optional[SymbolIndex], as_json: bool,
+              poll: bool, interval: float) -> None:
+    """Report violations continuously until interrupted."""
+    watcher = None
+    if not poll and InotifyWatcher.available():
+        try:
+            watcher = InotifyWatcher()
+        except OSError as e:
+            print(f"Warning: inotify unavailable ({e}); polling instead", file=sys.stderr)
+    watch = TreeWatch(scanner, watcher or PollingWatcher(interval), index)
+
+    try:
+        try:
+            events = watch.scan()
+        except OSError as e:
+            # Typically the inotify watch limit (fs.inotify.max_user_watches)
+            print(f"Warning: {e}; polling instead", file=sys.stderr)
+            watch.watcher.close()
+            watch = TreeWatch(scanner, PollingWatcher(interval), index)
+            events = watch.scan()
+
+        print(f"Watching {len(watch.directories)} directories ({watch.watcher.name}); "
+              f"{len(watch.violations())} files with multiple types. Ctrl+C to stop.\n", file=sys.stderr)
+        while True:
+            for event in events:
+                print(format_watch_event(event, as_json), flush=True)
+            events = watch.step()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watch.watcher.close()
+
 
 class MultiTypeReporter:
     """Generate reports for files with multiple types."""
 
     @staticmethod
-    def console_report(results: List[FileAnalysis]) -> str:
+    def console_report(results: List[FileAnalysis], show_source: bool = False) -> str:
         """Generate console-friendly report."""
         if not results:
             return "[OK] No files with multiple types found!"
@@ -210,21 +984,25 @@ class MultiTypeReporter:
         for result in results:
             lines.append(f"\n{result.relative_path}")
             lines.append(f"  Type Count: {result.type_count}")
+            source = result.read_source() if show_source else None
             for type_decl in result.types:
                 lines.append(f"    - {type_decl.type_kind} {type_decl.name} (line {type_decl.line})")
+                if source is not None:
+                    lines.extend(f"        {line}".rstrip() for line in result.type_text(type_decl, source).splitlines())
 
         lines.extend([
             "",
             "=" * 80,
             f"Total violations: {len(results)} files",
             "",
-            "To fix: Open files in Rider and use Alt+Enter on each type -> 'Move to separate file'"
+            "To fix: Open files in Rider and use Alt+Enter on each type -> 'Move to separate file'",
+            "        or run this script with --split (preview with --split --dry-run)"
         ])
 
         return '\n'.join(lines)
 
     @staticmethod
-    def markdown_report(results: List[FileAnalysis]) -> str:
+    def markdown_report(results: List[FileAnalysis], show_source: bool = False) -> str:
         """Generate markdown report."""
         if not results:
             return "# Files with Multiple Type Declarations\n\n✓ No violations found!"
@@ -252,8 +1030,13 @@ class MultiTypeReporter:
 
         for result in results:
             lines.append(f"### `{result.relative_path}`\n")
+            source = result.read_source() if show_source else None
             for type_decl in result.types:
                 lines.append(f"- **{type_decl.type_kind}** `{type_decl.name}` (line {type_decl.line}, modifiers: `{type_decl.modifiers}`)")
+                if source is not None:
+                    lines.extend(["", "  ```csharp"])
+                    lines.extend(f"  {line}".rstrip() for line in result.type_text(type_decl, source).splitlines())
+                    lines.extend(["  ```", ""])
             lines.append("")
 
         lines.extend([
@@ -264,32 +1047,40 @@ class MultiTypeReporter:
             "2. Press **Alt+Enter** (or **Option+Enter** on macOS)",
             "3. Select **'Move to separate file'**",
             "4. Repeat for each type until only one remains",
+            "",
+            "Or split all files at once with `--split` (preview with `--split --dry-run`).",
         ])
 
         return '\n'.join(lines)
 
     @staticmethod
-    def json_report(results: List[FileAnalysis]) -> str:
+    def json_report(results: List[FileAnalysis], show_source: bool = False) -> str:
         """Generate JSON report."""
+        files = []
+        for r in results:
+            types = []
+            source = r.read_source() if show_source else None
+            for t in r.types:
+                entry = {
+                    "kind": t.type_kind,
+                    "name": t.name,
+                    "line": t.line,
+                    "modifiers": t.modifiers
+                }
+                if source is not None:
+                    entry["end_line"] = t.end_line + 1
+                    entry["source"] = r.type_text(t, source)
+                types.append(entry)
+            files.append({
+                "file": r.file_path,
+                "relative_path": r.relative_path,
+                "type_count": r.type_count,
+                "types": types
+            })
+
         data = {
             "total_violations": len(results),
-            "files": [
-                {
-                    "file": r.file_path,
-                    "relative_path": r.relative_path,
-                    "type_count": r.type_count,
-                    "types": [
-                        {
-                            "kind": t.type_kind,
-                            "name": t.name,
-                            "line": t.line,
-                            "modifiers": t.modifiers
-                        }
-                        for t in r.types
-                    ]
-                }
-                for r in results
-            ]
+            "files": files
         }
         return json.dumps(data, indent=2)
 
@@ -321,32 +1112,162 @@ def main():
         action='store_true',
         help='Exit with error code if violations found'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Number of worker processes (0 = one per CPU, default: 1)'
+    )
+    parser.add_argument(
+        '--cache',
+        type=Path,
+        help='Symbol index database (default: the per-repository index shared with the pre-commit hooks)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Parse every file without reading or updating the symbol index'
+    )
+    parser.add_argument(
+        '--git',
+        action='store_true',
+        help='List files with git ls-files instead of walking the tree (falls back outside a repository)'
+    )
+    parser.add_argument(
+        '--show-source',
+        action='store_true',
+        help='Include the source of each type declaration in the report'
+    )
+    parser.add_argument(
+        '--split',
+        action='store_true',
+        help='Split files into one file per type (all files are written, or none)'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='With --split, print a unified diff instead of writing files'
+    )
+    parser.add_argument(
+        '--rollback',
+        action='store_true',
+        help='Restore files from an interrupted --split run and exit'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and report violations as they appear, change or clear (NDJSON with --format json)'
+    )
+    parser.add_argument(
+        '--poll',
+        type=float,
+        nargs='?',
+        const=1.0,
+        metavar='SECONDS',
+        help='With --watch, poll every SECONDS (default 1) instead of using inotify'
+    )
+    incremental = parser.add_mutually_exclusive_group()
+    incremental.add_argument(
+        '--since',
+        metavar='REF',
+        help='Only analyze C# files changed between REF and HEAD (contents as of HEAD)'
+    )
+    incremental.add_argument(
+        '--staged',
+        action='store_true',
+        help='Only analyze staged C# files (contents as staged), e.g. from a pre-commit hook'
+    )
 
     args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
+    if args.split and (args.since or args.staged):
+        parser.error("--split rewrites the working tree and cannot be combined with --since/--staged")
+    if args.dry_run and not args.split:
+        parser.error("--dry-run requires --split")
+    if args.watch and (args.split or args.since or args.staged or args.git):
+        parser.error("--watch cannot be combined with --split, --since, --staged or --git")
+    if args.watch and args.format == 'markdown':
+        parser.error("--watch supports the console and json formats")
 
     # Scan files
     scanner = CSharpTypeScanner(args.path)
+
+    if args.rollback:
+        undone = SplitJournal(scanner.root_path).rollback()
+        print(f"[OK] Rolled back {undone} files", file=sys.stderr)
+        sys.exit(0)
+
     print(f"Scanning for C# files in: {args.path}", file=sys.stderr)
 
-    files = scanner.find_csharp_files()
-    print(f"Found {len(files)} C# files to analyze\n", file=sys.stderr)
+    if args.watch:
+        index = None
+        if not args.no_cache:
+            try:
+                index = SymbolIndex.open(scanner.root_path, args.cache)
+            except sqlite3.Error as e:
+                print(f"Warning: symbol index unavailable ({e}); parsing all files", file=sys.stderr)
+        run_watch(scanner, index, args.format == 'json', args.poll is not None, args.poll or 1.0)
+        if index:
+            index.close()
+        sys.exit(0)
+
+    index = None
+    if args.since or args.staged:
+        try:
+            analyses = scanner.analyze_changed(args.since)
+        except RuntimeError as e:
+            parser.error(str(e))
+    else:
+        if not args.no_cache:
+            try:
+                index = SymbolIndex.open(scanner.root_path, args.cache)
+            except sqlite3.Error as e:
+                print(f"Warning: symbol index unavailable ({e}); parsing all files", file=sys.stderr)
 
-    # Analyze each file
-    results = []
-    for file_path in files:
-        analysis = scanner.analyze_file(file_path)
-        if analysis.type_count > 1:
-            results.append(analysis)
+        # Analyze each file as the walk finds it
+        analyses = scanner.analyze_files(scanner.iter_csharp_files(args.git), jobs, index)
+    print(f"Analyzed {len(analyses)} C# files\n", file=sys.stderr)
+
+    results = [analysis for analysis in analyses if analysis.type_count > 1]
+
+    if index:
+        # A full walk of the root also drops index entries for deleted files
+        index.prune(scanner.root_path, [Path(analysis.file_path) for analysis in analyses])
+        index.close()
+
+    exit_code = 1 if args.errors_only and results else 0
 
     # Generate report
     reporter = MultiTypeReporter()
 
-    if args.format == 'json':
-        output = reporter.json_report(results)
+    if args.split:
+        splitter = TypeSplitter(scanner)
+        plans = splitter.plan_all([Path(r.file_path) for r in results], jobs)
+        planned = [plan for plan in plans if not plan.skip_reason]
+        for plan in plans:
+            if plan.skip_reason:
+                print(f"Skipped {plan.relative_path}: {plan.skip_reason}", file=sys.stderr)
+        created = sum(len(plan.creates) for plan in planned)
+
+        if args.dry_run:
+            output = splitter.diff(planned)
+            print(f"Would split {len(planned)} files into {created} new files", file=sys.stderr)
+        else:
+            rewrites = {plan.file_path: plan.rewrite for plan in planned}
+            creates = {path: content for plan in planned for path, content in plan.creates.items()}
+            try:
+                SplitJournal(scanner.root_path).apply(rewrites, creates)
+            except (OSError, RuntimeError) as e:
+                print(f"[ERROR] Split failed, no files were changed: {e}", file=sys.stderr)
+                sys.exit(1)
+            output = f"[OK] Split {len(planned)} files into {created} new files"
+            exit_code = 1 if args.errors_only and len(planned) < len(plans) else 0
+    elif args.format == 'json':
+        output = reporter.json_report(results, args.show_source)
     elif args.format == 'markdown':
-        output = reporter.markdown_report(results)
+        output = reporter.markdown_report(results, args.show_source)
     else:
-        output = reporter.console_report(results)
+        output = reporter.console_report(results, args.show_source)
 
     # Write output
     if args.output:
@@ -361,10 +1282,7 @@ def main():
             print(output.encode('ascii', 'replace').decode('ascii'))
 
     # Exit with appropriate code
-    if args.errors_only and results:
-        sys.exit(1)
-    else:
-        sys.exit(0)
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,47 @@
+"""Tests for CSharpLexer literal handling and declaration spans."""
+
+from csharp_symbols import CSharpLexer
+
+
+def spans(source):
+    return [(symbol.name, symbol.start_line, symbol.end_line) for symbol in CSharpLexer(source).symbols()]
+
+
+def test_separate_types_are_reported_with_line_spans():
+    source = 'namespace N\n{\n    class A\n    {\n    }\n\n    class B { }\n}\n'
+    assert spans(source) == [('A', 2, 4), ('B', 6, 6)]
+
+
+def test_braces_in_regular_and_verbatim_strings_are_ignored():
+    source = 'class A { string s = "}"; string v = @"{ "" }"; char c = \'}\'; }\nclass B { }\n'
+    assert spans(source) == [('A', 0, 0), ('B', 1, 1)]
+
+
+def test_interpolated_string_holes_are_skipped():
+    source = 'class A { string s = $"{{ {(x ? "}" : "{")} }}"; }\nclass B { }\n'
+    assert spans(source) == [('A', 0, 0), ('B', 1, 1)]
+
+
+def test_multiline_raw_string():
+    source = 'class A\n{\n    string s = """\n        { "quoted" }\n        """;\n}\nclass B { }\n'
+    assert spans(source) == [('A', 0, 5), ('B', 6, 6)]
+
+
+def test_raw_interpolated_string_with_braces_and_newlines():
+    source = 'class A { string s = $"""\n {x} } \n """; }\nclass B {}'
+    assert spans(source) == [('A', 0, 2), ('B', 3, 3)]
+
+
+def test_double_dollar_raw_interpolated_string_holes():
+    source = 'class A { string s = $$"""\n  { "json": {{value}} } }\n  """; }\nclass B {}'
+    assert spans(source) == [('A', 0, 2), ('B', 3, 3)]
+
+
+def test_raw_string_closes_on_quote_run_of_opening_length():
+    source = 'class A { string s = $""""a """ } {x}""""; }\nclass B {}'
+    assert spans(source) == [('A', 0, 0), ('B', 1, 1)]
+
+
+def test_string_inside_raw_interpolation_hole():
+    source = 'class A { string s = $$"""{{{F("}")}}}"""; }\nclass B {}'
+    assert spans(source) == [('A', 0, 0), ('B', 1, 1)]
@@ -0,0 +1,127 @@
+"""Tests for --split planning, the rollback journal and watch mode."""
+
+import os
+
+import pytest
+
+from find_multiple_types import CSharpTypeScanner, SplitJournal, TreeWatch, TypeSplitter
+
+
+MULTI_TYPE = '''using System;
+
+namespace Game
+{
+    /// <summary>First.</summary>
+    public class Player
+    {
+    }
+
+    [Serializable]
+    public struct Stats
+    {
+    }
+}
+'''
+
+
+class FakeWatcher:
+    """Watcher that reports queued events instead of watching the file system."""
+
+    name = 'fake'
+
+    def __init__(self):
+        self.directories = set()
+        self.queued = []
+
+    def add(self, directory):
+        self.directories.add(directory)
+
+    def remove(self, directory):
+        self.directories.discard(directory)
+
+    def wait(self):
+        events, self.queued = self.queued, []
+        return events
+
+    def close(self):
+        pass
+
+
+def plan_split(root):
+    splitter = TypeSplitter(CSharpTypeScanner(root))
+    [plan] = splitter.plan_all([root / 'Player.cs'])
+    assert plan.skip_reason is None
+    return plan
+
+
+def test_split_plan_moves_each_type_with_header_and_footer(tmp_path):
+    (tmp_path / 'Player.cs').write_text(MULTI_TYPE, encoding='utf-8')
+
+    plan = plan_split(tmp_path)
+
+    rewrite = plan.rewrite.decode('utf-8')
+    assert 'class Player' in rewrite and 'struct Stats' not in rewrite
+    stats = plan.creates[str(tmp_path / 'Stats.cs')].decode('utf-8')
+    assert stats.startswith('using System;\n\nnamespace Game\n{\n    [Serializable]\n    public struct Stats')
+    assert stats.endswith('    }\n}\n')
+
+
+def test_split_applies_all_files_and_clears_journal(tmp_path):
+    (tmp_path / 'Player.cs').write_text(MULTI_TYPE, encoding='utf-8')
+    plan = plan_split(tmp_path)
+
+    journal = SplitJournal(tmp_path)
+    journal.apply({plan.file_path: plan.rewrite}, plan.creates)
+
+    assert (tmp_path / 'Player.cs').read_bytes() == plan.rewrite
+    assert (tmp_path / 'Stats.cs').read_bytes() == plan.creates[str(tmp_path / 'Stats.cs')]
+    assert not journal.directory.exists()
+
+
+def test_interrupted_split_is_rolled_back(tmp_path, monkeypatch):
+    (tmp_path / 'Player.cs').write_text(MULTI_TYPE, encoding='utf-8')
+    plan = plan_split(tmp_path)
+    journal = SplitJournal(tmp_path)
+
+    real_replace = os.replace
+    calls = []
+
+    def failing_replace(src, dst):
+        calls.append(dst)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        real_replace(src, dst)
+
+    # Simulate a crash after the first file was replaced, leaving the journal behind
+    monkeypatch.setattr(os, 'replace', failing_replace)
+    monkeypatch.setattr(journal, 'rollback', lambda: 0)
+    with pytest.raises(KeyboardInterrupt):
+        journal.apply({plan.file_path: plan.rewrite}, plan.creates)
+    monkeypatch.undo()
+
+    assert journal.directory.exists()
+    with pytest.raises(RuntimeError):
+        journal.apply({plan.file_path: plan.rewrite}, plan.creates)
+
+    assert journal.rollback() >= 1
+    assert (tmp_path / 'Player.cs').read_text(encoding='utf-8') == MULTI_TYPE
+    assert sorted(os.listdir(tmp_path)) == ['Player.cs']
+
+
+def test_watch_reports_added_and_cleared_violations(tmp_path):
+    (tmp_path / 'Single.cs').write_text('class Single { }\n', encoding='utf-8')
+    (tmp_path / 'Player.cs').write_text(MULTI_TYPE, encoding='utf-8')
+    watcher = FakeWatcher()
+    watch = TreeWatch(CSharpTypeScanner(tmp_path), watcher)
+
+    events = watch.scan()
+    assert [(e['event'], e['file'], e['type_count']) for e in events] == [('added', 'Player.cs', 2)]
+    assert str(tmp_path) in watcher.directories
+
+    (tmp_path / 'Single.cs').write_text('class Single { }\nclass Other { }\n', encoding='utf-8')
+    (tmp_path / 'Player.cs').write_text('class Player { }\n', encoding='utf-8')
+    watcher.queued = [('file', str(tmp_path / 'Single.cs')), ('file', str(tmp_path / 'Player.cs'))]
+
+    events = watch.step()
+    assert sorted((e['event'], e['file']) for e in events) == [('added', 'Single.cs'), ('cleared', 'Player.cs')]
+    assert [a.relative_path for a in watch.violations()] == ['Single.cs']
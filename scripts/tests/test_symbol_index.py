@@ -0,0 +1,64 @@
+"""Tests for SymbolIndex caching, invalidation and git synchronisation."""
+
+import os
+import subprocess
+
+from csharp_symbols import SymbolIndex
+
+
+def git(cwd, *args):
+    subprocess.run(
+        ['git', *args], cwd=cwd, check=True, capture_output=True,
+        env={**os.environ, 'GIT_AUTHOR_NAME': 't', 'GIT_AUTHOR_EMAIL': 't@t',
+             'GIT_COMMITTER_NAME': 't', 'GIT_COMMITTER_EMAIL': 't@t'}
+    )
+
+
+def test_symbols_are_cached_and_invalidated_on_change(tmp_path):
+    source = tmp_path / 'Foo.cs'
+    source.write_text('namespace N { public partial class Foo : IBar { } }\n', encoding='utf-8')
+
+    with SymbolIndex(tmp_path / 'index.sqlite', tmp_path) as index:
+        assert index.lookup(source) is None
+        [symbol] = index.symbols(source)
+        assert (symbol.full_name, symbol.partial, symbol.bases) == ('N.Foo', True, ['IBar'])
+        assert [s.name for s in index.lookup(source)] == ['Foo']
+
+        source.write_text('namespace N { class Foo { } class Baz { } }\n', encoding='utf-8')
+        assert index.lookup(source) is None
+        assert [s.name for s in index.symbols(source)] == ['Foo', 'Baz']
+
+    # Reopened from disk
+    with SymbolIndex(tmp_path / 'index.sqlite', tmp_path) as index:
+        assert [s.name for s in index.lookup(source)] == ['Foo', 'Baz']
+
+
+def test_types_named_finds_partial_parts_across_files(tmp_path):
+    (tmp_path / 'Foo.cs').write_text('namespace N { partial class Foo : IA { } }\n', encoding='utf-8')
+    (tmp_path / 'Foo.B.cs').write_text('namespace N { partial class Foo : IB { } }\n', encoding='utf-8')
+
+    with SymbolIndex(tmp_path / 'index.sqlite', tmp_path) as index:
+        for name in ('Foo.cs', 'Foo.B.cs'):
+            index.symbols(tmp_path / name)
+        parts = index.types_named('N', 'Foo')
+
+    assert [(path, symbol.bases) for path, symbol in parts] == [('Foo.B.cs', ['IB']), ('Foo.cs', ['IA'])]
+
+
+def test_sync_with_git_indexes_staged_contents(tmp_path):
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    git(repo, 'init', '-q')
+    (repo / 'A.cs').write_text('class A { }\n', encoding='utf-8')
+    (repo / 'Copy.cs').write_text('class A { }\n', encoding='utf-8')
+    git(repo, 'add', 'A.cs', 'Copy.cs')
+    # Working tree differs from the staged blob
+    (repo / 'A.cs').write_text('class A { }\nclass B { }\n', encoding='utf-8')
+
+    with SymbolIndex(tmp_path / 'index.sqlite', repo) as index:
+        tracked = index.sync_with_git()
+        assert sorted(tracked) == ['A.cs', 'Copy.cs']
+        assert [path for path, _ in index.types_named('', 'A')] == ['A.cs', 'Copy.cs']
+        assert index.types_named('', 'B') == []
+        # The staged entry is not trusted for the modified working tree copy
+        assert index.lookup(repo / 'A.cs') is None